@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from benchmarks.harness import DEFAULT_THRESHOLD, BaselineStore, measure
+from request_api import transport
+from sources.constants import CBR_RATE_URL
+
+
+def pytest_addoption(parser) -> None:
+    """Параметры командной строки для измерений"""
+
+    group = parser.getgroup("benchmarks", "измерения производительности")
+    group.addoption("--benchmark-update", action="store_true",
+                    help="записать текущие результаты как базовые")
+    group.addoption("--benchmark-threshold", type=float,
+                    default=float(os.environ.get("BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD)),
+                    help="допустимое замедление относительно базового результата, доля (0.25 - на 25%%)")
+
+
+@pytest.fixture(scope="session")
+def baseline_store(request) -> BaselineStore:
+    """
+    Базовые результаты измерений. Файл с ними перезаписывается только с параметром --benchmark-update,
+    обычный запуск измерений его не изменяет
+    """
+
+    store = BaselineStore(threshold=request.config.getoption("--benchmark-threshold"),
+                          update=request.config.getoption("--benchmark-update"))
+    yield store
+    if store.update:
+        store.save()
+
+
+@pytest.fixture
+def benchmark(baseline_store):
+    """
+    Измеряет функцию и завершает тест с ошибкой при регрессии.
+    Принимает название измерения и параметры benchmarks.harness.measure.
+    Замедление перепроверяется повторным измерением вместе с эталонным циклом,
+    чтобы случайная помеха или временное замедление машины не считались регрессией
+    """
+
+    def run(name: str, function, setup=None, **options) -> float:
+        seconds = measure(function, setup, **options)
+        regression = baseline_store.check(name, seconds)
+        if regression is not None:
+            baseline_store.recalibrate()
+            seconds = min(seconds, measure(function, setup, **options))
+            regression = baseline_store.check(name, seconds)
+        if regression is not None:
+            pytest.fail(regression)
+        return seconds
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def offline_rates(monkeypatch) -> None:
+    """Курсы валют ЦБ без обращения к сайту"""
+
+    monkeypatch.setitem(transport._references, CBR_RATE_URL,
+                        {"Valute": {"USD": {"Value": 90.0}, "EUR": {"Value": 98.0}, "KZT": {"Value": 0.2}}})
@@ -0,0 +1,92 @@
+import random
+
+# города HeadHunter для синтетических вакансий: id, название.
+# Последние - города синтетического справочника регионов make_hh_areas
+_HH_AREAS = (("1", "Москва"), ("2", "Санкт-Петербург"), ("3", "Екатеринбург"), ("4", "Новосибирск"),
+             ("88", "Казань"), ("2019", "Московская область"), ("100001", "Город 0-1"), ("101002", "Город 1-2"))
+
+# города SuperJob для синтетических вакансий: id, название
+_SJ_TOWNS = ((4, "Москва"), (14, "Санкт-Петербург"), (33, "Екатеринбург"), (4, "Москва"), (88, "Казань"))
+
+# значения опыта работы HeadHunter
+_HH_EXPERIENCE = ("noExperience", "between1And3", "between3And6", "moreThan6")
+
+# значения типа занятости HeadHunter
+_HH_EMPLOYMENT = ("full", "part", "project", "probation")
+
+
+def make_hh_vacancy(number: int, rng: random.Random) -> dict:
+    """Возвращает словарь вакансии в формате ответа HeadHunter"""
+
+    area_id, area_name = rng.choice(_HH_AREAS)
+    salary_from = rng.choice((None, 40000, 80000, 120000, 200000))
+    salary_to = rng.choice((None, salary_from and salary_from * 2, 300000))
+    currency = rng.choice(("RUR", "RUR", "RUR", "USD", "EUR"))
+
+    return {
+        "id": str(number),
+        "name": f"Python-разработчик {number}",
+        "url": f"https://api.hh.ru/vacancies/{number}",
+        "alternate_url": f"https://hh.ru/vacancy/{number}",
+        "area": {"id": area_id, "name": area_name},
+        "salary": {"from": salary_from, "to": salary_to, "currency": currency}
+        if salary_from or salary_to else None,
+        "experience": {"id": rng.choice(_HH_EXPERIENCE), "name": "Опыт"},
+        "employment": {"id": rng.choice(_HH_EMPLOYMENT), "name": "Занятость"},
+        "snippet": {"requirement": f"Опыт работы с <highlighttext>Python</highlighttext> от {number % 5} лет",
+                    "responsibility": "Разработка и поддержка <highlighttext>сервисов</highlighttext>"},
+        "employer": {"id": str(number % 997), "name": f"Компания {number % 997}"},
+        "published_at": f"2023-06-{number % 28 + 1:02d}T10:00:00+0300",
+        "professional_roles": [{"id": "96", "name": "Программист, разработчик"}],
+    }
+
+
+def make_sj_vacancy(number: int, rng: random.Random) -> dict:
+    """Возвращает словарь вакансии в формате ответа SuperJob"""
+
+    town_id, town_title = rng.choice(_SJ_TOWNS)
+    payment_from = rng.choice((0, 50000, 90000, 150000))
+
+    return {
+        "id": number,
+        "profession": f"Python-разработчик {number}",
+        "link": f"https://www.superjob.ru/vakansii/python-{number}.html",
+        "town": {"id": town_id, "title": town_title},
+        "payment_from": payment_from,
+        "payment_to": rng.choice((0, payment_from * 2)),
+        "currency": rng.choice(("rub", "rub", "usd")),
+        "candidat": "Знание Python\n\nОпыт работы с SQL",
+        "work": "Разработка сервисов\nПоддержка кода",
+        "experience": {"id": rng.randint(1, 4), "title": "Опыт"},
+        "type_of_work": {"id": rng.choice((6, 10, 12)), "title": "Тип занятости"},
+        "firm_name": f"Фирма {number % 499}",
+        "id_client": number % 499,
+        "date_published": 1686000000 + number,
+    }
+
+
+def make_vacancies(count: int, seed: int = 0) -> list[dict]:
+    """Возвращает список словарей вакансий, поровну HeadHunter и SuperJob, одинаковый при одинаковом seed"""
+
+    rng = random.Random(seed)
+
+    return [make_hh_vacancy(number, rng) if number % 2 else make_sj_vacancy(number, rng) for number in range(count)]
+
+
+def make_hh_areas(regions: int = 80, towns: int = 50) -> list[dict]:
+    """Возвращает справочник регионов HeadHunter: страна, её регионы и города регионов"""
+
+    return [{"id": "113", "name": "Россия", "areas": [
+        {"id": str(1000 + region), "name": f"Область {region}", "areas": [
+            {"id": str(100000 + region * 1000 + town), "name": f"Город {region}-{town}", "areas": []}
+            for town in range(towns)]}
+        for region in range(regions)]}]
+
+
+def make_sj_areas(regions: int = 80, towns: int = 50) -> list[dict]:
+    """Возвращает справочник регионов SuperJob: страна, её регионы и города регионов"""
+
+    return [{"id": 1, "title": "Россия", "towns": [], "regions": [
+        {"id": 1000 + region, "title": f"Область {region}", "regions": [], "towns": [
+            {"id": region * 1000 + town, "title": f"Город {region}-{town}"} for town in range(towns)]}
+        for region in range(regions)]}]
@@ -0,0 +1,143 @@
+import gc
+import json
+import os
+import platform
+import time
+from typing import Any, Callable
+
+# абсолютный путь к файлу с базовыми результатами измерений
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# допустимое замедление относительно базового результата по умолчанию: 0.25 - на 25%
+DEFAULT_THRESHOLD = 0.25
+
+
+def calibrate(loops: int = 200_000, repeat: int = 5) -> float:
+    """
+    Измеряет скорость интерпретатора на эталонном цикле, секунды.
+    Результаты измерений делятся на это время, поэтому базовые результаты,
+    записанные на одной машине, можно сравнивать с результатами на другой
+    """
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = {}
+        for number in range(loops):
+            table[number & 1023] = str(number)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def measure(function: Callable[[Any], Any], setup: Callable[[], Any] | None = None,
+            repeat: int = 5, min_time: float = 0.5) -> float:
+    """
+    Возвращает лучшее время выполнения функции из нескольких запусков, секунды
+
+    :param function: измеряемая функция, получает результат setup
+    :param setup: подготовка данных перед каждым запуском, не входит в измерение
+    :param repeat: минимальное количество запусков
+    :param min_time: минимальное суммарное время запусков: короткие функции запускаются больше repeat раз
+    """
+
+    # как и в timeit, сборка мусора на время измерения отключается
+    gc_enabled = gc.isenabled()
+
+    best = float("inf")
+    runs = 0
+    total = 0.0
+
+    while runs < repeat or total < min_time:
+        argument = setup() if setup is not None else None
+
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function(argument)
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    return best
+
+
+class BaselineStore:
+    """
+    Базовые результаты измерений в файле baselines.json.
+    Результаты хранятся в единицах эталонного цикла (calibrate),
+    новое измерение считается регрессией, если оно медленнее базового больше чем на threshold
+    """
+
+    def __init__(self, path_file: str = BASELINES_PATH, threshold: float = DEFAULT_THRESHOLD,
+                 update: bool = False) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: путь к файлу с базовыми результатами
+        :param threshold: допустимое замедление, доля от базового результата
+        :param update: перезаписывать базовые результаты текущими измерениями
+        """
+
+        self.path_file = path_file
+        self.threshold = threshold
+        self.update = update
+
+        self.unit = calibrate()
+        self.baselines = self.load()
+        self.results = {}  # название измерения -> результат текущего запуска в единицах эталонного цикла
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_file!r}, threshold={self.threshold}, update={self.update})"
+
+    def recalibrate(self) -> None:
+        """Заново измеряет эталонный цикл, если скорость машины могла измениться во время сессии"""
+
+        self.unit = calibrate()
+
+    def load(self) -> dict:
+        """Загружает базовые результаты: название измерения -> время в единицах эталонного цикла"""
+
+        try:
+            with open(self.path_file, "r", encoding="utf-8") as file:
+                return json.load(file)["results"]
+        except (OSError, KeyError, json.decoder.JSONDecodeError):
+            return {}
+
+    def save(self) -> None:
+        """Записывает базовые результаты, обновленные результатами текущего запуска"""
+
+        results = {**self.baselines, **self.results}
+        content = {"python": platform.python_version(), "machine": platform.machine(),
+                   "results": dict(sorted(results.items()))}
+
+        with open(self.path_file, "w", encoding="utf-8") as file:
+            json.dump(content, file, ensure_ascii=False, indent=4)
+            file.write("\n")
+
+    def check(self, name: str, seconds: float) -> str | None:
+        """
+        Записывает результат измерения и сравнивает его с базовым
+
+        :param name: название измерения
+        :param seconds: время в секундах
+        :return: описание регрессии, либо None, если регрессии нет или базового результата ещё нет
+        """
+
+        result = self.results[name] = round(seconds / self.unit, 4)
+        baseline = self.baselines.get(name)
+
+        if baseline is None or self.update or result <= baseline * (1 + self.threshold):
+            return None
+
+        return f"{name}: {seconds * 1000:.2f} мс, медленнее базового результата " \
+               f"на {(result / baseline - 1) * 100:.0f}% (допустимо {self.threshold * 100:.0f}%)"
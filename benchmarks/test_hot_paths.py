@@ -0,0 +1,173 @@
+import pytest
+
+from benchmarks.data import make_hh_areas, make_sj_areas, make_vacancies
+from filter.filter_hh import FilterHH
+from filter.filter_sj import FilterSJ
+from saver.catalog import Catalog
+from saver.columnar_saver import ColumnarSaver
+from saver.json_saver import JSONSaver
+from tools import user_interface
+from vacancy.vacancy_hh import VacancyHeadHunter
+from vacancy.vacancy_sj import VacancySuperJob
+
+# количество вакансий в измерениях, не зависящих от размера файла
+_COUNT = 10_000
+
+# размеры файлов для измерений записи и чтения
+_FILE_SIZES = (1_000, 10_000, 100_000)
+
+
+@pytest.fixture(scope="module")
+def vacancy_dicts() -> list[dict]:
+    """Синтетические вакансии HeadHunter и SuperJob"""
+
+    return make_vacancies(_COUNT)
+
+
+@pytest.fixture(scope="module")
+def hh_dicts(vacancy_dicts) -> list[dict]:
+    """Синтетические вакансии HeadHunter"""
+
+    return [vacancy_dict for vacancy_dict in vacancy_dicts if "url" in vacancy_dict]
+
+
+@pytest.fixture(scope="module")
+def sj_dicts(vacancy_dicts) -> list[dict]:
+    """Синтетические вакансии SuperJob"""
+
+    return [vacancy_dict for vacancy_dict in vacancy_dicts if "link" in vacancy_dict]
+
+
+def test_vacancy_hh_construction(benchmark, hh_dicts) -> None:
+    benchmark("vacancy_hh_construction", lambda _: [VacancyHeadHunter(vacancy) for vacancy in hh_dicts])
+
+
+def test_vacancy_sj_construction(benchmark, sj_dicts) -> None:
+    benchmark("vacancy_sj_construction", lambda _: [VacancySuperJob(vacancy) for vacancy in sj_dicts])
+
+
+def test_short_info_hh(benchmark, hh_dicts) -> None:
+    # краткая информация кешируется в объекте, поэтому объекты создаются заново перед каждым запуском
+    benchmark("short_info_hh", lambda vacancies: [vacancy.get_short_info() for vacancy in vacancies],
+              setup=lambda: [VacancyHeadHunter(vacancy) for vacancy in hh_dicts])
+
+
+def test_short_info_sj(benchmark, sj_dicts) -> None:
+    benchmark("short_info_sj", lambda vacancies: [vacancy.get_short_info() for vacancy in vacancies],
+              setup=lambda: [VacancySuperJob(vacancy) for vacancy in sj_dicts])
+
+
+def test_compare_parameters_hh(benchmark, hh_dicts) -> None:
+    request_filter = FilterHH.from_parameters({"area": "1", "experience": "between1And3", "salary": 80000})
+    request_filter._areas_info = make_hh_areas()
+
+    matched = benchmark("compare_parameters_hh",
+                        lambda _: [vacancy for vacancy in hh_dicts if request_filter.compare_parameters(vacancy)])
+
+    assert matched
+
+
+def test_compare_parameters_hh_region(benchmark, hh_dicts) -> None:
+    # фильтр по региону: подходят вакансии из всех его городов
+    request_filter = FilterHH.from_parameters({"area": "1000"})
+    request_filter._areas_info = make_hh_areas()
+
+    matched = []
+    benchmark("compare_parameters_hh_region",
+              lambda _: matched.append([vacancy for vacancy in hh_dicts if request_filter.compare_parameters(vacancy)]))
+
+    assert {vacancy["area"]["id"] for vacancy in matched[-1]} == {"100001"}
+
+
+def test_compare_parameters_sj(benchmark, sj_dicts) -> None:
+    request_filter = FilterSJ.from_parameters({"town": 4, "type_of_work": 6})
+
+    benchmark("compare_parameters_sj",
+              lambda _: [vacancy for vacancy in sj_dicts if request_filter.compare_parameters(vacancy)])
+
+
+def test_sort_vacancies(benchmark, vacancy_dicts, monkeypatch) -> None:
+    # сортировка по убыванию зарплаты, вывести все вакансии
+    monkeypatch.setattr(user_interface, "get_binary_answer", lambda text: "1")
+    monkeypatch.setattr(user_interface, "i_input", lambda text: "")
+
+    vacancies = [VacancyHeadHunter(vacancy) if "url" in vacancy else VacancySuperJob(vacancy)
+                 for vacancy in vacancy_dicts]
+    for vacancy in vacancies:
+        # зарплата в рублях кешируется, измеряется только сортировка
+        vacancy.get_min_salary()
+
+    result = []
+    benchmark("sort_vacancies", lambda _: result.append(user_interface.sort_vacancies(vacancies)))
+
+    salaries = [vacancy.get_min_salary() for vacancy in result[-1]]
+    assert salaries == sorted(salaries, reverse=True)
+
+
+def test_columnar_select(benchmark, vacancy_dicts, tmp_path) -> None:
+    saver = ColumnarSaver((str(tmp_path / "vacancies.col"),))
+    saver.write_stream(vacancy_dicts)
+
+    selected = []
+    with saver.open() as reader:
+        benchmark("columnar_select", lambda _: selected.append(reader.select(salary_from=0)))
+
+    # вакансии без зарплаты не подходят даже под нулевую нижнюю границу
+    vacancies = [VacancyHeadHunter(vacancy) if "url" in vacancy else VacancySuperJob(vacancy)
+                 for vacancy in vacancy_dicts]
+    assert selected[-1] == [position for position, vacancy in enumerate(vacancies) if vacancy.get_min_salary()]
+    assert len(selected[-1]) < len(vacancy_dicts)
+
+
+@pytest.fixture(params=["tmp", "catalog"])
+def saver_location(request, tmp_path, monkeypatch) -> tuple[tuple, str]:
+    """
+    Путь к файлу для измерений записи и чтения и суффикс названия измерения.
+    Для варианта 'catalog' временная папка становится папкой каталога, и файл записывается
+    так же, как настоящие сохранения: с обновлением сводки файла и индекса зарплат
+    """
+
+    if request.param == "catalog":
+        monkeypatch.setattr(JSONSaver, "catalog", Catalog((str(tmp_path),)))
+
+    return (str(tmp_path / "vacancies.json"),), "" if request.param == "tmp" else "_catalog"
+
+
+@pytest.mark.parametrize("size", _FILE_SIZES)
+def test_json_saver_add_vacancies(benchmark, saver_location, size) -> None:
+    # файл уже содержит половину вакансий, добавляется вторая половина
+    path_file, suffix = saver_location
+    vacancies = make_vacancies(size)
+    saver = JSONSaver(path_file)
+
+    def setup() -> None:
+        saver.write_vacancies(vacancies[:size // 2])
+
+    benchmark(f"json_saver_add_vacancies{suffix}_{size}", lambda _: saver.add_vacancies(vacancies[size // 2:]),
+              setup=setup, repeat=3 if size < 100_000 else 1, min_time=0)
+
+
+@pytest.mark.parametrize("size", _FILE_SIZES)
+def test_json_saver_load_vacancies(benchmark, saver_location, size) -> None:
+    path_file, suffix = saver_location
+    saver = JSONSaver(path_file)
+    saver.write_vacancies(make_vacancies(size))
+
+    loaded = []
+    benchmark(f"json_saver_load_vacancies{suffix}_{size}", lambda _: loaded.append(len(saver.load_vacancies())),
+              repeat=3 if size < 100_000 else 1, min_time=0)
+
+    assert loaded[-1] == size
+
+
+@pytest.mark.parametrize("filter_class, areas_info", [(FilterHH, make_hh_areas()), (FilterSJ, make_sj_areas())])
+def test_get_area_id(benchmark, filter_class, areas_info) -> None:
+    request_filter = filter_class()
+    request_filter._areas_info = areas_info
+    names = [f"Город {region}-{town}" for region in range(0, 80, 3) for town in range(0, 50, 7)]
+
+    # индекс строится при первом обращении и не входит в измерение
+    assert request_filter.get_area_id(names[0]) is not None
+
+    benchmark(f"get_area_id_{filter_class.__name__}",
+              lambda _: [request_filter.get_area_id(name) for name in names])
@@ -0,0 +1,289 @@
+import hashlib
+import heapq
+import re
+from typing import Iterable, NamedTuple
+
+
+class AreaMatch(NamedTuple):
+    """Результат поиска населенного пункта в индексе"""
+
+    id: str | int  # id населенного пункта на сайте
+    name: str  # название населенного пункта
+    path: tuple  # названия вышестоящих субъектов (страна, регион...)
+    score: float  # степень сходства с запросом, от 0 до 1
+
+    def __str__(self) -> str:
+        """Строковое представление результата с указанием вышестоящих субъектов"""
+
+        if self.path:
+            return f"{self.name} ({', '.join(reversed(self.path))})"
+        return self.name
+
+
+class AreaIndex:
+    """
+    Триграммный индекс по названиям городов и регионов сайта.
+    Позволяет находить населенные пункты по неточному названию:
+    без учета регистра, буквы 'ё' и с опечатками.
+    Для справочника с иерархией регионов хранит интервалы обхода дерева в глубину:
+    все населенные пункты внутри региона имеют номера из интервала региона,
+    поэтому принадлежность региону проверяется сравнением двух чисел
+    """
+
+    # индексы, уже построенные в текущем процессе, ключ - версия справочника
+    _CACHE = {}
+
+    # символы, которые не учитываются при сравнении названий
+    _NOT_WORD = re.compile(r"[^\w]+")
+
+    def __init__(self, areas: Iterable[tuple], intervals: dict[str, tuple[int, int]] | None = None) -> None:
+        """
+        Инициализатор индекса
+
+        :param areas: коллекция кортежей (id, название, кортеж названий вышестоящих субъектов)
+        :param intervals: id субъекта -> (номер субъекта, номер последнего вложенного субъекта)
+                          при обходе дерева регионов в глубину
+        """
+
+        self._intervals = intervals or {}
+
+        self._ids = []
+        self._names = []
+        self._paths = []
+        self._trigrams_count = []
+
+        # нормализованное название -> позиции в списках выше
+        self._exact = {}
+        # триграмма -> позиции в списках выше
+        self._postings = {}
+
+        for area_id, name, path in areas:
+            position = len(self._ids)
+            self._ids.append(area_id)
+            self._names.append(name)
+            self._paths.append(tuple(path))
+
+            normalized = self.normalize(name)
+            self._exact.setdefault(normalized, []).append(position)
+
+            trigrams = self.get_trigrams(normalized)
+            self._trigrams_count.append(len(trigrams))
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, []).append(position)
+
+    def __len__(self) -> int:
+        """Количество населенных пунктов в индексе"""
+
+        return len(self._ids)
+
+    def __repr__(self) -> str:
+        """Строковое представление индекса в режиме отладки"""
+
+        return f"{self.__class__.__name__}(areas={len(self)}, trigrams={len(self._postings)})"
+
+    @classmethod
+    def normalize(cls, name: str) -> str:
+        """Приводит название к виду, в котором оно хранится в индексе"""
+
+        name = name.lower().replace("ё", "е")
+        return cls._NOT_WORD.sub(" ", name).strip()
+
+    @staticmethod
+    def get_trigrams(normalized: str) -> set[str]:
+        """
+        Возвращает множество триграмм нормализованного названия.
+        Каждое слово дополняется пробелами, чтобы начало слова весило больше
+        """
+
+        trigrams = set()
+        for word in normalized.split():
+            word = f"  {word} "
+            trigrams.update(word[i:i + 3] for i in range(len(word) - 2))
+
+        return trigrams
+
+    @classmethod
+    def build(cls, source: str, areas: Iterable[tuple],
+              intervals: dict[str, tuple[int, int]] | None = None) -> "AreaIndex":
+        """
+        Возвращает индекс для справочника сайта.
+        Индекс строится один раз для каждой версии справочника,
+        версия вычисляется по содержимому справочника
+
+        :param source: название сайта, которому принадлежит справочник
+        :param areas: коллекция кортежей (id, название, кортеж названий вышестоящих субъектов)
+        :param intervals: интервалы обхода дерева регионов в глубину, см. __init__
+        """
+
+        areas = list(areas)
+
+        digest = hashlib.sha1(source.encode("utf-8"))
+        for area_id, name, path in areas:
+            digest.update(f"{area_id}\t{name}\t{'/'.join(path)}\n".encode("utf-8"))
+        version = digest.hexdigest()
+
+        if version not in cls._CACHE:
+            cls._CACHE[version] = cls(areas, intervals)
+
+        return cls._CACHE[version]
+
+    @classmethod
+    def from_hh(cls, areas_info: list[dict]) -> "AreaIndex":
+        """
+        Строит индекс по справочнику регионов HeadHunter.
+        Номер субъекта - его позиция при обходе дерева в глубину,
+        вложенные субъекты получают номера сразу после своего региона
+        """
+
+        areas = []
+        intervals = {}
+
+        def walk(children: list[dict], path: tuple) -> None:
+            for area in children:
+                first = len(areas)
+                areas.append((area.get("id"), area.get("name"), path))
+                walk(area.get("areas") or [], path + (area.get("name"),))
+                intervals[str(area.get("id"))] = first, len(areas) - 1
+
+        walk(areas_info, ())
+
+        return cls.build("hh", areas, intervals)
+
+    @classmethod
+    def from_sj(cls, areas_info: list[dict]) -> "AreaIndex":
+        """
+        Строит индекс по справочнику регионов SuperJob.
+        В индекс попадают только города, так как именно их id используются в запросе
+        """
+
+        towns = {}
+
+        def walk(regions: list[dict], path: tuple) -> None:
+            for region in regions:
+                region_path = path + (region.get("title"),)
+                for town in region.get("towns") or []:
+                    # город может быть указан и в стране, и в регионе - оставляем более точный путь
+                    if len(towns.get(town.get("id"), (None, None, ()))[2]) < len(region_path):
+                        towns[town.get("id")] = town.get("id"), town.get("title"), region_path
+                walk(region.get("regions") or [], region_path)
+
+        walk(areas_info, ())
+
+        return cls.build("sj", towns.values())
+
+    def contains(self, region_id: str | int, area_id: str | int | None) -> bool:
+        """
+        Проверяет, находится ли населенный пункт внутри региона (или совпадает с ним).
+        Для справочников без иерархии сравнивает id
+
+        :param region_id: id региона, например id области
+        :param area_id: id населенного пункта, например из вакансии
+        """
+
+        if area_id is None:
+            return False
+
+        region_id, area_id = str(region_id), str(area_id)
+        if region_id == area_id:
+            return True
+
+        region = self._intervals.get(region_id)
+        area = self._intervals.get(area_id)
+        if region is None or area is None:
+            return False
+
+        return region[0] <= area[0] <= region[1]
+
+    def get_subtree_ids(self, region_id: str | int) -> frozenset[str]:
+        """
+        Возвращает id субъекта и всех вложенных в него субъектов строками.
+        Для справочников без иерархии и неизвестных субъектов - только id самого субъекта
+        """
+
+        region_id = str(region_id)
+        region = self._intervals.get(region_id)
+        if region is None:
+            return frozenset((region_id,))
+
+        return frozenset(area_id for area_id, (number, _) in self._intervals.items()
+                         if region[0] <= number <= region[1])
+
+    def get_ids(self, name: str) -> list[str | int]:
+        """
+        Возвращает id всех населенных пунктов, название которых совпадает с переданным
+        без учета регистра и буквы 'ё'. Несколько id - разные населенные пункты с одним названием
+        """
+
+        ids = []
+        for position in self._exact.get(self.normalize(name), ()):
+            if self._ids[position] not in ids:
+                ids.append(self._ids[position])
+
+        return ids
+
+    def get_id(self, name: str) -> str | int | None:
+        """
+        Возвращает id населенного пункта, название которого совпадает с переданным.
+        Если так называются несколько населенных пунктов, возвращает None:
+        выбрать один из них может только пользователь
+        """
+
+        ids = self.get_ids(name)
+
+        return ids[0] if len(ids) == 1 else None
+
+    def search(self, name: str, limit: int = 5) -> list[AreaMatch]:
+        """
+        Возвращает наиболее похожие на переданное название населенные пункты,
+        отсортированные по убыванию сходства
+
+        :param name: название населенного пункта, возможно неточное
+        :param limit: максимальное количество результатов
+        """
+
+        normalized = self.normalize(name)
+        trigrams = self.get_trigrams(normalized)
+        if not trigrams:
+            return []
+
+        # количество общих с запросом триграмм для каждого кандидата
+        shared = {}
+        for trigram in trigrams:
+            for position in self._postings.get(trigram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        exact = set(self._exact.get(normalized, ()))
+        query_count = len(trigrams)
+        trigrams_count = self._trigrams_count
+
+        def score(position: int) -> float:
+            if position in exact:
+                return 1.0
+            common = shared[position]
+            return common / (query_count + trigrams_count[position] - common)
+
+        best = heapq.nlargest(limit, shared, key=lambda position: (score(position), -len(self._names[position])))
+
+        return [AreaMatch(self._ids[position], self._names[position], self._paths[position], score(position))
+                for position in best]
+
+    def resolve(self, name: str, min_score: float = 0.4, min_gap: float = 0.1) -> str | int | None:
+        """
+        Возвращает id населенного пункта без участия пользователя:
+        при точном совпадении названия, либо если лучший результат поиска
+        достаточно похож на запрос и однозначно лучше остальных.
+        Если так называются несколько населенных пунктов, возвращает None
+        """
+
+        ids = self.get_ids(name)
+        if ids:
+            return ids[0] if len(ids) == 1 else None
+
+        matches = self.search(name, limit=2)
+        if not matches or matches[0].score < min_score:
+            return None
+
+        if len(matches) > 1 and matches[0].score - matches[1].score < min_gap:
+            return None
+
+        return matches[0].id
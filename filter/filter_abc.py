@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
 
+from filter.area_index import AreaIndex, AreaMatch
+from tools.utils import i_input
+
 
 class Filter(ABC):
     """
@@ -13,16 +16,61 @@ class Filter(ABC):
 
     def __init__(self) -> None:
         """
-        Инициализатор фильтра. Устанавливает значения фильтра по умолчанию,
-        получает и устанавливает некоторые словари с допустимыми значениями, получаемые с сайта
+        Инициализатор фильтра. Устанавливает значения фильтра по умолчанию.
+        Словари с допустимыми значениями загружаются с сайта при первом обращении
         """
         # в этих полях находятся словари сайта с перечнем допустимых значений фильтра
-        self._filter_dictionary = self.get_filter_dictionary()
-        self._areas_info = self.get_areas_info()
-        self._areas_names = self.get_areas_names()
+        self._filter_dictionary = None
+        self._areas_info = None
+        self._areas_names = None
+        self._area_index = None
 
         self.parameters = {}
 
+    @classmethod
+    def from_parameters(cls, parameters: dict, precomputed: dict | None = None) -> "Filter":
+        """
+        Создает фильтр с переданными параметрами без вопросов к пользователю,
+        например в дочерних процессах при параллельной фильтрации
+
+        :param parameters: параметры фильтра
+        :param precomputed: данные, вычисленные другим фильтром с теми же параметрами (get_precomputed)
+        """
+
+        request_filter = cls()
+        request_filter.parameters.update(parameters)
+        if precomputed:
+            request_filter.set_precomputed(precomputed)
+
+        return request_filter
+
+    @property
+    def filter_dictionary(self) -> dict:
+        """Словарь сайта с допустимыми значениями фильтра, загружается при первом обращении"""
+
+        if self._filter_dictionary is None:
+            self._filter_dictionary = self.get_filter_dictionary()
+
+        return self._filter_dictionary
+
+    @property
+    def areas_info(self) -> dict | list[dict]:
+        """Информация о городах и регионах сайта, загружается при первом обращении"""
+
+        if self._areas_info is None:
+            self._areas_info = self.get_areas_info()
+
+        return self._areas_info
+
+    @property
+    def areas_names(self) -> list:
+        """Список городов и регионов сайта, вычисляется при первом обращении"""
+
+        if self._areas_names is None:
+            self._areas_names = self.get_areas_names()
+
+        return self._areas_names
+
     def get_all_parameters(self) -> dict:
         """Возвращает все параметры фильтра в формате словаря"""
 
@@ -82,4 +130,104 @@ class Filter(ABC):
         Возвращает id, который кодирует переданный
         функции город или регион
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_area_index(self) -> AreaIndex:
+        """
+        Возвращает триграммный индекс по названиям городов и регионов,
+        которые можно указывать для поиска
+        """
+        pass
+
+    @property
+    def area_index(self) -> AreaIndex:
+        """Индекс по названиям городов и регионов, строится при первом обращении"""
+
+        if self._area_index is None:
+            self._area_index = self.get_area_index()
+
+        return self._area_index
+
+    def load_references(self) -> None:
+        """
+        Загружает словари сайта, которые нужны для вопросов о параметрах фильтра:
+        допустимые значения фильтра и перечень городов и регионов.
+        Вызывается перед вопросами, чтобы загрузка не смешивалась с ожиданием ответов пользователя
+        """
+
+        # словари загружаются при первом обращении к свойствам
+        self.filter_dictionary
+        self.areas_info
+
+    def area_contains(self, region_id: str | int, area_id: str | int | None) -> bool:
+        """
+        Проверяет, подходит ли город вакансии под город или регион фильтра.
+        По умолчанию id сравниваются на равенство
+        """
+
+        return area_id is not None and str(region_id) == str(area_id)
+
+    def get_precomputed(self) -> dict:
+        """
+        Возвращает данные, которые фильтр вычисляет по справочникам сайта для своих параметров.
+        Их можно передать вместе с параметрами в from_parameters, например в дочерний процесс,
+        чтобы фильтр там не загружал справочники заново
+        """
+
+        return {}
+
+    def set_precomputed(self, precomputed: dict) -> None:
+        """Принимает данные, вычисленные get_precomputed фильтра с теми же параметрами"""
+
+        pass
+
+    def find_areas(self, name: str, limit: int = 5) -> list[AreaMatch]:
+        """
+        Возвращает наиболее похожие на переданное название города и регионы
+        вместе с названиями вышестоящих субъектов
+        """
+
+        return self.area_index.search(name, limit)
+
+    def resolve_area(self, name: str) -> str | int | None:
+        """
+        Возвращает id города или региона по названию без вопросов к пользователю,
+        если название удалось однозначно распознать
+        """
+
+        return self.area_index.resolve(name)
+
+    def ask_area_id(self, limit: int = 5) -> str | int | None:
+        """
+        Запрашивает у пользователя название города или другого субъекта,
+        предлагает наиболее похожие варианты (и все населенные пункты с таким названием,
+        если их несколько) и возвращает id выбранного
+        """
+
+        name = i_input("\nВведите город или населенный пункт, либо нажмите Enter для пропуска:\n")
+
+        while name != "":
+
+            # несколько населенных пунктов с таким названием предлагаются на выбор вместе с регионами
+            ids = self.area_index.get_ids(name)
+            if len(ids) == 1:
+                return ids[0]
+
+            matches = self.find_areas(name, max(limit, len(ids)))
+            if not matches:
+                name = i_input("Не могу найти такой населенный пункт. Попробуйте ещё раз:\n")
+                continue
+
+            variations = "\n".join([f"{i} - {match}" for i, match in enumerate(matches)])
+            header = "Так называются несколько населенных пунктов" if ids else "Возможно, вы имели в виду"
+            answer = i_input(f"{header}:\n{variations}\n"
+                             f"Введите номер подходящего варианта, другое название, "
+                             f"либо нажмите Enter для пропуска.\n")
+
+            if answer.isdigit() and int(answer) < len(matches):
+                return matches[int(answer)].id
+
+            name = answer
+
+        return None
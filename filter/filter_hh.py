@@ -1,8 +1,7 @@
-import requests
-import jsonpath_ng as jp
-
+from request_api import transport
 from sources.headhunter import urls_hh
 from tools.utils import i_input, get_binary_answer
+from filter.area_index import AreaIndex
 from filter.filter_abc import Filter
 
 
@@ -29,14 +28,17 @@ class FilterHH(Filter):
 
     def __init__(self) -> None:
         """
-        Инициализатор фильтра. Устанавливает значения фильтра по умолчанию,
-        получает и устанавливает некоторые словари с допустимыми значениями, получаемые с сайта
+        Инициализатор фильтра. Устанавливает значения фильтра по умолчанию.
+        Словари с допустимыми значениями загружаются с сайта при первом обращении
         """
 
         # в этих полях находятся словари сайта с перечнем допустимых значений фильтра
-        self._filter_dictionary = self.get_filter_dictionary()
-        self._areas_info = self.get_areas_info()
-        self._areas_names = self.get_areas_names()
+        self._filter_dictionary = None
+        self._areas_info = None
+        self._areas_names = None
+        self._area_index = None
+        # город или регион фильтра и id всех входящих в него субъектов
+        self._area_ids = None
 
         # параметры фильтра, настроены по умолчанию
         self.parameters = {
@@ -135,7 +137,9 @@ class FilterHH(Filter):
         for key, value in self.get_filtering_parameters().items():
             if key == "salary" and vacancy_parameters[key] < value:
                 return False
-            elif key != "salary" and vacancy_parameters[key] != value:
+            elif key == "area" and not self.area_contains(value, vacancy_parameters[key]):
+                return False
+            elif key not in ("salary", "area") and vacancy_parameters[key] != value:
                 return False
 
         return True
@@ -149,12 +153,8 @@ class FilterHH(Filter):
         для некоторых параметров фильтра
         """
 
-        url = self._FILTER_DICTIONARY
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-
-        raise requests.RequestException("Ошибка при получении словаря дополнительных значений")
+        return transport.get_reference(self._FILTER_DICTIONARY,
+                                       "Ошибка при получении словаря дополнительных значений")
 
     def get_areas_info(self) -> list[dict]:
         """
@@ -162,12 +162,7 @@ class FilterHH(Filter):
         доступных для поиска вакансий на сайте
         """
 
-        url = self._AREA_CODES
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-
-        raise requests.RequestException("Ошибка при получении списка кодов")
+        return transport.get_reference(self._AREA_CODES, "Ошибка при получении списка кодов")
 
     def get_areas_names(self) -> list[str]:
         """
@@ -175,7 +170,9 @@ class FilterHH(Filter):
         доступных для поиска вакансий на сайте
         """
 
-        areas = self._areas_info
+        import jsonpath_ng as jp
+
+        areas = self.areas_info
 
         json_exp = jp.parse('$..name')
         matches = json_exp.find(areas)
@@ -183,19 +180,63 @@ class FilterHH(Filter):
 
         return names
 
-    def get_area_id(self, name: str) -> str:
+    def get_area_index(self) -> AreaIndex:
         """
-        Возвращает id переданного функции субъекта,
-        если он есть в списке доступных
+        Возвращает триграммный индекс по названиям городов и регионов,
+        доступных для поиска вакансий на сайте
+        """
+
+        return AreaIndex.from_hh(self.areas_info)
+
+    def get_area_ids(self, region_id: str) -> frozenset[str]:
         """
+        Возвращает id города или региона и всех входящих в него субъектов, вычисляется один раз.
+        Если справочник регионов загрузить не удалось (например, без сети), возвращает только id региона:
+        города сравниваются на равенство, как при фильтрации без учета вложенности регионов
+        """
+
+        region_id = str(region_id)
 
-        regions = self._areas_info
+        if self._area_ids is None or self._area_ids[0] != region_id:
+            try:
+                area_ids = self.area_index.get_subtree_ids(region_id)
+            except OSError:
+                # ошибки requests тоже наследуют OSError
+                area_ids = frozenset((region_id,))
+            self._area_ids = region_id, area_ids
+
+        return self._area_ids[1]
+
+    def area_contains(self, region_id: str, area_id: str | None) -> bool:
+        """
+        Проверяет, находится ли город вакансии внутри города или региона фильтра,
+        например город Московской области при фильтре по Московской области
+        """
 
-        json_exp = jp.parse("$..areas[*]")
-        matches = [match.value for match in json_exp.find(regions) if match.value.get('name') == name]
+        return area_id is not None and str(area_id) in self.get_area_ids(region_id)
 
-        if matches:
-            return matches[0].get("id")
+    def get_precomputed(self) -> dict:
+        """Возвращает id субъектов, входящих в город или регион фильтра"""
+
+        region_id = self.get_filtering_parameters().get("area")
+        if region_id is None:
+            return {}
+
+        return {"area": str(region_id), "area_ids": sorted(self.get_area_ids(region_id))}
+
+    def set_precomputed(self, precomputed: dict) -> None:
+        """Принимает id субъектов, входящих в город или регион фильтра"""
+
+        if "area_ids" in precomputed:
+            self._area_ids = precomputed["area"], frozenset(precomputed["area_ids"])
+
+    def get_area_id(self, name: str) -> str | None:
+        """
+        Возвращает id переданного функции субъекта,
+        если он есть в списке доступных и так не называются несколько субъектов
+        """
+
+        return self.area_index.get_id(name)
 
     # далее идёт блок вопросов к пользователю для установки настроек фильтра !
 
@@ -282,7 +323,7 @@ class FilterHH(Filter):
         параметра 'требуемый опыт работы'
         """
 
-        experience = self._filter_dictionary["experience"]
+        experience = self.filter_dictionary["experience"]
         text = "Выберите требуемый опыт работы:"
         answer = self._get_definite_answer(experience, text)
 
@@ -294,7 +335,7 @@ class FilterHH(Filter):
         параметра 'вид занятости'
         """
 
-        employment = self._filter_dictionary["employment"]
+        employment = self.filter_dictionary["employment"]
         text = "Выберите требуемый вид занятости:"
         answer = self._get_definite_answer(employment, text)
 
@@ -306,7 +347,7 @@ class FilterHH(Filter):
         параметра 'валюта зарплаты'
         """
 
-        currency = [field for field in self._filter_dictionary["currency"] if field["in_use"]]
+        currency = [field for field in self.filter_dictionary["currency"] if field["in_use"]]
         text = "Выберите валюту зарплаты:"
         answer = self._get_definite_answer(currency, text)
 
@@ -318,7 +359,7 @@ class FilterHH(Filter):
         параметра 'способ сортировки'
         """
 
-        order_by = [field for field in self._filter_dictionary["vacancy_search_order"] if field["id"] != "distance"]
+        order_by = [field for field in self.filter_dictionary["vacancy_search_order"] if field["id"] != "distance"]
         text = "Выберите способ сортировки:"
         answer = self._get_definite_answer(order_by, text)
 
@@ -327,31 +368,12 @@ class FilterHH(Filter):
     def ask_area(self) -> str | None:
         """
         Запрашивает у пользователя, ищет и возвращает id
-        по указанному названию города или другого субъекта,
-        если таковой есть в перечне доступных для поиска
+        по указанному названию города или другого субъекта.
+        Название можно вводить в любом регистре и с опечатками:
+        будут предложены наиболее похожие варианты
         """
 
-        all_areas = sorted(self._areas_names)
-        name = i_input("\nВведите город или населенный пункт, либо нажмите Enter для пропуска:\n")
-
-        while name != "":
-
-            if name == "list":
-                print()
-                print(*all_areas, sep="\n")
-                print()
-                name = i_input("Попробуйте ещё раз:\n")
-
-            elif name not in all_areas:
-                print(f"Не могу найти такой населенный пункт.\n"
-                      f"Для вызова списка городов введите 'list'.\n"
-                      f"Соблюдайте регистр.")
-                name = i_input("Попробуйте ещё раз:\n")
-
-            else:
-                break
-
-        return self.get_area_id(name)
+        return self.ask_area_id()
 
     @staticmethod
     def _get_right_number(text: str) -> int | str:
@@ -1,8 +1,7 @@
-import requests
-import jsonpath_ng as jp
-
+from request_api import transport
 from sources.superjob import urls_sj
 from tools.utils import i_input, get_binary_answer
+from filter.area_index import AreaIndex
 from filter.filter_abc import Filter
 
 
@@ -19,14 +18,15 @@ class FilterSJ(Filter):
 
     def __init__(self) -> None:
         """
-        Инициализатор фильтра. Устанавливает значения фильтра по умолчанию,
-        получает и устанавливает некоторые словари с допустимыми значениями, получаемые с сайта
+        Инициализатор фильтра. Устанавливает значения фильтра по умолчанию.
+        Словари с допустимыми значениями загружаются с сайта при первом обращении
         """
 
         # в этих полях находятся словари сайта с перечнем допустимых значений фильтра
-        self._filter_dictionary = self.get_filter_dictionary()
-        self._areas_info = self.get_areas_info()
-        self._areas_names = self.get_areas_names()
+        self._filter_dictionary = None
+        self._areas_info = None
+        self._areas_names = None
+        self._area_index = None
 
         # параметры фильтра, настроены по умолчанию
         self.parameters = {
@@ -122,11 +122,8 @@ class FilterSJ(Filter):
         для некоторых параметров фильтра
         """
 
-        url = self._FILTER_DICTIONARY
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        raise requests.RequestException("Ошибка при получении словаря дополнительных значений")
+        return transport.get_reference(self._FILTER_DICTIONARY,
+                                       "Ошибка при получении словаря дополнительных значений")
 
     def get_areas_info(self) -> list[dict]:
         """
@@ -134,11 +131,7 @@ class FilterSJ(Filter):
         доступных для поиска вакансий на сайте
         """
 
-        url = self._AREA_CODES
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        raise requests.RequestException("Ошибка при получении списка кодов")
+        return transport.get_reference(self._AREA_CODES, "Ошибка при получении списка кодов")
 
     def get_areas_names(self) -> list[str]:
         """
@@ -146,7 +139,9 @@ class FilterSJ(Filter):
         доступных для поиска вакансий на сайте
         """
 
-        areas = self._areas_info
+        import jsonpath_ng as jp
+
+        areas = self.areas_info
 
         json_exp = jp.parse('$..title')
         matches = json_exp.find(areas)
@@ -154,19 +149,21 @@ class FilterSJ(Filter):
 
         return codes
 
-    def get_area_id(self, name: str) -> int:
+    def get_area_index(self) -> AreaIndex:
         """
-        Возвращает id переданного функции субъекта,
-        если он есть в списке доступных
+        Возвращает триграммный индекс по названиям городов и регионов,
+        доступных для поиска вакансий на сайте
         """
 
-        regions = self._areas_info
+        return AreaIndex.from_sj(self.areas_info)
 
-        json_exp = jp.parse("$..towns[*]")
-        matches = [match.value for match in json_exp.find(regions) if match.value.get('title') == name]
+    def get_area_id(self, name: str) -> int | None:
+        """
+        Возвращает id переданного функции субъекта,
+        если он есть в списке доступных и так не называются несколько субъектов
+        """
 
-        if matches:
-            return matches[0].get("id")
+        return self.area_index.get_id(name)
 
     # далее идёт блок вопросов к пользователю для установки настроек фильтра !
 
@@ -250,7 +247,7 @@ class FilterSJ(Filter):
         параметра 'требуемый опыт работы'
         """
 
-        experience = self._filter_dictionary["experience"]
+        experience = self.filter_dictionary["experience"]
         text = "опыта работы"
 
         answer = self._get_definite_answer(experience, text)
@@ -263,7 +260,7 @@ class FilterSJ(Filter):
         параметра 'тип занятости'
         """
 
-        type_of_work = self._filter_dictionary["type_of_work"]
+        type_of_work = self.filter_dictionary["type_of_work"]
         text = "типа занятости"
 
         answer = self._get_definite_answer(type_of_work, text)
@@ -276,7 +273,7 @@ class FilterSJ(Filter):
         параметра 'период публикации' вакансии
         """
 
-        period = self._filter_dictionary["period"]
+        period = self.filter_dictionary["period"]
         text = "периода публикации"
 
         answer = self._get_definite_answer(period, text)
@@ -286,31 +283,12 @@ class FilterSJ(Filter):
     def ask_town(self) -> int | None:
         """
         Запрашивает у пользователя, ищет и возвращает id
-        по указанному названию города или другого субъекта,
-        если таковой есть в перечне доступных для поиска
+        по указанному названию города или другого субъекта.
+        Название можно вводить в любом регистре и с опечатками:
+        будут предложены наиболее похожие варианты
         """
 
-        all_towns = sorted(self._areas_names)
-        name = i_input("\nВведите город или населенный пункт, либо нажмите Enter для пропуска:\n")
-
-        while name != "":
-
-            if name == "list":
-                print()
-                print(*all_towns, sep="\n")
-                print()
-                name = i_input("Попробуйте ещё раз:\n")
-
-            elif name not in all_towns:
-                print(f"Не могу найти такой населенный пункт.\n"
-                      f"Для вызова списка городов введите 'list'.\n"
-                      f"Соблюдайте регистр.")
-                name = i_input("Попробуйте ещё раз:\n")
-
-            else:
-                break
-
-        return self.get_area_id(name)
+        return self.ask_area_id()
 
     @staticmethod
     def _get_right_number(text: str) -> int | None:
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from request_api import transport
+
 
 class API(ABC):
     """
@@ -8,6 +10,7 @@ class API(ABC):
     """
 
     _URL = None  # ссылка на сайт для запроса вакансий
+    _ITEMS_KEY = None  # ключ списка вакансий в ответе сайта
     _MAX_QUANTITY = 500  # максимальное допустимое запрашиваемое количество вакансий
 
     def __init__(self, request_filter, quantity=10) -> None:
@@ -59,6 +62,28 @@ class API(ABC):
 
         return self.request_filter.get_request_parameters()
 
+    def get_headers(self) -> dict:
+        """Возвращает заголовки, которые нужно передавать сайту с каждым запросом"""
+
+        return {}
+
+    def get_response(self, headers: dict | None = None):
+        """
+        Отправляет запрос с параметрами фильтра на сайт с вакансиями
+        и возвращает ответ сайта целиком, вместе со статусом и заголовками
+
+        :param headers: дополнительные заголовки запроса
+        """
+
+        parameters = self.request_filter.get_request_parameters()
+
+        return transport.get(self._URL, parameters, {**self.get_headers(), **(headers or {})})
+
+    def get_items(self, info: dict) -> list[dict]:
+        """Возвращает список вакансий из ответа сайта"""
+
+        return info.get(self._ITEMS_KEY) or []
+
     @abstractmethod
     def get_info(self) -> list[dict]:
         """Возвращает ответ на запрос, отправленный на сайт с вакансиями"""
@@ -1,11 +1,9 @@
-import requests
-import json
-
 from types import NoneType
 
 from sources.headhunter import urls_hh
 from filter.filter_hh import FilterHH
 from request_api.request_api_abc import API
+from tools import tracing
 
 
 class HeadHunterAPI(API):
@@ -15,6 +13,7 @@ class HeadHunterAPI(API):
     """
 
     _URL = urls_hh.VACANCIES  # ссылка на сайт для запроса вакансий
+    _ITEMS_KEY = "items"  # ключ списка вакансий в ответе сайта
 
     @property
     def request_filter(self) -> FilterHH:
@@ -30,14 +29,14 @@ class HeadHunterAPI(API):
     def get_info(self) -> dict:
         """Возвращает ответ на запрос, отправленный на сайт с вакансиями"""
 
-        parameters = self.request_filter.get_request_parameters()
-
-        with requests.get(self._URL, parameters) as request:
-            response = request.content.decode("utf-8")
-            response = json.loads(response)
+        with tracing.span("api.get_info", source="hh", page=self.request_filter.parameters.get("page")):
+            with self.get_response() as request:
+                with tracing.span("api.parse"):
+                    response = request.json()
 
         return response
 
+    @tracing.traced("api.get_vacancies")
     def get_vacancies(self) -> list:
         """Возвращает список вакансий в заданном количестве, если это возможно"""
 
@@ -1,12 +1,9 @@
-import requests
-import json
-
 from types import NoneType
 
-from sources.superjob import personal_data
 from sources.superjob import urls_sj
 from filter.filter_sj import FilterSJ
 from request_api.request_api_abc import API
+from tools import tracing
 
 
 class SuperJobAPI(API):
@@ -16,6 +13,7 @@ class SuperJobAPI(API):
     """
 
     _URL = urls_sj.VACANCIES  # ссылка на сайт для запроса вакансий
+    _ITEMS_KEY = "objects"  # ключ списка вакансий в ответе сайта
 
     @property
     def request_filter(self) -> FilterSJ | None:
@@ -28,19 +26,26 @@ class SuperJobAPI(API):
         if isinstance(value, (FilterSJ, NoneType)):
             self._request_filter = value
 
+    def get_headers(self) -> dict:
+        """Возвращает заголовки для авторизации приложения на сайте"""
+
+        # личные данные загружаются только при обращении к SuperJob
+        from sources.superjob import personal_data
+
+        return {"User-Agent": personal_data.USER_AGENT,
+                "X-Api-App-Id": personal_data.CLIENT_SECRET}
+
     def get_info(self) -> dict:
         """Возвращает ответ на запрос, отправленный на сайт с вакансиями"""
 
-        parameters = self.request_filter.get_request_parameters()
-        headers = {"User-Agent": personal_data.USER_AGENT,
-                   "X-Api-App-Id": personal_data.CLIENT_SECRET}
-
-        with requests.get(self._URL, parameters, headers=headers) as request:
-            response = request.content.decode("utf-8")
-            response = json.loads(response)
+        with tracing.span("api.get_info", source="sj", page=self.request_filter.parameters.get("page")):
+            with self.get_response() as request:
+                with tracing.span("api.parse"):
+                    response = request.json()
 
         return response
 
+    @tracing.traced("api.get_vacancies")
     def get_vacancies(self) -> list:
         """Возвращает список вакансий в заданном количестве, если это возможно"""
 
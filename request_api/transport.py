@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+
+from sources.constants import CBR_RATE_URL, REQUEST_TIMEOUT
+from tools import tracing
+
+# Общий транспорт для запросов к сайтам.
+# Библиотека requests загружается и сессия создается только при первом запросе,
+# справочные данные сайтов загружаются один раз за время работы программы.
+# Одинаковые запросы, отправленные одновременно из разных потоков, объединяются в один:
+# запрос выполняет первый поток, остальные ждут и получают тот же ответ
+
+# сессия requests, переиспользует соединения между запросами
+_session = None
+_session_lock = threading.Lock()
+
+# загруженные справочники, ключ - ссылка на ресурс
+_references = {}
+
+# выполняющиеся запросы, ключ - ссылка, параметры и заголовки запроса
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+class _Call:
+    """Выполняющийся запрос, результата которого ждут один или несколько потоков"""
+
+    def __init__(self) -> None:
+        """Инициализатор объектов класса"""
+
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class RateLimiter:
+    """Ограничение частоты запросов к сайтам: не больше заданного количества запросов в секунду"""
+
+    def __init__(self, requests_per_second: float) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param requests_per_second: допустимое количество запросов в секунду
+        """
+
+        self.interval = 1 / requests_per_second
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Ожидает, пока можно будет отправить следующий запрос"""
+
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_session():
+    """Возвращает общую сессию requests, создавая её при первом обращении"""
+
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                _session = requests.Session()
+
+    return _session
+
+
+def get(url: str, params: dict | None = None, headers: dict | None = None,
+        timeout: float | tuple[float, float] = REQUEST_TIMEOUT):
+    """
+    Отправляет GET-запрос через общую сессию и возвращает ответ.
+    Если сайт не ответил за время timeout, выбрасывается requests.Timeout (наследует OSError)
+
+    :param url: ссылка на ресурс
+    :param params: параметры запроса
+    :param headers: заголовки запроса
+    :param timeout: время ожидания в секундах, общее или пара (на соединение, на чтение ответа)
+    """
+
+    key = json.dumps([url, params, headers], sort_keys=True, default=str)
+
+    def send():
+        """Отправляет запрос через общую сессию"""
+
+        return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+    with tracing.span("http.get", url=url, page=(params or {}).get("page")):
+        return _coalesce(key, send)
+
+
+def _coalesce(key: str, function):
+    """
+    Выполняет функцию, если запрос с таким же ключом сейчас не выполняется,
+    иначе ждёт окончания выполняющегося запроса и возвращает его результат
+    (или выбрасывает его исключение)
+    """
+
+    with _in_flight_lock:
+        call = _in_flight.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _in_flight[key] = _Call()
+
+    if not is_leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = function()
+    except Exception as error:
+        call.error = error
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+        call.done.set()
+
+    return call.result
+
+
+def get_json(url: str, params: dict | None = None, headers: dict | None = None,
+             error_message: str = "Ошибка при выполнении запроса") -> dict | list:
+    """
+    Отправляет GET-запрос и возвращает разобранный JSON-ответ
+
+    :param error_message: текст исключения, если сайт ответил с ошибкой
+    """
+
+    response = get(url, params, headers)
+    if response.status_code != 200:
+        import requests
+        raise requests.RequestException(error_message)
+
+    return response.json()
+
+
+def get_reference(url: str, error_message: str = "Ошибка при получении справочника") -> dict | list:
+    """
+    Возвращает справочник сайта (словари значений фильтра, перечень регионов и т.п.).
+    Справочник загружается при первом обращении и далее берётся из памяти
+    """
+
+    if url not in _references:
+        with tracing.span("http.reference", url=url):
+            _references[url] = get_json(url, error_message=error_message)
+
+    return _references[url]
+
+
+def get_currency_rates() -> dict:
+    """Возвращает словарь с текущим курсом валют ЦБР, загружается один раз"""
+
+    return get_reference(CBR_RATE_URL, "Ошибка при загрузке словаря с текущим курсом валют").get("Valute")
@@ -0,0 +1,150 @@
+import atexit
+import queue
+import threading
+from typing import Callable
+
+
+class SaveTicket:
+    """
+    Квитанция о поставленной в очередь записи, позволяет дождаться её завершения
+    и узнать результат: сообщение, которое вернула функция записи, или ошибку
+    """
+
+    def __init__(self, description: str) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param description: описание операции записи для сообщений об ошибках
+        """
+
+        self.description = description
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+
+    def __repr__(self) -> str:
+        """Строковое представление квитанции в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.description!r}, done={self.done})"
+
+    @property
+    def done(self) -> bool:
+        """Завершена ли запись"""
+
+        return self._done.is_set()
+
+    def set_done(self, error: Exception | None = None, result=None) -> None:
+        """Отмечает запись завершенной, сохраняя результат или возникшую ошибку"""
+
+        self.result = result
+        self.error = error
+        self._done.set()
+
+    def get_message(self) -> str | None:
+        """Сообщение для пользователя о результате записи, None если сообщать нечего"""
+
+        if self.error is not None:
+            return f"Ошибка при записи ({self.description}): {self.error}"
+
+        return self.result if isinstance(self.result, str) else None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Ожидает завершения записи.
+        Если при записи возникла ошибка, выбрасывает её
+
+        :param timeout: максимальное время ожидания в секундах, по умолчанию без ограничения
+        :return: True, если запись завершена
+        """
+
+        finished = self._done.wait(timeout)
+        if self.error is not None:
+            raise self.error
+
+        return finished
+
+
+class BackgroundWriter:
+    """
+    Фоновая запись вакансий в файлы.
+    Операции записи выполняются по очереди в отдельном потоке,
+    пока пользователь продолжает работу с программой.
+    Поток записи ничего не выводит на экран, чтобы не вклиниваться в вопросы программы:
+    результаты завершенных записей выводит report, вызванный из основного потока
+    """
+
+    def __init__(self, max_pending: int = 8) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param max_pending: максимальное количество операций в очереди,
+        при заполнении очереди постановка новой операции ожидает освобождения места
+        """
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        # квитанции завершенных записей, о которых еще не сообщено пользователю
+        self._finished = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(pending={self._queue.qsize()})"
+
+    def _start(self) -> None:
+        """Запускает поток записи при первой постановке операции в очередь"""
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+                self._thread.start()
+                # дожидаемся записи всех файлов и при досрочном завершении программы
+                # (функции atexit вызываются в обратном порядке: сначала flush, затем report)
+                atexit.register(self.report)
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        """Основной цикл потока записи"""
+
+        while True:
+            function, args, ticket = self._queue.get()
+            try:
+                result = function(*args)
+            except Exception as error:
+                ticket.set_done(error)
+            else:
+                ticket.set_done(result=result)
+            finally:
+                self._finished.put(ticket)
+                self._queue.task_done()
+
+    def submit(self, function: Callable, *args) -> SaveTicket:
+        """
+        Ставит операцию записи в очередь и сразу возвращает управление
+
+        :param function: функция, выполняющая запись
+        :param args: аргументы функции
+        :return: квитанция, позволяющая дождаться завершения записи
+        """
+
+        self._start()
+
+        ticket = SaveTicket(getattr(function, "__qualname__", repr(function)))
+        self._queue.put((function, args, ticket))
+
+        return ticket
+
+    def flush(self) -> None:
+        """Ожидает завершения всех поставленных в очередь операций записи"""
+
+        if self._thread is not None:
+            self._queue.join()
+
+    def report(self) -> None:
+        """Выводит результаты записей, завершившихся после предыдущего вызова"""
+
+        while not self._finished.empty():
+            message = self._finished.get().get_message()
+            if message is not None:
+                print(f"\n{message}")
@@ -0,0 +1,375 @@
+import bisect
+import json
+import os
+import threading
+from typing import Iterator
+
+from sources.constants import PATH_DIR_JSON
+from vacancy.vacancy_factory import create_vacancy, get_source
+
+# абсолютный путь к корневой папке проекта
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+
+def get_vacancy_key(vacancy_dict: dict) -> str | None:
+    """Возвращает уникальный ключ вакансии: сайт и id, например 'hh:12345'"""
+
+    source = get_source(vacancy_dict)
+    if source is None or vacancy_dict.get("id") is None:
+        return None
+
+    return f"{source}:{vacancy_dict['id']}"
+
+
+def get_area_name(vacancy_dict: dict) -> str | None:
+    """Возвращает название города или региона вакансии"""
+
+    area = vacancy_dict.get("area") or vacancy_dict.get("town")
+
+    return (area.get("name") or area.get("title")) if isinstance(area, dict) else None
+
+
+def get_published_time(vacancy_dict: dict) -> int | None:
+    """Возвращает время публикации вакансии в секундах unix-времени"""
+
+    published = vacancy_dict.get("published_at") or vacancy_dict.get("date_published")
+
+    if isinstance(published, str):
+        from datetime import datetime
+        try:
+            return int(datetime.strptime(published, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+        except ValueError:
+            return None
+
+    return published
+
+
+def get_raw_salary(vacancy_dict: dict) -> tuple | None:
+    """
+    Возвращает границы зарплаты вакансии в валюте вакансии и код валюты: (от, до, валюта),
+    неуказанная граница - None. Курс валют не нужен, поэтому функция не обращается к сети.
+    Как и в get_min_salary, суммы SuperJob считаются указанными в рублях. None - зарплата не указана
+    """
+
+    source = get_source(vacancy_dict)
+
+    if source == "hh":
+        salary = vacancy_dict.get("salary") or {}
+        salary_from, salary_to, currency = salary.get("from"), salary.get("to"), salary.get("currency") or "RUR"
+    elif source == "sj":
+        salary_from, salary_to, currency = vacancy_dict.get("payment_from"), vacancy_dict.get("payment_to"), "RUR"
+    else:
+        return None
+
+    if not salary_from and not salary_to:
+        return None
+
+    return salary_from or None, salary_to or None, currency
+
+
+def get_raw_min_salary(vacancy_dict: dict) -> tuple[int | float, str] | None:
+    """
+    Возвращает минимальную зарплату вакансии в валюте вакансии и код валюты, без конвертации в рубли
+    и без обращения к сети. None - зарплата не указана
+    """
+
+    salary = get_raw_salary(vacancy_dict)
+    if salary is None:
+        return None
+
+    salary_from, salary_to, currency = salary
+
+    return min(amount for amount in (salary_from, salary_to) if amount), currency
+
+
+def get_rouble_range(salaries: dict) -> tuple:
+    """
+    Возвращает диапазон минимальных зарплат в рублях по диапазонам в каждой валюте.
+    Курс валют загружается, только если в файле есть зарплаты не в рублях.
+    Зарплаты в валютах без курса не учитываются: get_min_salary считает их нулевыми
+
+    :param salaries: код валюты -> [наименьшая, наибольшая] минимальная зарплата в этой валюте
+    :return: (наименьшая, наибольшая) зарплата в рублях, (None, None) - зарплат нет
+    """
+
+    from vacancy.vacancy_hh import VacancyHeadHunter
+
+    bounds = []
+
+    for currency, amounts in salaries.items():
+        if currency == "RUR":
+            bounds.extend(amounts)
+        else:
+            bounds.extend(filter(None, (VacancyHeadHunter.convert_currency(amount, currency) for amount in amounts)))
+
+    return (min(bounds), max(bounds)) if bounds else (None, None)
+
+
+class FileSummary:
+    """
+    Сводка о содержимом файла с вакансиями: ключи вакансий, диапазоны минимальных зарплат
+    в каждой валюте, города и регионы, диапазон дат публикации. Строится по мере записи вакансий в файл.
+    Зарплаты не конвертируются в рубли при записи, чтобы запись файла не зависела от загрузки курса валют
+    """
+
+    def __init__(self) -> None:
+        """Инициализатор объектов класса"""
+
+        self.count = 0
+        self.ids = set()
+        self.areas = set()
+        self.salaries = {}  # код валюты -> [наименьшая, наибольшая] минимальная зарплата
+        self.date_min = None
+        self.date_max = None
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(count={self.count}, salaries={self.salaries})"
+
+    def add(self, vacancy_dict: dict) -> None:
+        """Учитывает вакансию в сводке"""
+
+        self.count += 1
+
+        vacancy_key = get_vacancy_key(vacancy_dict)
+        if vacancy_key is None:
+            # краткая информация о вакансии или вакансия неизвестного сайта
+            return
+
+        self.ids.add(vacancy_key)
+
+        area = get_area_name(vacancy_dict)
+        if area:
+            self.areas.add(area)
+
+        salary = get_raw_min_salary(vacancy_dict)
+        if salary is not None:
+            amount, currency = salary
+            amounts = self.salaries.get(currency)
+            if amounts is None:
+                self.salaries[currency] = [amount, amount]
+            else:
+                amounts[0], amounts[1] = min(amounts[0], amount), max(amounts[1], amount)
+
+        published = get_published_time(vacancy_dict)
+        if published is not None:
+            self.date_min = published if self.date_min is None else min(self.date_min, published)
+            self.date_max = published if self.date_max is None else max(self.date_max, published)
+
+    def to_dict(self) -> dict:
+        """Возвращает сводку в виде словаря для записи в каталог"""
+
+        return {"count": self.count, "ids": sorted(self.ids), "areas": sorted(self.areas),
+                "salaries": self.salaries, "date_min": self.date_min, "date_max": self.date_max}
+
+
+class Catalog:
+    """
+    Каталог файлов с вакансиями в папке PATH_DIR_JSON.
+    Для каждого файла хранит сводку (FileSummary), которая обновляется при каждой записи файла.
+    Сводка хранится рядом с файлом (файл с расширением .summary), поэтому запись одного файла
+    перезаписывает только его сводку, а не сводки всех файлов папки.
+    Запросы по всем файлам сначала отбрасывают файлы, сводка которых не подходит под условия,
+    и читают только оставшиеся
+    """
+
+    # расширение файла сводки, который хранится рядом с файлом вакансий
+    _SUMMARY_EXTENSION = ".summary"
+
+    # расширения файлов с вакансиями
+    _EXTENSIONS = (".json", ".json.gz", ".json.zst")
+
+    def __init__(self, path_dir: tuple = PATH_DIR_JSON) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_dir: кортеж строк для построения пути к папке с файлами вакансий
+        """
+
+        self.path_dir = os.path.join(ROOT_DIR, *path_dir)
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_dir!r})"
+
+    def contains(self, path_file: str) -> bool:
+        """Проверяет, относится ли файл к каталогу"""
+
+        return os.path.dirname(os.path.abspath(path_file)) == os.path.abspath(self.path_dir) \
+            and path_file.endswith(self._EXTENSIONS)
+
+    def get_summary_path(self, path_file: str) -> str:
+        """Возвращает путь к файлу сводки о файле с вакансиями"""
+
+        return f"{path_file}{self._SUMMARY_EXTENSION}"
+
+    def load_entry(self, path_file: str) -> dict | None:
+        """Загружает сводку о файле, None если ее нет"""
+
+        try:
+            with open(self.get_summary_path(path_file), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            return None
+
+    def save_entry(self, path_file: str, entry: dict) -> None:
+        """Записывает сводку о файле"""
+
+        path_summary = self.get_summary_path(path_file)
+        temporary_path = f"{path_summary}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(entry, file, ensure_ascii=False)
+
+        os.replace(temporary_path, path_summary)
+
+    @staticmethod
+    def _get_stamp(path_file: str) -> dict:
+        """Время изменения и размер файла, по которым определяется, устарела ли сводка"""
+
+        stat = os.stat(path_file)
+
+        return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+    def update_file(self, path_file: str, summary: FileSummary) -> None:
+        """Записывает сводку о только что записанном файле"""
+
+        self.save_entry(path_file, {**self._get_stamp(path_file), **summary.to_dict()})
+
+    def refresh(self) -> dict:
+        """
+        Обновляет сводки файлов, измененных не через JSONSaver, строит сводки новых файлов
+        и удаляет сводки несуществующих
+
+        :return: актуальный каталог: имя файла -> сводка о файле
+        """
+
+        from saver.json_saver import JSONSaver
+
+        if not os.path.isdir(self.path_dir):
+            return {}
+
+        names = os.listdir(self.path_dir)
+        files = {}
+
+        for name in names:
+            path_file = os.path.join(self.path_dir, name)
+
+            if name.endswith(self._SUMMARY_EXTENSION) and name[:-len(self._SUMMARY_EXTENSION)] not in names:
+                try:
+                    os.remove(path_file)
+                except OSError:
+                    pass
+                continue
+
+            if not self.contains(path_file):
+                continue
+
+            stamp = self._get_stamp(path_file)
+            entry = self.load_entry(path_file)
+            if entry is not None and entry["mtime"] == stamp["mtime"] and entry["size"] == stamp["size"]:
+                files[name] = entry
+                continue
+
+            summary = FileSummary()
+            try:
+                for vacancy_dict in JSONSaver((path_file,)).iter_vacancies():
+                    summary.add(vacancy_dict)
+            except Exception as error:
+                print(f"Не удалось прочитать файл {path_file}: {error}")
+
+            files[name] = {**stamp, **summary.to_dict()}
+            self.save_entry(path_file, files[name])
+
+        return files
+
+    @staticmethod
+    def is_candidate(entry: dict, vacancy_key: str | None = None, area: str | None = None,
+                     salary_from: int | None = None, salary_to: int | None = None,
+                     date_from: int | None = None, date_to: int | None = None) -> bool:
+        """Проверяет, могут ли в файле с такой сводкой быть подходящие вакансии"""
+
+        if not entry["ids"]:
+            return False
+        if vacancy_key is not None:
+            # ключи в сводке отсортированы
+            position = bisect.bisect_left(entry["ids"], vacancy_key)
+            if position == len(entry["ids"]) or entry["ids"][position] != vacancy_key:
+                return False
+        if area is not None and area.lower() not in {name.lower() for name in entry["areas"]}:
+            return False
+        if salary_from is not None or salary_to is not None:
+            salary_min, salary_max = get_rouble_range(entry["salaries"])
+            if salary_from is not None and (salary_max is None or salary_max < salary_from):
+                return False
+            if salary_to is not None and (salary_min is None or salary_min > salary_to):
+                return False
+        if date_from is not None and (entry["date_max"] is None or entry["date_max"] < date_from):
+            return False
+        if date_to is not None and (entry["date_min"] is None or entry["date_min"] > date_to):
+            return False
+
+        return True
+
+    def find_files(self, **conditions) -> list[str]:
+        """
+        Возвращает пути к файлам, в которых могут быть вакансии, подходящие под условия.
+        Условия - именованные параметры is_candidate
+        """
+
+        return [os.path.join(self.path_dir, name) for name, entry in sorted(self.refresh().items())
+                if self.is_candidate(entry, **conditions)]
+
+    def query(self, vacancy_key: str | None = None, area: str | None = None,
+              salary_from: int | None = None, salary_to: int | None = None,
+              date_from: int | None = None, date_to: int | None = None) -> Iterator[dict]:
+        """
+        Возвращает поток словарей вакансий из всех файлов каталога, подходящих под условия.
+        Читаются только файлы, сводка которых допускает подходящие вакансии
+
+        :param vacancy_key: ключ вакансии, например 'hh:12345'
+        :param area: название города или региона
+        :param salary_from: минимальная зарплата в рублях не меньше
+        :param salary_to: минимальная зарплата в рублях не больше
+        :param date_from: опубликована не раньше (unix-время)
+        :param date_to: опубликована не позже (unix-время)
+        """
+
+        from saver.json_saver import JSONSaver
+
+        conditions = {"vacancy_key": vacancy_key, "area": area, "salary_from": salary_from,
+                      "salary_to": salary_to, "date_from": date_from, "date_to": date_to}
+
+        for path_file in self.find_files(**conditions):
+            for vacancy_dict in JSONSaver((path_file,)).iter_vacancies():
+                if self.matches(vacancy_dict, **conditions):
+                    yield vacancy_dict
+
+    @staticmethod
+    def matches(vacancy_dict: dict, vacancy_key: str | None = None, area: str | None = None,
+                salary_from: int | None = None, salary_to: int | None = None,
+                date_from: int | None = None, date_to: int | None = None) -> bool:
+        """Проверяет, подходит ли вакансия под условия запроса"""
+
+        if vacancy_key is not None and get_vacancy_key(vacancy_dict) != vacancy_key:
+            return False
+        if area is not None and (get_area_name(vacancy_dict) or "").lower() != area.lower():
+            return False
+
+        if salary_from is not None or salary_to is not None:
+            vacancy = create_vacancy(vacancy_dict)
+            salary = vacancy.get_min_salary() if vacancy is not None else 0
+            if not salary or (salary_from is not None and salary < salary_from) \
+                    or (salary_to is not None and salary > salary_to):
+                return False
+
+        if date_from is not None or date_to is not None:
+            published = get_published_time(vacancy_dict)
+            if published is None or (date_from is not None and published < date_from) \
+                    or (date_to is not None and published > date_to):
+                return False
+
+        return True
+
@@ -0,0 +1,404 @@
+import json
+import math
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from typing import Iterable, Iterator
+
+from filter.filter_abc import Filter
+from saver.catalog import get_area_name, get_published_time
+from saver.saver_abc import Saver
+from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_factory import create_vacancy, get_source
+
+
+def _get_id(value: dict | None) -> str | None:
+    """Возвращает id значения справочника (регион, опыт, занятость) в виде строки"""
+
+    return str(value["id"]) if isinstance(value, dict) and value.get("id") is not None else None
+
+
+def _get_name(value: dict | None) -> str | None:
+    """Возвращает название значения справочника сайта"""
+
+    return (value.get("name") or value.get("title")) if isinstance(value, dict) else None
+
+
+def _to_int(value) -> int:
+    """Приводит id вакансии к целому числу, -1 если это невозможно"""
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+class ColumnarSaver(Saver):
+    """
+    Сохранение вакансий в двоичный колоночный файл.
+    Числовые поля (id, зарплаты в рублях, дата публикации) хранятся упакованными массивами,
+    строковые поля - кодами словаря значений, полная информация о вакансии - отдельным блоком JSON.
+    Файл читается через отображение в память (ColumnarReader): колонки не копируются и не разбираются,
+    JSON разбирается только для тех вакансий, которые действительно нужны
+    """
+
+    # сигнатура файла
+    MAGIC = b"VACCOL01"
+
+    # колонки: название -> (тип элементов массива, функция получения значения из словаря вакансии)
+    # типы: 'q' - целое число (-1 - нет значения), 'd' - дробное число (nan - нет значения),
+    # 'I' - код строки в словаре значений колонки (0 - нет значения)
+    COLUMNS = {
+        "source": ("I", lambda vacancy_dict, vacancy: get_source(vacancy_dict)),
+        "id": ("q", lambda vacancy_dict, vacancy: _to_int(vacancy_dict.get("id"))),
+        "name": ("I", lambda vacancy_dict, vacancy: vacancy_dict.get("name") or vacancy_dict.get("profession")),
+        "employer": ("I", lambda vacancy_dict, vacancy:
+                     _get_name(vacancy_dict.get("employer")) or vacancy_dict.get("firm_name")),
+        "area_id": ("I", lambda vacancy_dict, vacancy: _get_id(vacancy_dict.get("area") or vacancy_dict.get("town"))),
+        "area": ("I", lambda vacancy_dict, vacancy: get_area_name(vacancy_dict)),
+        "experience_id": ("I", lambda vacancy_dict, vacancy: _get_id(vacancy_dict.get("experience"))),
+        "employment_id": ("I", lambda vacancy_dict, vacancy:
+                          _get_id(vacancy_dict.get("employment") or vacancy_dict.get("type_of_work"))),
+        "currency": ("I", lambda vacancy_dict, vacancy:
+                     (vacancy_dict.get("salary") or {}).get("currency") or vacancy_dict.get("currency")),
+        # get_min_salary возвращает 0, если зарплата не указана: в колонку вместо него записывается nan
+        "min_salary": ("d", lambda vacancy_dict, vacancy: (vacancy.get_min_salary() if vacancy else 0) or math.nan),
+        "published": ("q", lambda vacancy_dict, vacancy: get_published_time(vacancy_dict) or -1),
+    }
+
+    def add_vacancies(self, list_vacancies: list) -> None:
+        """
+        Добавляет вакансии в файл. Колоночный файл не дописывается,
+        поэтому он перезаписывается вместе с уже сохраненными вакансиями
+
+        :param list_vacancies: список с информацией о найденных вакансиях
+        """
+
+        if not os.path.exists(self.path_file) or not os.path.getsize(self.path_file):
+            self.write_vacancies(list_vacancies)
+            return
+
+        with self.open() as reader:
+            vacancies = list(reader.iter_vacancies())
+
+        vacancies.extend(list_vacancies)
+
+        self.write_vacancies(vacancies)
+
+    def write_vacancies(self, list_vacancies: list) -> None:
+        """
+        Перезаписывает (или создает) файл для записи информации о найденных вакансиях
+
+        :param list_vacancies: список с информацией о найденных вакансиях
+        """
+
+        self.write_stream(list_vacancies)
+
+        print(f"\nВакансии записаны в файл {self.path_file}")
+
+    def write_stream(self, vacancies: Iterable[dict]) -> int:
+        """
+        Перезаписывает файл вакансиями из потока.
+        В памяти накапливаются только колонки, полная информация сразу пишется во временный файл
+
+        :param vacancies: коллекция или итератор словарей вакансий
+        :return: количество записанных вакансий
+        """
+
+        columns = {name: array(code) for name, (code, _) in self.COLUMNS.items()}
+        dictionaries = {name: {None: 0} for name, (code, _) in self.COLUMNS.items() if code == "I"}
+        blob_offsets = array("Q", [0])
+
+        directory = os.path.dirname(self.path_file)
+        os.makedirs(directory, exist_ok=True)
+
+        with tempfile.TemporaryFile(dir=directory) as blob:
+            for vacancy_dict in vacancies:
+                vacancy = create_vacancy(vacancy_dict)
+
+                for name, (code, get_value) in self.COLUMNS.items():
+                    value = get_value(vacancy_dict, vacancy)
+                    if code == "I":
+                        value = dictionaries[name].setdefault(value, len(dictionaries[name]))
+                    columns[name].append(value)
+
+                blob.write(json.dumps(vacancy_dict, ensure_ascii=False).encode("utf-8"))
+                blob_offsets.append(blob.tell())
+
+            header = self._build_header(columns, dictionaries, blob_offsets)
+
+            temporary_path = f"{self.path_file}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(self.MAGIC)
+                file.write(len(header).to_bytes(8, "little"))
+                file.write(header)
+
+                for column in (*columns.values(), blob_offsets):
+                    data = column.tobytes()
+                    file.write(data)
+                    file.write(b"\0" * (-len(data) % 8))
+
+                blob.seek(0)
+                shutil.copyfileobj(blob, file)
+
+            os.replace(temporary_path, self.path_file)
+
+        return len(blob_offsets) - 1
+
+    @staticmethod
+    def _build_header(columns: dict[str, array], dictionaries: dict[str, dict],
+                      blob_offsets: array) -> bytes:
+        """
+        Строит заголовок файла: описание колонок, их смещения от начала данных и словари значений.
+        Заголовок дополняется пробелами до длины, кратной 8, чтобы колонки были выровнены
+        """
+
+        description = {"count": len(blob_offsets) - 1, "byteorder": sys.byteorder, "columns": {}}
+        offset = 0
+
+        for name, column in (*columns.items(), ("full_info_offsets", blob_offsets)):
+            size = len(column) * column.itemsize
+            description["columns"][name] = {"type": column.typecode, "offset": offset, "length": len(column)}
+            if name in dictionaries:
+                description["columns"][name]["dictionary"] = list(dictionaries[name])
+            offset += size + (-size % 8)
+
+        description["full_info_offset"] = offset
+
+        header = json.dumps(description, ensure_ascii=False).encode("utf-8")
+        # магическая строка и длина заголовка занимают 16 байт
+        header += b" " * (-(16 + len(header)) % 8)
+
+        return header
+
+    def clean_file(self) -> None:
+        """Полностью очистить файл с информацией о вакансиях"""
+
+        self.write_stream([])
+
+        print(f"\nИнформация была стёрта из файла {self.path_file} ")
+
+    def open(self) -> "ColumnarReader":
+        """Открывает файл для чтения"""
+
+        return ColumnarReader(self.path_file)
+
+    def load_vacancies(self) -> list:
+        """
+        Загрузить информацию о вакансиях из файла
+        Сразу строит объекты соответствующих классов вакансий
+        """
+
+        with self.open() as reader:
+            return reader.load_vacancies()
+
+
+class ColumnarReader:
+    """
+    Чтение колоночного файла через отображение в память.
+    Колонки доступны как массивы без копирования (memoryview), строковые колонки - кодами
+    и словарем значений. Используется как менеджер контекста
+    """
+
+    # параметры фильтров, которые можно проверить по колонкам, не разбирая JSON вакансии
+    _FILTER_COLUMNS = {"area": "area_id", "town": "area_id", "experience": "experience_id",
+                       "employment": "employment_id", "type_of_work": "employment_id"}
+
+    def __init__(self, path_file: str) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: путь к файлу
+        """
+
+        self.path_file = path_file
+
+        self._file = open(path_file, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._data[:len(ColumnarSaver.MAGIC)] != ColumnarSaver.MAGIC:
+            self.close()
+            raise ValueError(f"Файл {path_file} не является колоночным файлом вакансий")
+
+        header_size = int.from_bytes(self._data[8:16], "little")
+        self.header = json.loads(self._data[16:16 + header_size])
+        self._data_start = 16 + header_size
+        self._columns = {}
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_file!r}, count={len(self)})"
+
+    def __len__(self) -> int:
+        """Количество вакансий в файле"""
+
+        return self.header["count"]
+
+    def __enter__(self) -> "ColumnarReader":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрывает файл. Полученные из файла колонки после этого использовать нельзя"""
+
+        for column in self._columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self._columns.clear()
+        self._data.close()
+        self._file.close()
+
+    def column(self, name: str) -> memoryview | array:
+        """Возвращает колонку как массив чисел (для строковых колонок - коды словаря значений)"""
+
+        if name not in self._columns:
+            description = self.header["columns"][name]
+            start = self._data_start + description["offset"]
+            size = description["length"] * array(description["type"]).itemsize
+            view = memoryview(self._data)[start:start + size]
+
+            if self.header["byteorder"] == sys.byteorder:
+                self._columns[name] = view.cast(description["type"])
+            else:
+                column = array(description["type"], view)
+                column.byteswap()
+                self._columns[name] = column
+
+        return self._columns[name]
+
+    def dictionary(self, name: str) -> list:
+        """Возвращает словарь значений строковой колонки: код -> значение"""
+
+        return self.header["columns"][name]["dictionary"]
+
+    def values(self, name: str) -> list:
+        """Возвращает значения колонки, строковые колонки - раскодированными"""
+
+        column = self.column(name)
+        if "dictionary" not in self.header["columns"][name]:
+            return column.tolist()
+
+        dictionary = self.dictionary(name)
+
+        return [dictionary[code] for code in column]
+
+    def get_code(self, name: str, value: str | None) -> int | None:
+        """Возвращает код значения строковой колонки, None если такого значения в файле нет"""
+
+        try:
+            return self.dictionary(name).index(value)
+        except ValueError:
+            return None
+
+    def get_codes(self, request_filter: Filter, key: str, value) -> set[int]:
+        """
+        Возвращает коды значений колонки, подходящих под параметр фильтра.
+        Для города или региона это все города файла, входящие в регион фильтра
+        """
+
+        name = self._FILTER_COLUMNS[key]
+
+        if key in ("area", "town"):
+            return {code for code, area_id in enumerate(self.dictionary(name))
+                    if request_filter.area_contains(value, area_id)}
+
+        code = self.get_code(name, str(value))
+
+        return set() if code is None else {code}
+
+    def get_full_info(self, position: int) -> dict:
+        """Возвращает словарь вакансии с полной информацией по её номеру в файле"""
+
+        offsets = self.column("full_info_offsets")
+        start = self._data_start + self.header["full_info_offset"]
+
+        return json.loads(self._data[start + offsets[position]:start + offsets[position + 1]])
+
+    def iter_vacancies(self, positions: Iterable[int] | None = None) -> Iterator[dict]:
+        """Возвращает поток словарей вакансий, по умолчанию всех"""
+
+        for position in range(len(self)) if positions is None else positions:
+            yield self.get_full_info(position)
+
+    def load_vacancies(self, positions: Iterable[int] | None = None) -> list[Vacancy]:
+        """Строит объекты вакансий, по умолчанию всех"""
+
+        list_vacancies = []
+
+        for vacancy_dict in self.iter_vacancies(positions):
+            vacancy = create_vacancy(vacancy_dict)
+            if vacancy is not None:
+                list_vacancies.append(vacancy)
+
+        return list_vacancies
+
+    def select(self, source: str | None = None, area: str | None = None,
+               salary_from: float | None = None, published_from: int | None = None) -> list[int]:
+        """
+        Возвращает номера вакансий, подходящих под условия, проверяя только колонки
+
+        :param source: сайт, 'hh' или 'sj'
+        :param area: название города или региона
+        :param salary_from: минимальная зарплата в рублях не меньше
+        :param published_from: опубликована не раньше (unix-время)
+        """
+
+        positions = range(len(self))
+
+        for name, value in (("source", source), ("area", area)):
+            if value is not None:
+                code = self.get_code(name, value)
+                column = self.column(name)
+                positions = [position for position in positions if column[position] == code]
+
+        if salary_from is not None:
+            column = self.column("min_salary")
+            # nan при сравнении всегда дает False, поэтому вакансии без зарплаты отбрасываются
+            positions = [position for position in positions if column[position] >= salary_from]
+
+        if published_from is not None:
+            column = self.column("published")
+            positions = [position for position in positions if column[position] >= published_from]
+
+        return list(positions)
+
+    def iter_matching(self, filter_hh: Filter | None = None, filter_sj: Filter | None = None) -> Iterator[dict]:
+        """
+        Возвращает поток словарей вакансий, подходящих под фильтры, в порядке следования в файле.
+        Вакансии сайта, для которого фильтр не передан, возвращаются без проверки.
+        Параметры фильтра, для которых есть колонки, проверяются по колонкам до разбора JSON
+        """
+
+        filters = {"hh": filter_hh, "sj": filter_sj}
+        sources = self.column("source")
+        source_names = self.dictionary("source")
+
+        # для каждого сайта: пары (колонка, коды подходящих значений фильтра)
+        conditions = {}
+        for source, request_filter in filters.items():
+            if request_filter is None:
+                continue
+            conditions[source] = [(self.column(self._FILTER_COLUMNS[key]), self.get_codes(request_filter, key, value))
+                                  for key, value in request_filter.get_filtering_parameters().items()
+                                  if key in self._FILTER_COLUMNS]
+
+        for position in range(len(self)):
+            source = source_names[sources[position]]
+            if source is None:
+                continue
+
+            request_filter = filters[source]
+            if request_filter is None:
+                yield self.get_full_info(position)
+                continue
+
+            if all(column[position] in codes for column, codes in conditions[source]):
+                vacancy_dict = self.get_full_info(position)
+                if request_filter.compare_parameters(vacancy_dict):
+                    yield vacancy_dict
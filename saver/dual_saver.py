@@ -0,0 +1,117 @@
+from typing import Iterable, Iterator
+
+from saver.json_saver import JSONSaver
+from tools.duplicates import DuplicateDetector
+from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_factory import create_vacancy
+
+
+class DualSaver:
+    """
+    Класс для одновременного сохранения полной и краткой информации о вакансиях.
+    Каждая вакансия обрабатывается один раз и за один проход записывается сразу в оба файла.
+    Дубликаты определяются один раз, по полной информации, поэтому в обоих файлах
+    остаются одни и те же вакансии в одном и том же порядке.
+    Методы записи ничего не выводят на экран, а возвращают сообщение о результате:
+    запись может выполняться в фоновом потоке, пока пользователь отвечает на вопросы программы
+    """
+
+    def __init__(self, saver_full: JSONSaver, saver_short: JSONSaver) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param saver_full: объект для сохранения полной информации о вакансиях
+        :param saver_short: объект для сохранения краткой информации о вакансиях
+        """
+
+        self.saver_full = saver_full
+        self.saver_short = saver_short
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.saver_full.path_file!r}, {self.saver_short.path_file!r})"
+
+    @staticmethod
+    def iter_info(list_objects: Iterable[Vacancy]) -> Iterator[tuple[dict, dict]]:
+        """Возвращает поток пар: полная и краткая информация о каждой вакансии"""
+
+        for vacancy in list_objects:
+            yield vacancy.full_info, vacancy.get_short_info()
+
+    def _write_both(self, pairs: Iterable[tuple[dict, dict]], start: int | None = None) -> int:
+        """
+        За один проход записывает полную и краткую информацию каждой вакансии сразу в оба файла
+
+        :param pairs: пары словарей с полной и краткой информацией о вакансиях
+        :param start: номер первой измененной вакансии, если предыдущие уже записаны в файлы
+        :return: количество записанных вакансий
+        """
+
+        with self.saver_full.open_sink(start) as sink_full, self.saver_short.open_sink(start) as sink_short:
+            for vacancy_full, vacancy_short in pairs:
+                sink_full.write(vacancy_full)
+                sink_short.write(vacancy_short)
+
+        return sink_full.count
+
+    def add_vacancies(self, list_objects: list[Vacancy]) -> str:
+        """
+        Добавляет информацию о вакансиях в оба файла.
+        Обновленные версии записанных вакансий заменяют их, дубликаты не добавляются
+
+        :return: сообщение о результате записи
+        """
+
+        saved_full = self.saver_full.read_saved_vacancies() or []
+        saved_short = self.saver_short.read_saved_vacancies() or []
+        if len(saved_short) != len(saved_full):
+            # файлы записаны не вместе: краткая информация строится заново по полной
+            vacancies = [create_vacancy(vacancy_dict) for vacancy_dict in saved_full]
+            saved_full = [vacancy_dict for vacancy_dict, vacancy in zip(saved_full, vacancies) if vacancy is not None]
+            saved_short = [vacancy.get_short_info() for vacancy in vacancies if vacancy is not None]
+
+        detector = DuplicateDetector()
+        for vacancy_dict in saved_full:
+            detector.add(vacancy_dict)
+
+        start = len(saved_full)
+
+        for vacancy_full, vacancy_short in self.iter_info(list_objects):
+            position = detector.place(vacancy_full)
+            if position is None:
+                continue
+            if position == len(saved_full):
+                saved_full.append(vacancy_full)
+                saved_short.append(vacancy_short)
+            else:
+                saved_full[position], saved_short[position] = vacancy_full, vacancy_short
+                start = min(start, position)
+
+        count = self._write_both(zip(saved_full, saved_short), start)
+
+        return f"Вакансии записаны в файлы {self.saver_full.path_file} и {self.saver_short.path_file}, " \
+               f"всего вакансий в файлах: {count}"
+
+    def write_vacancies(self, list_objects: list[Vacancy]) -> str:
+        """
+        Перезаписывает оба файла информацией о вакансиях
+
+        :return: сообщение о результате записи
+        """
+
+        count = self._write_both(self.iter_info(list_objects))
+
+        return f"Вакансии записаны в файлы {self.saver_full.path_file} и {self.saver_short.path_file}, " \
+               f"всего вакансий в файлах: {count}"
+
+    def clean_file(self) -> str:
+        """
+        Полностью очищает оба файла
+
+        :return: сообщение о результате
+        """
+
+        self._write_both(())
+
+        return f"Информация была стёрта из файлов {self.saver_full.path_file} и {self.saver_short.path_file}"
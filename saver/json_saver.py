@@ -1,32 +1,162 @@
 import json
+import os
+import threading
+from typing import IO, Iterable, Iterator
 
+from saver.catalog import Catalog, FileSummary, get_raw_salary
+from saver.salary_index import SalaryIndex
 from saver.saver_abc import Saver
-from vacancy.vacancy_hh import VacancyHeadHunter
-from vacancy.vacancy_sj import VacancySuperJob
+from sources.constants import SAVER_COMPACT, SAVER_COMPRESSION
+from tools import tracing
+from tools.duplicates import DuplicateDetector
+from vacancy.vacancy_factory import create_vacancy
 
 
 class JSONSaver(Saver):
+    """
+    Сохранение вакансий в JSON-файл.
+    Файл может быть сжат gzip или zstd: при записи сжатие выбирается по расширению файла
+    (.gz, .zst) или настройке, при чтении - по сигнатуре файла, поэтому сжатые и обычные
+    файлы читаются одинаково. В компактном режиме каждая вакансия записывается одной строкой без отступов.
+    Для файлов каталога рядом с файлом хранится индекс зарплат (файл с расширением .salary)
+    """
 
+    # сжатие по расширению файла
+    _EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+    # сигнатуры сжатых файлов
+    _SIGNATURES = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+
+    # каталог файлов с вакансиями: сводки файлов из его папки обновляются при каждой записи
+    catalog = Catalog()
+
+    def __init__(self, path_file: tuple, compression: str | None = None, compact: bool | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: кортеж, содержащий строки с названием папок и файлов для построения пути к файлу
+        :param compression: сжатие при записи, 'gzip' или 'zstd', по умолчанию по расширению файла или настройке
+        :param compact: записывать каждую вакансию одной строкой, по умолчанию по настройке
+        """
+
+        super().__init__(path_file)
+
+        extension = os.path.splitext(self.path_file)[1].lower()
+        self.compression = compression or self._EXTENSIONS.get(extension) or SAVER_COMPRESSION
+        self.compact = SAVER_COMPACT if compact is None else compact
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_file!r}, compression={self.compression!r}, " \
+               f"compact={self.compact})"
+
+    def get_file_compression(self) -> str | None:
+        """Определяет сжатие существующего файла по его сигнатуре"""
+
+        try:
+            with open(self.path_file, "rb") as file:
+                signature = file.read(4)
+        except FileNotFoundError:
+            return None
+
+        for prefix, compression in self._SIGNATURES.items():
+            if signature.startswith(prefix):
+                return compression
+
+        return None
+
+    def open_file(self, mode: str, path_file: str | None = None) -> IO:
+        """
+        Открывает файл для потокового чтения или записи с учетом сжатия
+
+        :param mode: 'r' или 'w' - текстовый режим, 'rb' - чтение байтов
+        :param path_file: путь к другому файлу с тем же сжатием, например к временному файлу для записи
+        """
+
+        path_file = path_file or self.path_file
+        compression = self.compression if mode.startswith("w") else self.get_file_compression()
+        encoding = None if "b" in mode else "utf-8"
+        mode = mode if "b" in mode else mode + "t"
+
+        if compression == "gzip":
+            import gzip
+            # средняя степень сжатия: почти так же компактно, как максимальная, но в разы быстрее
+            return gzip.open(path_file, mode, compresslevel=6, encoding=encoding)
+
+        if compression == "zstd":
+            # библиотека zstandard необязательна и загружается только для файлов, сжатых zstd
+            import zstandard
+            return zstandard.open(path_file, mode, encoding=encoding)
+
+        return open(path_file, mode, encoding=encoding)
+
+    def open_sink(self, start: int | None = None) -> "VacancySink":
+        """
+        Открывает запись вакансий в файл по одной (with JSONSaver(...).open_sink() as sink: sink.write(...)).
+        Файл заменяется только после успешного завершения записи
+
+        :param start: номер первой измененной вакансии, если вакансии до него уже записаны в файл
+        в том же порядке: индекс зарплат не строится заново, а дополняется; None - файл записывается заново
+        """
+
+        return VacancySink(self, start)
+
+    def _write_all(self, vacancies: Iterable[dict], start: int | None = None) -> int:
+        """
+        Перезаписывает файл вакансиями из коллекции или потока
+
+        :return: количество записанных вакансий
+        """
+
+        with self.open_sink(start) as sink:
+            for vacancy_dict in vacancies:
+                sink.write(vacancy_dict)
+
+        return sink.count
+
+    @tracing.traced("saver.add")
     def add_vacancies(self, list_vacancies: list) -> None:
         """
-        Добавляет больше вакансий в непустой файл
+        Добавляет больше вакансий в непустой файл.
+        Обновленные версии записанных вакансий (тот же сайт и id) заменяют их,
+        почти совпадающие с записанными вакансии не добавляются
 
         :param list_vacancies: список с информацией о найденных вакансиях
         """
 
-        with open(self.path_file, "r", encoding="utf-8") as json_file:
+        vacancies = self.read_saved_vacancies()
+        if vacancies is None:
+            self.write_vacancies(list_vacancies)
+            return
+
+        start = DuplicateDetector().merge(vacancies, list_vacancies)
+
+        self.write_merged(vacancies, start)
+
+    def read_saved_vacancies(self) -> list | None:
+        """Читает список словарей записанных вакансий, None если файл пуст или поврежден"""
+
+        with self.open_file("r") as json_file:
             try:
-                vacancies = json.load(json_file)
-            except json.decoder.JSONDecodeError:
-                self.write_vacancies(list_vacancies)
-                return
+                return json.load(json_file)
+            except (json.decoder.JSONDecodeError, EOFError):
+                return None
+
+    def write_merged(self, list_vacancies: list, start: int) -> None:
+        """
+        Перезаписывает файл списком, в котором изменились только вакансии с номера start:
+        индекс зарплат не строится заново, а дополняется этими вакансиями
+
+        :param list_vacancies: список с информацией о вакансиях
+        :param start: номер первой измененной или добавленной вакансии
+        """
 
-        for vacancy in list_vacancies:
-            if vacancy not in vacancies:
-                vacancies.append(vacancy)
+        self._write_all(list_vacancies, start)
 
-        self.write_vacancies(vacancies)
+        print(f"\nВакансии записаны в файл {self.path_file}")
 
+    @tracing.traced("saver.write")
     def write_vacancies(self, list_vacancies: list) -> None:
         """
         Перезаписывает (или создает) файл для записи информации о найденных вакансиях
@@ -34,37 +164,273 @@ class JSONSaver(Saver):
         :param list_vacancies: список с информацией о найденных вакансиях
         """
 
-        with open(self.path_file, "w", encoding="utf-8") as json_file:
-            json.dump(list_vacancies, json_file, ensure_ascii=False, indent=4, separators=(',', ': '))
+        self._write_all(list_vacancies)
 
         print(f"\nВакансии записаны в файл {self.path_file}")
 
+    @tracing.traced("saver.write_stream")
+    def write_stream(self, vacancies: Iterable[dict]) -> int:
+        """
+        Перезаписывает файл вакансиями из потока, не собирая их в список.
+        Формат файла совпадает с форматом write_vacancies
+
+        :param vacancies: коллекция или итератор словарей вакансий
+        :return: количество записанных вакансий
+        """
+
+        count = self._write_all(vacancies)
+
+        print(f"\nВакансии записаны в файл {self.path_file}")
+
+        return count
+
+    def save_salary_index(self, salary_index: SalaryIndex, raw_salaries: list) -> None:
+        """
+        Дополняет индекс зарплатами записанных вакансий и сохраняет его.
+        Для зарплат не в рублях нужен курс валют: если он недоступен, индекс не сохраняется,
+        старый индекс считается устаревшим и строится заново при первом поиске по зарплате
+
+        :param salary_index: индекс ранее записанных вакансий
+        :param raw_salaries: зарплаты записанных вакансий (номер, от, до, валюта)
+        """
+
+        try:
+            salary_index.add_raw(raw_salaries)
+            salary_index.save(self.get_salary_index_path(), self.path_file)
+        except OSError:
+            # ошибки requests тоже наследуют OSError
+            pass
+
+    def get_salary_index_path(self) -> str:
+        """Возвращает путь к файлу индекса зарплат"""
+
+        return f"{self.path_file}.salary"
+
+    def load_salary_index(self) -> SalaryIndex | None:
+        """Загружает индекс зарплат, None если его нет или файл изменился после записи индекса"""
+
+        return SalaryIndex.load(self.get_salary_index_path(), self.path_file)
+
+    def get_salary_index(self) -> SalaryIndex:
+        """
+        Возвращает индекс зарплат файла. Если индекса нет или он устарел,
+        строит его, читая файл потоком, и для файлов каталога сохраняет
+        """
+
+        salary_index = self.load_salary_index()
+
+        if salary_index is None:
+            salary_index = SalaryIndex()
+            salary_index.add_vacancies(self.iter_vacancies())
+            if self.catalog.contains(self.path_file):
+                salary_index.save(self.get_salary_index_path(), self.path_file)
+
+        return salary_index
+
+    @tracing.traced("saver.salary_query")
+    def find_by_salary(self, salary_from: float | None = None, salary_to: float | None = None,
+                       min_salary: float | None = None) -> Iterator[dict]:
+        """
+        Возвращает поток словарей вакансий с подходящей зарплатой в рублях в порядке следования в файле.
+        Подходящие вакансии находятся по индексу зарплат, объекты вакансий не создаются;
+        если подходящих вакансий нет, файл не читается
+
+        :param salary_from: нижняя граница запроса: интервал зарплаты вакансии пересекается с запросом
+        :param salary_to: верхняя граница запроса
+        :param min_salary: минимальная зарплата вакансии не меньше
+        """
+
+        salary_index = self.get_salary_index()
+        positions = None
+
+        if salary_from is not None or salary_to is not None:
+            positions = set(salary_index.overlapping(salary_from, salary_to))
+        if min_salary is not None:
+            matching = set(salary_index.at_least(min_salary))
+            positions = matching if positions is None else positions & matching
+
+        if positions is None:
+            yield from self.iter_vacancies()
+            return
+        if not positions:
+            return
+
+        last = max(positions)
+        for position, vacancy_dict in enumerate(self.iter_vacancies()):
+            if position in positions:
+                yield vacancy_dict
+            if position == last:
+                return
+
     def clean_file(self) -> None:
         """Полностью очистить файл с информацией о вакансиях"""
 
-        with open(self.path_file, "w", encoding="utf-8") as json_file:
+        with self.open_file("w") as json_file:
             pass
 
+        if self.catalog.contains(self.path_file):
+            self.catalog.update_file(self.path_file, FileSummary())
+            self.save_salary_index(SalaryIndex(), [])
+
         print(f"\nИнформация была стёрта из файла {self.path_file} ")
 
+    @tracing.traced("saver.load")
     def load_vacancies(self) -> list:
         """
         Загрузить информацию о вакансиях из файла
         Сразу строит объекты соответствующих классов вакансий
         """
 
-        with open(self.path_file, "r", encoding="utf-8") as json_file:
+        with self.open_file("r") as json_file:
             vacancies = json.load(json_file)
 
         list_vacancies = []
 
         for vacancy in vacancies:
-            if "hh.ru" in vacancy.get("url", ""):
-                vacancy = VacancyHeadHunter(vacancy)
-            elif "superjob.ru" in vacancy.get("link", ""):
-                vacancy = VacancySuperJob(vacancy)
-            else:
-                continue
-            list_vacancies.append(vacancy)
+            vacancy = create_vacancy(vacancy)
+            if vacancy is not None:
+                list_vacancies.append(vacancy)
 
         return list_vacancies
+
+    def iter_vacancies(self) -> Iterator[dict]:
+        """
+        Читает словари вакансий из файла по одному, не загружая файл в память целиком.
+        Если библиотека ijson не установлена, файл загружается обычным способом
+        """
+
+        with self.open_file("rb") as json_file:
+            first_byte = json_file.read(1)
+            if not first_byte:
+                return
+
+            try:
+                import ijson
+            except ImportError:
+                yield from json.loads(first_byte + json_file.read())
+                return
+
+            yield from ijson.items(_Prepended(first_byte, json_file), "item", use_float=True)
+
+
+class VacancySink:
+    """
+    Запись вакансий в файл JSONSaver по одной, например одновременно в несколько файлов.
+    Вакансии записываются во временный файл, который заменяет файл только при успешном завершении записи:
+    если запись прервется ошибкой, прежнее содержимое файла сохранится.
+    Для файлов каталога попутно собираются сводка о файле и зарплаты вакансий в валюте вакансии,
+    по которым после записи обновляется индекс зарплат, поэтому сама запись не обращается к сети
+    """
+
+    def __init__(self, saver: JSONSaver, start: int | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param saver: объект сохранения, в файл которого записываются вакансии
+        :param start: номер первой измененной вакансии, None - файл записывается заново
+        """
+
+        self.saver = saver
+        self.count = 0
+
+        self._temporary_path = f"{saver.path_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._file = None
+
+        self._summary = None  # сводка о файле, None - файл не относится к каталогу
+        self._salary_index = None  # индекс зарплат вакансий, записанных до start
+        self._raw_salaries = []  # зарплаты вакансий с номера start: (номер, от, до, валюта)
+        self._start = 0
+
+        if saver.catalog.contains(saver.path_file):
+            self._summary = FileSummary()
+            # индекс загружается до записи: после записи он считается устаревшим
+            self._salary_index = saver.load_salary_index() if start is not None else None
+            if self._salary_index is not None:
+                self._salary_index.truncate(start)
+                self._start = start
+            else:
+                self._salary_index = SalaryIndex()
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.saver.path_file!r}, count={self.count})"
+
+    def __enter__(self) -> "VacancySink":
+        """Открывает временный файл для записи"""
+
+        os.makedirs(os.path.dirname(self.saver.path_file), exist_ok=True)
+        self._file = self.saver.open_file("w", self._temporary_path)
+
+        return self
+
+    def write(self, vacancy_dict: dict) -> None:
+        """Записывает вакансию следующим элементом JSON-массива, каждую вакансию с новой строки"""
+
+        if self.saver.compact:
+            self._file.write(("[\n" if not self.count else ",\n") + json.dumps(vacancy_dict, ensure_ascii=False))
+        else:
+            text = json.dumps(vacancy_dict, ensure_ascii=False, indent=4, separators=(',', ': '))
+            self._file.write(("[\n    " if not self.count else ",\n    ") + text.replace("\n", "\n    "))
+
+        if self._summary is not None:
+            self._summary.add(vacancy_dict)
+            if self.count >= self._start:
+                salary = get_raw_salary(vacancy_dict)
+                if salary is not None:
+                    self._raw_salaries.append((self.count, *salary))
+
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Завершает запись: при успешной записи заменяет файл временным файлом
+        и обновляет сводку каталога и индекс зарплат, при ошибке удаляет временный файл
+        """
+
+        replaced = False
+
+        try:
+            if exc_type is None:
+                self._file.write("\n]" if self.count else "[]")
+            self._file.close()
+            if exc_type is None:
+                os.replace(self._temporary_path, self.saver.path_file)
+                replaced = True
+        finally:
+            if not replaced and os.path.exists(self._temporary_path):
+                os.remove(self._temporary_path)
+
+        if not replaced:
+            return
+
+        if self._summary is not None:
+            self.saver.catalog.update_file(self.saver.path_file, self._summary)
+            self.saver.save_salary_index(self._salary_index, self._raw_salaries)
+
+
+class _Prepended:
+    """Поток байтов, перед которым возвращаются уже прочитанные из него байты"""
+
+    def __init__(self, head: bytes, stream: IO) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param head: уже прочитанные байты
+        :param stream: поток, из которого они прочитаны
+        """
+
+        self.head = head
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        """Читает байты: сначала из прочитанного ранее начала, затем из потока"""
+
+        if not self.head or size == 0:
+            return self.stream.read(size)
+
+        head, self.head = self.head, b""
+        if size < 0:
+            return head + self.stream.read()
+
+        return head + self.stream.read(max(size - len(head), 0))
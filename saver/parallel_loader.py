@@ -0,0 +1,213 @@
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from filter.filter_abc import Filter
+from saver.json_saver import JSONSaver
+from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_factory import create_vacancy, get_source
+
+# фильтры, восстановленные в дочернем процессе, ключ - описание фильтра
+_worker_filters = {}
+
+
+def _get_worker_filter(spec: tuple | None) -> Filter | None:
+    """
+    Восстанавливает фильтр в дочернем процессе по его описанию (класс, параметры, вычисленные данные).
+    Вычисленные данные, например города региона, передаются готовыми, поэтому
+    дочерний процесс не загружает справочники сайта при любом способе запуска процессов
+    """
+
+    if spec is None:
+        return None
+
+    key = (spec[0], json.dumps(spec[1], sort_keys=True, default=str))
+    if key not in _worker_filters:
+        filter_class, parameters, precomputed = spec
+        _worker_filters[key] = filter_class.from_parameters(parameters, precomputed)
+
+    return _worker_filters[key]
+
+
+def _filter_records(records: list[dict], specs: dict) -> list[dict]:
+    """
+    Оставляет только вакансии, соответствующие фильтру своего сайта.
+    Вакансии сайта, для которого фильтр не задан, проходят без проверки,
+    вакансии неизвестных сайтов отбрасываются
+    """
+
+    matching = []
+
+    for record in records:
+        source = get_source(record)
+        if source is None:
+            continue
+
+        request_filter = _get_worker_filter(specs.get(source))
+        if request_filter is None or request_filter.compare_parameters(record):
+            matching.append(record)
+
+    return matching
+
+
+def _parse_range(path_file: str, start: int, end: int) -> list[dict]:
+    """
+    Читает и разбирает часть JSON-массива, ограниченную границами вакансий
+
+    :param path_file: путь к файлу
+    :param start: позиция начала фрагмента в байтах
+    :param end: позиция конца фрагмента в байтах
+    """
+
+    with open(path_file, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).strip()
+
+    if text.startswith(b"["):
+        text = text[1:]
+    if text.endswith(b"]"):
+        text = text[:-1]
+    text = text.strip().rstrip(b",")
+
+    if not text:
+        return []
+
+    return json.loads(b"[" + text + b"]")
+
+
+def _filter_range(path_file: str, start: int, end: int, specs: dict) -> list[dict]:
+    """Задача дочернего процесса: разобрать фрагмент файла и отфильтровать вакансии"""
+
+    return _filter_records(_parse_range(path_file, start, end), specs)
+
+
+class ParallelLoader:
+    """
+    Параллельная загрузка и фильтрация вакансий из большого JSON-файла.
+    Файл делится на фрагменты по границам вакансий, каждый фрагмент
+    разбирается и фильтруется в отдельном процессе,
+    обратно передаются только подходящие вакансии
+    """
+
+    # файлы меньше этого размера (в байтах) обрабатываются в текущем процессе
+    _MIN_PARALLEL_SIZE = 1024 * 1024
+
+    # количество вакансий, фильтруемых за раз при чтении файла потоком
+    _CHUNK_RECORDS = 10000
+
+    def __init__(self, path_file: tuple, workers: int | None = None, chunk_size: int = 4 * 1024 * 1024) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: кортеж, содержащий строки с названием папок и файлов для построения пути к файлу,
+        записанному JSONSaver
+        :param workers: количество процессов, по умолчанию по числу ядер
+        :param chunk_size: примерный размер фрагмента файла в байтах
+        """
+
+        self.saver = JSONSaver(path_file)
+        self.path_file = self.saver.path_file
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_file!r}, workers={self.workers})"
+
+    @staticmethod
+    def get_specs(filter_hh: Filter | None, filter_sj: Filter | None) -> dict:
+        """Возвращает описания фильтров, которые можно передать в дочерние процессы"""
+
+        return {source: (request_filter.__class__, request_filter.get_all_parameters(),
+                         request_filter.get_precomputed())
+                for source, request_filter in (("hh", filter_hh), ("sj", filter_sj))
+                if request_filter is not None}
+
+    def get_ranges(self) -> list[tuple[int, int]] | None:
+        """
+        Делит файл на фрагменты, границы которых совпадают с началом вакансий.
+        Файлы, записанные JSONSaver, содержат каждую вакансию с новой строки
+        с одинаковым отступом; так как строки JSON не содержат переводов строки,
+        такая граница не может встретиться внутри значения
+
+        :return: список пар (начало, конец) или None, если файл не удалось разделить
+        """
+
+        size = os.path.getsize(self.path_file)
+        if size == 0:
+            return []
+
+        # сжатый файл нельзя разделить на фрагменты без распаковки
+        if self.saver.get_file_compression() is not None:
+            return None
+
+        with open(self.path_file, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            first_item = data.find(b"{")
+            line_start = data.rfind(b"\n", 0, first_item)
+            if first_item == -1 or line_start == -1:
+                return None
+
+            # граница вакансий: перевод строки, отступ первого уровня, начало объекта
+            marker = data[line_start:first_item + 1]
+            if marker.strip(b"\n ") != b"{":
+                return None
+
+            boundaries = [0]
+            position = self.chunk_size
+            while position < size:
+                boundary = data.find(marker, position)
+                if boundary == -1:
+                    break
+                boundaries.append(boundary)
+                position = boundary + self.chunk_size
+            boundaries.append(size)
+
+        return list(zip(boundaries, boundaries[1:]))
+
+    def iter_matching(self, filter_hh: Filter | None = None, filter_sj: Filter | None = None) -> Iterator[dict]:
+        """
+        Возвращает поток словарей подходящих под фильтры вакансий в порядке следования в файле.
+        Вакансии сайта, для которого фильтр не передан, возвращаются без проверки
+        """
+
+        specs = self.get_specs(filter_hh, filter_sj)
+        ranges = self.get_ranges()
+
+        if ranges is None:
+            # сжатый файл или файл в одну строку: читаем его потоком и фильтруем в текущем процессе,
+            # передача разобранных вакансий в дочерние процессы обошлась бы дороже самой фильтрации
+            records = []
+            for record in self.saver.iter_vacancies():
+                records.append(record)
+                if len(records) == self._CHUNK_RECORDS:
+                    yield from _filter_records(records, specs)
+                    records = []
+            yield from _filter_records(records, specs)
+            return
+
+        tasks = (_filter_range, [self.path_file] * len(ranges),
+                 [start for start, _ in ranges], [end for _, end in ranges], [specs] * len(ranges))
+
+        if len(ranges) <= 1 or self.workers == 1 or os.path.getsize(self.path_file) < self._MIN_PARALLEL_SIZE:
+            for matching in map(*tasks):
+                yield from matching
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for matching in executor.map(*tasks):
+                yield from matching
+
+    def load_vacancies(self, filter_hh: Filter | None = None, filter_sj: Filter | None = None) -> list[Vacancy]:
+        """Загружает из файла подходящие под фильтры вакансии и строит объекты вакансий"""
+
+        list_vacancies = []
+
+        for record in self.iter_matching(filter_hh, filter_sj):
+            vacancy = create_vacancy(record)
+            if vacancy is not None:
+                list_vacancies.append(vacancy)
+
+        return list_vacancies
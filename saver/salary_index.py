@@ -0,0 +1,262 @@
+import bisect
+import json
+import os
+from typing import Iterable
+
+from saver.catalog import get_raw_salary
+
+# граница зарплаты, если верхняя граница не указана
+_INFINITY = float("inf")
+
+
+def _to_rub(amount: int | float | None, currency: str) -> int | float | None:
+    """Конвертирует сумму в рубли; сумма в валюте без курса считается неуказанной, как в get_min_salary"""
+
+    if currency == "RUR" or not amount:
+        return amount
+
+    from vacancy.vacancy_hh import VacancyHeadHunter
+
+    return VacancyHeadHunter.convert_currency(amount, currency) or None
+
+
+def get_interval(salary_from: int | float | None, salary_to: int | float | None, currency: str) -> tuple | None:
+    """
+    Возвращает интервал зарплаты в рублях (нижняя граница, верхняя граница) по границам в валюте вакансии.
+    Как и в get_min_salary, при неуказанной нижней границе зарплатой считается верхняя граница;
+    неуказанная верхняя граница не ограничивает интервал. None - зарплата не указана
+    """
+
+    salary_from, salary_to = _to_rub(salary_from, currency), _to_rub(salary_to, currency)
+    if not salary_from and not salary_to:
+        return None
+
+    if salary_from and salary_to:
+        return min(salary_from, salary_to), max(salary_from, salary_to)
+
+    return (salary_from, _INFINITY) if salary_from else (salary_to, salary_to)
+
+
+def get_salary_interval(vacancy_dict: dict) -> tuple | None:
+    """Возвращает интервал зарплаты вакансии в рублях, None - зарплата не указана"""
+
+    salary = get_raw_salary(vacancy_dict)
+
+    return None if salary is None else get_interval(*salary)
+
+
+class SalaryIndex:
+    """
+    Индекс интервалов зарплат сохраненных вакансий.
+    Интервалы хранятся отсортированными по нижней границе, поверх них строится дерево отрезков:
+    для каждого узла известны наибольшая и наименьшая верхние границы его интервалов.
+    При поиске пересечений узлы, все интервалы которых заканчиваются раньше запроса, пропускаются,
+    а узлы, все интервалы которых его пересекают, выдаются целиком, поэтому запрос стоит
+    O(log n + k) даже тогда, когда у большинства вакансий верхняя граница не указана.
+    Добавленные интервалы накапливаются и встраиваются в дерево при следующем запросе
+    """
+
+    # количество интервалов в листе дерева: листья просматриваются подряд
+    _LEAF_SIZE = 32
+
+    def __init__(self) -> None:
+        """Инициализатор объектов класса"""
+
+        self._entries = []  # записи (нижняя граница, верхняя граница, номер вакансии), отсортированные
+        self._pending = []  # записи, добавленные после построения дерева
+        self._lows = []  # нижние границы отсортированных записей
+        self._highs = []  # верхние границы отсортированных записей
+        self._positions = []  # номера вакансий отсортированных записей
+        self._tree = None  # наибольшие и наименьшие верхние границы узлов дерева и количество листьев
+
+    def __len__(self) -> int:
+        """Количество вакансий в индексе"""
+
+        return len(self._entries) + len(self._pending)
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(count={len(self)})"
+
+    def add(self, low: float, high: float, position: int) -> None:
+        """
+        Добавляет интервал зарплаты вакансии
+
+        :param low: нижняя граница зарплаты
+        :param high: верхняя граница зарплаты, float('inf') если не ограничена
+        :param position: номер вакансии в файле
+        """
+
+        self._pending.append((low, high, position))
+        self._tree = None
+
+    def add_vacancies(self, vacancies: Iterable[dict], start: int = 0) -> None:
+        """
+        Добавляет в индекс вакансии с указанной зарплатой
+
+        :param vacancies: словари вакансий в порядке следования в файле
+        :param start: номер первой вакансии в файле
+        """
+
+        for position, vacancy_dict in enumerate(vacancies, start):
+            interval = get_salary_interval(vacancy_dict)
+            if interval is not None:
+                self.add(*interval, position)
+
+    def add_raw(self, raw_salaries: Iterable[tuple]) -> None:
+        """
+        Добавляет в индекс зарплаты, собранные при записи файла.
+        Суммы не в рублях конвертируются, для них нужен курс валют
+
+        :param raw_salaries: записи (номер вакансии, от, до, валюта)
+        """
+
+        for position, salary_from, salary_to, currency in raw_salaries:
+            interval = get_interval(salary_from, salary_to, currency)
+            if interval is not None:
+                self.add(*interval, position)
+
+    def truncate(self, start: int) -> None:
+        """Удаляет из индекса вакансии с номерами от start, например перед их перезаписью"""
+
+        self._entries = [entry for entry in self._entries if entry[2] < start]
+        self._pending = [entry for entry in self._pending if entry[2] < start]
+        self._tree = None
+
+    def _build(self) -> None:
+        """Встраивает добавленные записи и строит дерево отрезков, если оно устарело"""
+
+        if self._tree is not None:
+            return
+
+        if self._pending:
+            self._entries.extend(self._pending)
+            self._entries.sort()
+            self._pending = []
+
+        self._lows = [entry[0] for entry in self._entries]
+        self._highs = [entry[1] for entry in self._entries]
+        self._positions = [entry[2] for entry in self._entries]
+
+        leaves = 1
+        while leaves * self._LEAF_SIZE < len(self._entries):
+            leaves *= 2
+
+        max_highs = [-_INFINITY] * (2 * leaves)
+        min_highs = [_INFINITY] * (2 * leaves)
+
+        for leaf in range(leaves):
+            highs = self._highs[leaf * self._LEAF_SIZE:(leaf + 1) * self._LEAF_SIZE]
+            if highs:
+                max_highs[leaves + leaf], min_highs[leaves + leaf] = max(highs), min(highs)
+
+        for node in range(leaves - 1, 0, -1):
+            max_highs[node] = max(max_highs[2 * node], max_highs[2 * node + 1])
+            min_highs[node] = min(min_highs[2 * node], min_highs[2 * node + 1])
+
+        self._tree = max_highs, min_highs, leaves
+
+    def at_least(self, salary: float) -> list[int]:
+        """Возвращает номера вакансий, минимальная зарплата которых не меньше указанной"""
+
+        self._build()
+
+        return self._positions[bisect.bisect_left(self._lows, salary):]
+
+    def overlapping(self, salary_from: float | None = None, salary_to: float | None = None) -> list[int]:
+        """
+        Возвращает номера вакансий, интервал зарплаты которых пересекается с [salary_from, salary_to]
+
+        :param salary_from: нижняя граница запроса, None - не ограничена
+        :param salary_to: верхняя граница запроса, None - не ограничена
+        """
+
+        salary_from = -_INFINITY if salary_from is None else salary_from
+        salary_to = _INFINITY if salary_to is None else salary_to
+
+        self._build()
+        max_highs, min_highs, leaves = self._tree
+
+        # подходят только записи с нижней границей не больше salary_to - это начало отсортированного массива
+        end = bisect.bisect_right(self._lows, salary_to)
+        positions = []
+        # узлы дерева: номер узла, первый и следующий за последним лист
+        stack = [(1, 0, leaves)]
+
+        while stack:
+            node, first_leaf, last_leaf = stack.pop()
+            first, last = first_leaf * self._LEAF_SIZE, last_leaf * self._LEAF_SIZE
+
+            if first >= end or max_highs[node] < salary_from:
+                continue
+
+            if last <= end and min_highs[node] >= salary_from:
+                positions.extend(self._positions[first:last])
+            elif last_leaf - first_leaf == 1:
+                positions.extend(self._positions[number] for number in range(first, min(last, end))
+                                 if self._highs[number] >= salary_from)
+            else:
+                middle = (first_leaf + last_leaf) // 2
+                stack.append((2 * node + 1, middle, last_leaf))
+                stack.append((2 * node, first_leaf, middle))
+
+        return positions
+
+    def to_dict(self) -> dict:
+        """Возвращает индекс в виде словаря для записи в файл"""
+
+        self._build()
+        entries = [[low, None if high == _INFINITY else high, position] for low, high, position in self._entries]
+
+        return {"entries": entries}
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "SalaryIndex":
+        """Восстанавливает индекс из словаря, записи в котором уже отсортированы"""
+
+        index = cls()
+        index._entries = [(low, _INFINITY if high is None else high, position)
+                          for low, high, position in content["entries"]]
+
+        return index
+
+    @staticmethod
+    def _get_stamp(path_file: str) -> list:
+        """Время изменения и размер файла с вакансиями, по которым определяется, устарел ли индекс"""
+
+        stat = os.stat(path_file)
+
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @classmethod
+    def load(cls, path_index: str, path_file: str) -> "SalaryIndex | None":
+        """
+        Загружает индекс, если он построен для текущего содержимого файла с вакансиями
+
+        :param path_index: путь к файлу индекса
+        :param path_file: путь к файлу с вакансиями
+        :return: индекс, либо None, если индекса нет или файл с вакансиями изменился после его записи
+        """
+
+        try:
+            with open(path_index, "r", encoding="utf-8") as file:
+                content = json.load(file)
+            if content.get("stamp") != cls._get_stamp(path_file):
+                return None
+        except (OSError, json.decoder.JSONDecodeError):
+            return None
+
+        return cls.from_dict(content)
+
+    def save(self, path_index: str, path_file: str) -> None:
+        """Записывает индекс вместе с отметкой о текущем содержимом файла с вакансиями"""
+
+        content = {"stamp": self._get_stamp(path_file), **self.to_dict()}
+        temporary_path = f"{path_index}.{os.getpid()}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(content, file)
+
+        os.replace(temporary_path, path_index)
+
@@ -0,0 +1,320 @@
+import argparse
+import csv
+import functools
+import importlib.util
+import json
+import operator
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Iterator
+
+from tools import tracing
+
+# колонки таблицы по умолчанию: заголовок -> пути к значению в полной информации о вакансии.
+# Путь - ключи через точку, номер элемента списка - числом; для вакансий разных сайтов
+# указываются пути через '|', берется первое непустое значение
+DEFAULT_COLUMNS = {
+    "id": "id",
+    "name": "name|profession",
+    "employer": "employer.name|firm_name",
+    "area": "area.name|town.title",
+    "salary_from": "salary.from|payment_from",
+    "salary_to": "salary.to|payment_to",
+    "currency": "salary.currency|currency",
+    "experience": "experience.name|experience.title",
+    "employment": "employment.name|type_of_work.title",
+    "published": "published_at|date_published",
+    "url": "alternate_url|link",
+}
+
+# первые символы ячейки, с которых табличные программы начинают формулу
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def parse_columns(text: str) -> dict[str, str]:
+    """
+    Разбирает описание колонок из командной строки: 'заголовок=путь|путь,путь,...'.
+    Если заголовок не указан, заголовком служит сам путь
+    """
+
+    columns = {}
+
+    for column in filter(None, (part.strip() for part in text.split(","))):
+        header, _, paths = column.rpartition("=")
+        columns[header or paths] = paths
+
+    return columns
+
+
+def _compile_path(path: str) -> Callable[[dict], Any]:
+    """
+    Возвращает функцию получения значения по пути в словаре вакансии (None, если значения нет).
+    Путь разбирается один раз; для путей из одного и двух ключей словарей, а это почти все колонки,
+    функции обходятся без цикла
+    """
+
+    keys = tuple(int(key) if key.isdigit() else key for key in path.split("."))
+
+    if len(keys) == 1 and type(keys[0]) is str:
+        return operator.methodcaller("get", keys[0])
+
+    if len(keys) == 2 and type(keys[0]) is str and type(keys[1]) is str:
+        first, second = keys
+
+        def get_nested(vacancy_dict: dict):
+            """Значение вложенного словаря"""
+
+            value = vacancy_dict.get(first)
+            return value.get(second) if type(value) is dict else None
+
+        return get_nested
+
+    return functools.partial(_resolve, keys=keys)
+
+
+def _escape_formulas(row: list) -> list:
+    """
+    Экранирует строки, которые Excel принял бы за формулу (например, название вакансии '=HYPERLINK(...)'):
+    перед ними ставится апостроф, и ячейка показывается как текст
+    """
+
+    return [f"'{value}" if type(value) is str and value.startswith(_FORMULA_PREFIXES) else value for value in row]
+
+
+def _resolve(vacancy_dict: dict, keys: tuple):
+    """Возвращает значение по ключам в словаре вакансии, None если его нет"""
+
+    value = vacancy_dict
+
+    for key in keys:
+        if isinstance(value, dict):
+            value = value.get(key) if type(key) is str else value.get(str(key))
+        elif isinstance(value, list) and type(key) is int:
+            value = value[key] if key < len(value) else None
+        else:
+            return None
+        if value is None:
+            return None
+
+    return value
+
+
+class TableExporter(ABC):
+    """
+    Абстрактный класс потоковой выгрузки вакансий в таблицу.
+    Вакансии читаются из итератора и записываются по одной строке,
+    поэтому расход памяти не зависит от количества вакансий
+    """
+
+    # абсолютный путь из текущего файла к корневой папке проекта
+    _ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+    def __init__(self, path_file: tuple, columns: dict[str, str] | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: кортеж, содержащий строки с названием папок и файлов для построения пути к файлу
+        :param columns: колонки таблицы: заголовок -> пути к значению через '|', по умолчанию DEFAULT_COLUMNS
+        """
+
+        self.path_file = os.path.join(self._ROOT_DIR, *path_file)
+        self.columns = columns or DEFAULT_COLUMNS
+        # пути разбираются один раз, а не для каждой вакансии
+        self._getters = [tuple(_compile_path(path) for path in paths.split("|")) for paths in self.columns.values()]
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_file!r}, columns={list(self.columns)!r})"
+
+    def get_row(self, vacancy_dict: dict) -> list:
+        """
+        Возвращает строку таблицы для вакансии. Вложенные словари и списки
+        записываются в ячейку JSON-строкой, отсутствующие значения - пустой ячейкой
+        """
+
+        row = []
+
+        for getters in self._getters:
+            for get_value in getters:
+                value = get_value(vacancy_dict)
+                if value is not None and value != "":
+                    break
+            else:
+                row.append("")
+                continue
+
+            if type(value) is dict or type(value) is list:
+                value = json.dumps(value, ensure_ascii=False)
+            row.append(value)
+
+        return row
+
+    def iter_rows(self, vacancies: Iterable[dict]) -> Iterator[list]:
+        """Возвращает поток строк таблицы"""
+
+        return map(self.get_row, vacancies)
+
+    @abstractmethod
+    def export(self, vacancies: Iterable[dict]) -> int:
+        """
+        Перезаписывает (или создает) файл таблицей вакансий
+
+        :param vacancies: коллекция или итератор словарей с полной информацией о вакансиях
+        :return: количество выгруженных вакансий
+        """
+        pass
+
+
+class CSVExporter(TableExporter):
+    """
+    Выгрузка вакансий в CSV. Файл записывается в кодировке UTF-8 с BOM,
+    чтобы Excel правильно показывал кириллицу. Ячейки, которые Excel принял бы за формулы, экранируются
+    """
+
+    # размер буфера записи: строки сбрасываются на диск крупными блоками
+    _BUFFER_SIZE = 1024 * 1024
+
+    @tracing.traced("saver.export_csv")
+    def export(self, vacancies: Iterable[dict]) -> int:
+        """
+        Перезаписывает (или создает) файл таблицей вакансий
+
+        :param vacancies: коллекция или итератор словарей с полной информацией о вакансиях
+        :return: количество выгруженных вакансий
+        """
+
+        os.makedirs(os.path.dirname(self.path_file), exist_ok=True)
+        counter = _Counter(vacancies)
+
+        with open(self.path_file, "w", encoding="utf-8-sig", newline="", buffering=self._BUFFER_SIZE) as file:
+            writer = csv.writer(file)
+            writer.writerow(self.columns)
+            writer.writerows(map(_escape_formulas, self.iter_rows(counter)))
+
+        return counter.count
+
+
+class XLSXExporter(TableExporter):
+    """
+    Выгрузка вакансий в XLSX через библиотеку xlsxwriter в режиме постоянной памяти:
+    каждая строка сразу сбрасывается во временный файл листа.
+    Библиотека необязательна и загружается только при выгрузке в XLSX.
+    Строки записываются как текст, даже если начинаются с '=', поэтому формулы из вакансий не выполняются.
+    Если вакансий больше, чем помещается на лист, они продолжаются на следующих листах
+    """
+
+    # максимальное количество строк на листе Excel, включая заголовок
+    _MAX_ROWS = 1_048_576
+
+    # сообщение об отсутствии библиотеки
+    MISSING_LIBRARY = "Для выгрузки в XLSX нужна библиотека xlsxwriter (pip install xlsxwriter)"
+
+    @staticmethod
+    def is_available() -> bool:
+        """Проверяет, установлена ли библиотека xlsxwriter, не загружая ее"""
+
+        return importlib.util.find_spec("xlsxwriter") is not None
+
+    @tracing.traced("saver.export_xlsx")
+    def export(self, vacancies: Iterable[dict]) -> int:
+        """
+        Перезаписывает (или создает) файл таблицей вакансий
+
+        :param vacancies: коллекция или итератор словарей с полной информацией о вакансиях
+        :return: количество выгруженных вакансий
+        """
+
+        try:
+            import xlsxwriter
+        except ImportError as error:
+            raise ImportError(self.MISSING_LIBRARY) from error
+
+        os.makedirs(os.path.dirname(self.path_file), exist_ok=True)
+        count = 0
+
+        with xlsxwriter.Workbook(self.path_file, {"constant_memory": True, "strings_to_urls": False,
+                                                  "strings_to_formulas": False}) as workbook:
+            header = list(self.columns)
+            worksheet, row_number = None, self._MAX_ROWS
+
+            for row in self.iter_rows(vacancies):
+                if row_number == self._MAX_ROWS:
+                    worksheet = workbook.add_worksheet()
+                    worksheet.write_row(0, 0, header)
+                    row_number = 1
+
+                worksheet.write_row(row_number, 0, row)
+                row_number += 1
+                count += 1
+
+            if worksheet is None:
+                workbook.add_worksheet().write_row(0, 0, header)
+
+        return count
+
+
+class _Counter:
+    """Итератор, считающий прошедшие через него вакансии"""
+
+    def __init__(self, vacancies: Iterable[dict]) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param vacancies: коллекция или итератор словарей вакансий
+        """
+
+        self._iterator = iter(vacancies)
+        self.count = 0
+
+    def __iter__(self) -> "_Counter":
+        """Возвращает сам итератор"""
+
+        return self
+
+    def __next__(self) -> dict:
+        """Возвращает следующую вакансию и увеличивает счетчик"""
+
+        vacancy = next(self._iterator)
+        self.count += 1
+        return vacancy
+
+
+# классы выгрузки по расширению файла
+EXPORTERS = {".csv": CSVExporter, ".xlsx": XLSXExporter}
+
+
+def get_exporter(path_file: tuple, columns: dict[str, str] | None = None) -> TableExporter:
+    """
+    Возвращает объект выгрузки в таблицу по расширению файла: .csv или .xlsx.
+    Отсутствие библиотеки xlsxwriter обнаруживается сразу, а не после начала выгрузки
+    """
+
+    extension = os.path.splitext(path_file[-1])[1].lower()
+    if extension not in EXPORTERS:
+        raise ValueError(f"Неизвестный формат таблицы: {extension or path_file[-1]}, допустимы .csv и .xlsx")
+    if extension == ".xlsx" and not XLSXExporter.is_available():
+        raise ImportError(XLSXExporter.MISSING_LIBRARY)
+
+    return EXPORTERS[extension](path_file, columns)
+
+
+def main() -> None:
+    """Выгружает файл с вакансиями в таблицу CSV или XLSX"""
+
+    from saver.json_saver import JSONSaver
+
+    parser = argparse.ArgumentParser(description="Потоковая выгрузка файла с вакансиями в таблицу")
+    parser.add_argument("source", help="файл с полной информацией о вакансиях")
+    parser.add_argument("result", help="файл таблицы, .csv или .xlsx")
+    parser.add_argument("--columns", type=parse_columns, default=None,
+                        help="колонки: 'заголовок=путь|путь,...', путь - ключи через точку, например 'salary.from'")
+    arguments = parser.parse_args()
+
+    exporter = get_exporter((arguments.result,), arguments.columns)
+    count = exporter.export(JSONSaver((arguments.source,)).iter_vacancies())
+    print(f"Выгружено вакансий: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 # ссылка на словарь центрального банка России, для конвертации валюты в рубли
 CBR_RATE_URL = "https://www.cbr-xml-daily.ru/daily_json.js"
 
+# время ожидания ответа сайта по умолчанию, секунды: (на установку соединения, на чтение ответа).
+# Без него запрос к зависшему сайту блокирует программу и поток фоновой загрузки навсегда
+REQUEST_TIMEOUT = (5, 30)
+
 # кортеж строк для построения пути от корневой папки проекта к дефолтному файлу
 # для сохранения полной информации о найденных вакансиях
 PATH_FILE_FULL_INFO_VACANCIES = ("vacancies_files", "JSON", "vacancies(full_info).json")
@@ -14,4 +18,35 @@ PATH_FILE_SHORT_INFO_VACANCIES = ("vacancies_files", "JSON", "vacancies(short_in
 PATH_DIR_JSON = "vacancies_files", "JSON"
 
 # максимальное количество символов для имени пользовательского файла с вакансиями
-MAX_LENGTH_NAME = 20
\ No newline at end of file
+MAX_LENGTH_NAME = 20
+
+# кортеж строк для построения пути от корневой папки проекта к unix-сокету фонового сервиса
+DAEMON_SOCKET_PATH = ("vacancies_files", "job_parser.sock")
+
+# адрес фонового сервиса, если unix-сокеты недоступны (например, в Windows)
+DAEMON_ADDRESS = ("127.0.0.1", 8765)
+
+# кортеж строк для построения пути от корневой папки проекта к папке наблюдателя за сохраненными поисками
+PATH_DIR_WATCHER = ("vacancies_files", "watcher")
+
+# кортеж строк для построения пути от корневой папки проекта к папке с кешем ответов сайтов
+PATH_DIR_CACHE = ("vacancies_files", "cache")
+
+# сжатие JSON-файлов с вакансиями по умолчанию: None, 'gzip' или 'zstd' (нужна библиотека zstandard).
+# Сжатие также выбирается по расширению файла: .gz или .zst
+SAVER_COMPRESSION = None
+
+# записывать каждую вакансию одной строкой без отступов
+SAVER_COMPACT = False
+
+# кортеж строк для построения пути от корневой папки проекта к папке со снимками результатов поисков
+PATH_DIR_SNAPSHOTS = ("vacancies_files", "snapshots")
+
+# кортеж строк для построения пути от корневой папки проекта к папке с файлами трассировки
+PATH_DIR_TRACES = ("vacancies_files", "traces")
+
+# кортеж строк для построения пути от корневой папки проекта к папке с отчетами о расходе памяти
+PATH_DIR_MEMORY = ("vacancies_files", "memory")
+
+# кортеж строк для построения пути от корневой папки проекта к папке с таблицами CSV/XLSX
+PATH_DIR_EXPORT = ("vacancies_files", "export")
@@ -6,4 +6,10 @@ FILTER_DICTIONARY = "https://api.hh.ru/dictionaries"
 
 # ссылка на коллекцию, содержащую возможные для использования на сайте города и регионы,
 # а также их id
-AREA_CODES = "https://api.hh.ru/areas"
\ No newline at end of file
+AREA_CODES = "https://api.hh.ru/areas"
+
+# ссылка для получения полной информации о вакансии по её id
+VACANCY = "https://api.hh.ru/vacancies/{}"
+
+# ссылка для получения информации о работодателе по его id
+EMPLOYER = "https://api.hh.ru/employers/{}"
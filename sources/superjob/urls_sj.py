@@ -6,4 +6,7 @@ FILTER_DICTIONARY = "https://api.superjob.ru/2.0/references/"
 
 # ссылка на коллекцию, содержащую возможные для использования на сайте города и регионы,
 # а также их id
-AREA_CODES = "https://api.superjob.ru/2.0/regions/combined/"
\ No newline at end of file
+AREA_CODES = "https://api.superjob.ru/2.0/regions/combined/"
+
+# ссылка для получения информации о работодателе (клиенте) по его id
+CLIENT = "https://api.superjob.ru/2.0/clients/{}/"
@@ -0,0 +1,323 @@
+import argparse
+import random
+from typing import Iterable
+
+from saver.json_saver import JSONSaver
+from sources.constants import PATH_FILE_FULL_INFO_VACANCIES
+from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_factory import create_vacancy, get_source
+
+
+class KLLSketch:
+    """
+    Приближенные квантили потока чисел (скетч KLL).
+    Числа хранятся по уровням: когда уровень заполняется, он сортируется
+    и половина его чисел (каждое второе) переносится на следующий уровень с удвоенным весом.
+    Объем памяти зависит только от параметра k, а не от количества чисел в потоке
+    """
+
+    # во сколько раз емкость уровня меньше емкости следующего за ним уровня
+    _CAPACITY_RATIO = 2 / 3
+
+    def __init__(self, k: int = 200, seed: int | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param k: емкость верхнего уровня, ошибка квантилей порядка 1.7 / k
+        :param seed: начальное значение генератора случайных чисел
+        """
+
+        self.k = k
+        self.count = 0
+
+        self._levels = [[]]  # числа уровня i имеют вес 2 ** i
+        self._size = 0  # количество хранимых чисел
+        self._max_size = self._get_max_size()
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        """Количество чисел, добавленных в скетч"""
+
+        return self.count
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(k={self.k}, count={self.count}, stored={self._size})"
+
+    def _get_capacity(self, level: int) -> int:
+        """Возвращает емкость уровня: верхний уровень вмещает k чисел, нижние - меньше"""
+
+        depth = len(self._levels) - level - 1
+        return max(int(self.k * self._CAPACITY_RATIO ** depth), 2)
+
+    def _get_max_size(self) -> int:
+        """Возвращает суммарную емкость всех уровней"""
+
+        return sum(self._get_capacity(level) for level in range(len(self._levels)))
+
+    def update(self, value: int | float) -> None:
+        """Добавляет число в скетч"""
+
+        self._levels[0].append(value)
+        self.count += 1
+        self._size += 1
+
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        """Переносит половину чисел переполненных уровней на следующий уровень"""
+
+        while self._size >= self._max_size:
+            for level, items in enumerate(self._levels):
+                if len(items) < self._get_capacity(level):
+                    continue
+
+                if level + 1 == len(self._levels):
+                    self._levels.append([])
+
+                items.sort()
+                # при нечетном количестве одно число остается на уровне
+                keep = [items.pop()] if len(items) % 2 else []
+                self._levels[level + 1].extend(items[self._random.randint(0, 1)::2])
+                self._levels[level] = keep
+                break
+
+            self._size = sum(len(items) for items in self._levels)
+            self._max_size = self._get_max_size()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Добавляет в скетч все числа другого скетча"""
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+
+        self.count += other.count
+        self._size = sum(len(items) for items in self._levels)
+        self._max_size = self._get_max_size()
+        self._compress()
+
+    def quantile(self, fraction: float) -> int | float | None:
+        """
+        Возвращает приближенный квантиль
+
+        :param fraction: доля от 0 до 1, например 0.5 для медианы
+        :return: значение квантиля, либо None, если скетч пуст
+        """
+
+        if not self.count:
+            return None
+
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self._levels) for value in items)
+        total = sum(weight for _, weight in weighted)
+        target = fraction * total
+        cumulative = 0
+
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+
+        return weighted[-1][0]
+
+
+class SalaryStats:
+    """Статистика зарплат: количество, среднее, минимум, максимум и приближенные квантили"""
+
+    def __init__(self, k: int = 200) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param k: точность скетча квантилей
+        """
+
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.sketch = KLLSketch(k)
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(count={self.count}, mean={self.mean:.0f})"
+
+    def add(self, salary: int | float) -> None:
+        """Добавляет зарплату в статистику"""
+
+        self.count += 1
+        self.mean += (salary - self.mean) / self.count
+        self.minimum = salary if self.minimum is None else min(self.minimum, salary)
+        self.maximum = salary if self.maximum is None else max(self.maximum, salary)
+        self.sketch.update(salary)
+
+    def merge(self, other: "SalaryStats") -> None:
+        """Добавляет в статистику данные другой статистики"""
+
+        if not other.count:
+            return
+
+        total = self.count + other.count
+        self.mean += (other.mean - self.mean) * other.count / total
+        self.count = total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    def get_summary(self, percentiles: Iterable[int] = (10, 25, 50, 75, 90)) -> dict:
+        """Возвращает словарь с показателями статистики"""
+
+        summary = {"count": self.count, "mean": round(self.mean), "min": self.minimum, "max": self.maximum}
+        for percentile in percentiles:
+            summary[f"p{percentile}"] = self.sketch.quantile(percentile / 100)
+
+        return summary
+
+
+class SalaryAnalytics:
+    """
+    Аналитика зарплат в рублях по потоку вакансий с разбивкой по сайту, региону,
+    опыту и типу занятости. Вакансии можно добавлять по частям, например страницами
+    ответа сайта или по мере чтения файла; сами вакансии не хранятся
+    """
+
+    # разрезы статистики
+    FACETS = ("source", "area", "experience", "employment")
+
+    def __init__(self, k: int = 200) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param k: точность скетчей квантилей
+        """
+
+        self.k = k
+        self.total = SalaryStats(k)
+        self.facets = {facet: {} for facet in self.FACETS}  # разрез -> значение -> статистика
+
+        self.without_salary = 0  # количество вакансий без указанной зарплаты
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(count={self.total.count}, without_salary={self.without_salary})"
+
+    @staticmethod
+    def get_facet_values(vacancy_dict: dict) -> dict[str, str]:
+        """Возвращает значения разрезов для словаря вакансии HeadHunter или SuperJob"""
+
+        source = get_source(vacancy_dict)
+
+        if source == "sj":
+            fields = {"area": "town", "experience": "experience", "employment": "type_of_work"}
+            name_key = "title"
+        else:
+            fields = {"area": "area", "experience": "experience", "employment": "employment"}
+            name_key = "name"
+
+        values = {"source": source or "Не указано"}
+        for facet, field in fields.items():
+            value = vacancy_dict.get(field)
+            values[facet] = (value.get(name_key) if isinstance(value, dict) else value) or "Не указано"
+
+        return values
+
+    def add_vacancy(self, vacancy: dict | Vacancy) -> None:
+        """Добавляет вакансию (словарь или объект вакансии) в статистику"""
+
+        if not isinstance(vacancy, Vacancy):
+            vacancy = create_vacancy(vacancy)
+            if vacancy is None:
+                return
+
+        salary = vacancy.get_min_salary()
+        if not salary:
+            self.without_salary += 1
+            return
+
+        self.total.add(salary)
+
+        for facet, value in self.get_facet_values(vacancy.full_info).items():
+            stats = self.facets[facet].get(value)
+            if stats is None:
+                stats = self.facets[facet][value] = SalaryStats(self.k)
+            stats.add(salary)
+
+    def add_vacancies(self, vacancies: Iterable[dict | Vacancy]) -> None:
+        """Добавляет в статистику вакансии из коллекции или потока"""
+
+        for vacancy in vacancies:
+            self.add_vacancy(vacancy)
+
+    def merge(self, other: "SalaryAnalytics") -> None:
+        """Добавляет в аналитику данные другой аналитики"""
+
+        self.total.merge(other.total)
+        self.without_salary += other.without_salary
+
+        for facet, groups in other.facets.items():
+            for value, stats in groups.items():
+                self.facets[facet].setdefault(value, SalaryStats(self.k)).merge(stats)
+
+    def get_report(self, facet: str | None = None, min_count: int = 1) -> dict[str, dict]:
+        """
+        Возвращает показатели статистики по значениям разреза, от большего количества вакансий к меньшему
+
+        :param facet: разрез из FACETS, по умолчанию общая статистика
+        :param min_count: минимальное количество вакансий со значением разреза
+        """
+
+        if facet is None:
+            return {"Всего": self.total.get_summary()}
+
+        groups = sorted(self.facets[facet].items(), key=lambda item: item[1].count, reverse=True)
+
+        return {value: stats.get_summary() for value, stats in groups if stats.count >= min_count}
+
+    def format_report(self, facet: str | None = None, min_count: int = 1, limit: int = 20) -> str:
+        """Возвращает показатели статистики в виде текстовой таблицы"""
+
+        columns = ("count", "mean", "p10", "p25", "p50", "p75", "p90")
+        lines = [f"{'':30}" + "".join(f"{column:>10}" for column in columns)]
+
+        for value, summary in list(self.get_report(facet, min_count).items())[:limit]:
+            cells = "".join(f"{round(summary[column] or 0):>10}" for column in columns)
+            lines.append(f"{str(value)[:29]:30}{cells}")
+
+        return "\n".join(lines)
+
+
+def analyze_archive(path_file: tuple = PATH_FILE_FULL_INFO_VACANCIES, k: int = 200) -> SalaryAnalytics:
+    """Строит аналитику зарплат по файлу с вакансиями, читая его по одной вакансии"""
+
+    analytics = SalaryAnalytics(k)
+    analytics.add_vacancies(JSONSaver(path_file).iter_vacancies())
+
+    return analytics
+
+
+def main() -> None:
+    """Выводит аналитику зарплат по файлу с вакансиями"""
+
+    parser = argparse.ArgumentParser(description="Аналитика зарплат по файлу с вакансиями")
+    parser.add_argument("path", nargs="?", help="файл с вакансиями, по умолчанию файл с полной информацией")
+    parser.add_argument("--facet", choices=SalaryAnalytics.FACETS, action="append", help="разрез статистики")
+    parser.add_argument("--min-count", type=int, default=1, help="минимальное количество вакансий в группе")
+    arguments = parser.parse_args()
+
+    analytics = analyze_archive((arguments.path,) if arguments.path else PATH_FILE_FULL_INFO_VACANCIES)
+
+    print(f"Вакансий без указанной зарплаты: {analytics.without_salary}\n")
+    print(analytics.format_report())
+
+    for facet in arguments.facet or SalaryAnalytics.FACETS:
+        print(f"\n{facet}:")
+        print(analytics.format_report(facet, arguments.min_count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+import argparse
+import json
+import os
+import socketserver
+import threading
+
+from filter.filter_abc import Filter
+from filter.filter_hh import FilterHH
+from filter.filter_sj import FilterSJ
+from request_api import transport
+from saver.dual_saver import DualSaver
+from saver.json_saver import JSONSaver
+from sources.constants import DAEMON_ADDRESS, DAEMON_SOCKET_PATH, PATH_DIR_JSON
+from sources.constants import PATH_FILE_FULL_INFO_VACANCIES, PATH_FILE_SHORT_INFO_VACANCIES
+from tools.utils import check_file_name
+from vacancy.vacancy_factory import create_vacancy, get_source
+
+# абсолютный путь к корневой папке проекта
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+
+def get_socket_path() -> str:
+    """Возвращает абсолютный путь к unix-сокету фонового сервиса"""
+
+    return os.path.join(ROOT_DIR, *DAEMON_SOCKET_PATH)
+
+
+def get_file_paths(name: str | None = None) -> tuple[tuple, tuple]:
+    """
+    Возвращает пути к файлам с полной и краткой информацией о вакансиях по имени файла,
+    как при создании файла в программе: имя проверяется check_file_name, файлы всегда находятся в PATH_DIR_JSON.
+    Пути от клиента не принимаются, поэтому клиент не может прочитать или перезаписать файлы вне этой папки
+
+    :param name: имя файла без суффикса и расширения, по умолчанию файлы vacancies
+    """
+
+    if name is None:
+        return PATH_FILE_FULL_INFO_VACANCIES, PATH_FILE_SHORT_INFO_VACANCIES
+
+    if not isinstance(name, str) or not name or not check_file_name(name):
+        raise ValueError(f"Недопустимое имя файла: {name!r}, допустимы только буквы, цифры и знак '_'")
+
+    return (*PATH_DIR_JSON, name + "(full_info).json"), (*PATH_DIR_JSON, name + "(short_info).json")
+
+
+class DaemonState:
+    """
+    Данные, которые фоновый сервис держит в памяти между запросами:
+    фильтры с загруженными справочниками и индексом регионов, курс валют
+    и загруженные файлы с вакансиями
+    """
+
+    # классы фильтров для каждого сайта
+    _FILTERS = {"hh": FilterHH, "sj": FilterSJ}
+
+    def __init__(self) -> None:
+        """Инициализатор объектов класса"""
+
+        self.filters = {source: filter_class() for source, filter_class in self._FILTERS.items()}
+
+        # загруженные файлы: путь -> (время изменения, список словарей вакансий)
+        self._archives = {}
+        # блокировки записи файлов: путь -> блокировка
+        self._file_locks = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Заранее загружает справочники сайтов, строит индексы регионов и получает курс валют"""
+
+        for source, request_filter in self.filters.items():
+            try:
+                request_filter.filter_dictionary
+                request_filter.area_index
+            except Exception as error:
+                print(f"Не удалось загрузить справочники сайта {source}: {error}")
+
+        try:
+            transport.get_currency_rates()
+        except Exception as error:
+            print(f"Не удалось загрузить курс валют: {error}")
+
+    def get_filter(self, source: str, parameters: dict | None = None) -> Filter:
+        """Создает новый фильтр сайта с переданными параметрами"""
+
+        if source not in self._FILTERS:
+            raise ValueError(f"Неизвестный сайт: {source}")
+
+        return self._FILTERS[source].from_parameters(parameters or {})
+
+    def get_file_lock(self, path_file: str) -> threading.Lock:
+        """Возвращает блокировку, которой запись в файл отделяется от других записей в тот же файл"""
+
+        with self._lock:
+            return self._file_locks.setdefault(path_file, threading.Lock())
+
+    def get_archive(self, path_file: tuple) -> list[dict]:
+        """Возвращает вакансии из файла, перечитывая его только после изменения"""
+
+        saver = JSONSaver(path_file)
+        exists = os.path.exists(saver.path_file) and os.path.getsize(saver.path_file) > 0
+        modified = os.path.getmtime(saver.path_file) if exists else None
+
+        with self._lock:
+            cached = self._archives.get(saver.path_file)
+            if cached is None or cached[0] != modified:
+                vacancies = [vacancy.full_info for vacancy in saver.load_vacancies()] if exists else []
+                cached = self._archives[saver.path_file] = modified, vacancies
+
+        return cached[1]
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    Обработчик соединения с фоновым сервисом.
+    Запросы и ответы передаются в виде JSON, по одному объекту в строке
+    """
+
+    def handle(self) -> None:
+        """Читает запросы из соединения, пока клиент его не закроет"""
+
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = {"ok": True, "result": self.dispatch(request)}
+            except Exception as error:
+                response = {"ok": False, "error": f"{error.__class__.__name__}: {error}"}
+
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+    def dispatch(self, request: dict):
+        """Вызывает обработчик операции, указанной в запросе"""
+
+        operation = getattr(self, f"do_{request.get('op')}", None)
+        if operation is None:
+            raise ValueError(f"Неизвестная операция: {request.get('op')}")
+
+        return operation(request)
+
+    def do_ping(self, request: dict) -> str:
+        """Проверка доступности сервиса"""
+
+        return "pong"
+
+    def do_search(self, request: dict) -> list[dict]:
+        """
+        Поиск вакансий на сайте
+
+        Поля запроса: source ('hh' или 'sj'), parameters (параметры фильтра), quantity (количество)
+        """
+
+        from request_api.request_api_hh import HeadHunterAPI
+        from request_api.request_api_sj import SuperJobAPI
+
+        apis = {"hh": HeadHunterAPI, "sj": SuperJobAPI}
+        source = request.get("source")
+        request_filter = self.server.state.get_filter(source, request.get("parameters"))
+
+        return apis[source](request_filter, request.get("quantity", 10)).get_vacancies()
+
+    def do_filter(self, request: dict) -> list[dict]:
+        """
+        Фильтрация вакансий
+
+        Поля запроса: hh и/или sj (параметры фильтров сайтов), vacancies (список вакансий),
+        либо name (имя файла с вакансиями, по умолчанию vacancies - берется файл с полной информацией).
+        Вакансии сайта, для которого параметры не переданы, отбрасываются
+        """
+
+        filters = {source: self.server.state.get_filter(source, request[source])
+                   for source in ("hh", "sj") if request.get(source) is not None}
+
+        vacancies = request.get("vacancies")
+        if vacancies is None:
+            vacancies = self.server.state.get_archive(get_file_paths(request.get("name"))[0])
+
+        return [vacancy for vacancy in vacancies
+                if get_source(vacancy) in filters and filters[get_source(vacancy)].compare_parameters(vacancy)]
+
+    def do_sort(self, request: dict) -> list[dict]:
+        """
+        Сортировка вакансий по минимальной зарплате в рублях
+
+        Поля запроса: vacancies (список вакансий), reverse (сортировка по убыванию)
+        """
+
+        vacancies = [create_vacancy(vacancy) for vacancy in request.get("vacancies", [])]
+        vacancies = sorted([vacancy for vacancy in vacancies if vacancy is not None],
+                           reverse=bool(request.get("reverse")))
+
+        return [vacancy.full_info for vacancy in vacancies]
+
+    def do_save(self, request: dict) -> int:
+        """
+        Запись вакансий в файлы с полной и краткой информацией
+
+        Поля запроса: vacancies (список вакансий), mode ('add' или 'write'),
+        name (имя файлов, по умолчанию vacancies). Записи в одни и те же файлы выполняются по очереди
+        """
+
+        vacancies = [create_vacancy(vacancy) for vacancy in request.get("vacancies", [])]
+        vacancies = [vacancy for vacancy in vacancies if vacancy is not None]
+
+        path_full, path_short = get_file_paths(request.get("name"))
+        dual_saver = DualSaver(JSONSaver(path_full), JSONSaver(path_short))
+
+        # блокировки берутся всегда в одном порядке, поэтому записи не ждут друг друга бесконечно
+        with self.server.state.get_file_lock(dual_saver.saver_full.path_file), \
+                self.server.state.get_file_lock(dual_saver.saver_short.path_file):
+            if request.get("mode", "add") == "write":
+                dual_saver.write_vacancies(vacancies)
+            else:
+                dual_saver.add_vacancies(vacancies)
+
+        return len(vacancies)
+
+    def do_resolve_area(self, request: dict) -> dict:
+        """
+        Поиск города или региона по названию
+
+        Поля запроса: source ('hh' или 'sj'), name (название), limit (количество вариантов)
+        """
+
+        request_filter = self.server.state.filters[request.get("source")]
+        name = request.get("name", "")
+
+        return {"id": request_filter.resolve_area(name),
+                "matches": [match._asdict() for match in request_filter.find_areas(name, request.get("limit", 5))]}
+
+
+class DaemonTCPServer(socketserver.ThreadingTCPServer):
+    """Фоновый сервис, обслуживающий запросы по localhost TCP"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple, state: DaemonState) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param address: адрес (хост, порт)
+        :param state: данные, которые сервис держит в памяти
+        """
+
+        self.state = state
+        super().__init__(address, DaemonHandler)
+
+
+# unix-сокеты доступны не во всех операционных системах
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class DaemonUnixServer(socketserver.ThreadingUnixStreamServer):
+        """Фоновый сервис, обслуживающий запросы через unix-сокет"""
+
+        daemon_threads = True
+
+        def __init__(self, path: str, state: DaemonState) -> None:
+            """
+            Инициализатор объектов класса
+
+            :param path: путь к unix-сокету
+            :param state: данные, которые сервис держит в памяти
+            """
+
+            self.state = state
+            if os.path.exists(path):
+                os.remove(path)
+            super().__init__(path, DaemonHandler)
+
+        def server_close(self) -> None:
+            """Закрывает сервис и удаляет файл сокета"""
+
+            super().server_close()
+            if os.path.exists(self.server_address):
+                os.remove(self.server_address)
+
+else:
+    DaemonUnixServer = None
+
+
+def create_server(state: DaemonState, use_tcp: bool = False) -> socketserver.BaseServer:
+    """Создает фоновый сервис: через unix-сокет, если это возможно, иначе по localhost TCP"""
+
+    if use_tcp or DaemonUnixServer is None:
+        return DaemonTCPServer(DAEMON_ADDRESS, state)
+
+    return DaemonUnixServer(get_socket_path(), state)
+
+
+def main() -> None:
+    """Запускает фоновый сервис и обслуживает запросы до прерывания с клавиатуры"""
+
+    parser = argparse.ArgumentParser(description="Фоновый сервис поиска вакансий")
+    parser.add_argument("--tcp", action="store_true", help=f"слушать localhost TCP {DAEMON_ADDRESS}")
+    parser.add_argument("--no-warm-up", action="store_true", help="не загружать справочники при запуске")
+    arguments = parser.parse_args()
+
+    state = DaemonState()
+    if not arguments.no_warm_up:
+        state.warm_up()
+
+    with create_server(state, arguments.tcp) as server:
+        print(f"Сервис запущен: {server.server_address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nСервис остановлен")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import json
+import os
+import socket
+
+from sources.constants import DAEMON_ADDRESS, DAEMON_SOCKET_PATH
+
+
+class DaemonError(Exception):
+    """Ошибка, которую вернул фоновый сервис"""
+
+
+class DaemonClient:
+    """
+    Клиент фонового сервиса поиска вакансий.
+    Соединение открывается при первом запросе и используется повторно
+    """
+
+    # абсолютный путь из текущего файла к корневой папке проекта
+    _ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+    def __init__(self, use_tcp: bool = False, timeout: float | None = 60) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param use_tcp: подключаться по localhost TCP вместо unix-сокета
+        :param timeout: время ожидания ответа в секундах
+        """
+
+        self.use_tcp = use_tcp or not hasattr(socket, "AF_UNIX")
+        self.timeout = timeout
+        self._socket = None
+        self._file = None
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(use_tcp={self.use_tcp}, connected={self._socket is not None})"
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @classmethod
+    def connect_if_running(cls) -> "DaemonClient | None":
+        """Возвращает подключенный клиент, если фоновый сервис запущен, иначе None"""
+
+        client = cls()
+        try:
+            client.ping()
+        except OSError:
+            client.close()
+            return None
+
+        return client
+
+    def _connect(self) -> None:
+        """Открывает соединение с фоновым сервисом"""
+
+        if self.use_tcp:
+            connection = socket.create_connection(DAEMON_ADDRESS, timeout=self.timeout)
+        else:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            try:
+                connection.connect(os.path.join(self._ROOT_DIR, *DAEMON_SOCKET_PATH))
+            except OSError:
+                connection.close()
+                raise
+
+        self._socket = connection
+        self._file = connection.makefile("rwb")
+
+    def close(self) -> None:
+        """Закрывает соединение"""
+
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = None
+            self._file = None
+
+    def request(self, operation: str, **fields):
+        """
+        Отправляет запрос фоновому сервису и возвращает результат
+
+        :param operation: название операции
+        :param fields: поля запроса
+        """
+
+        if self._socket is None:
+            self._connect()
+
+        try:
+            self._file.write(json.dumps({"op": operation, **fields}, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        except OSError:
+            self.close()
+            raise
+
+        if not line:
+            self.close()
+            raise ConnectionError("Фоновый сервис закрыл соединение")
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error"))
+
+        return response.get("result")
+
+    def ping(self) -> str:
+        """Проверяет доступность сервиса"""
+
+        return self.request("ping")
+
+    def search(self, source: str, parameters: dict, quantity: int = 10) -> list[dict]:
+        """Ищет вакансии на сайте ('hh' или 'sj') с переданными параметрами фильтра"""
+
+        return self.request("search", source=source, parameters=parameters, quantity=quantity)
+
+    def filter(self, hh: dict | None = None, sj: dict | None = None,
+               vacancies: list[dict] | None = None, name: str | None = None) -> list[dict]:
+        """
+        Фильтрует переданные вакансии, либо вакансии из файла, по параметрам фильтров сайтов.
+        Файл задается именем, как при создании файла в программе, по умолчанию vacancies
+        """
+
+        fields = {"hh": hh, "sj": sj}
+        if vacancies is not None:
+            fields["vacancies"] = vacancies
+        if name is not None:
+            fields["name"] = name
+
+        return self.request("filter", **fields)
+
+    def sort(self, vacancies: list[dict], reverse: bool = False) -> list[dict]:
+        """Сортирует вакансии по минимальной зарплате в рублях"""
+
+        return self.request("sort", vacancies=vacancies, reverse=reverse)
+
+    def save(self, vacancies: list[dict], mode: str = "add", name: str | None = None) -> int:
+        """
+        Записывает вакансии в файлы с полной и краткой информацией ('add' - добавить, 'write' - перезаписать).
+        Файлы задаются именем, как при создании файла в программе, по умолчанию vacancies
+        """
+
+        fields = {"vacancies": vacancies, "mode": mode}
+        if name is not None:
+            fields["name"] = name
+
+        return self.request("save", **fields)
+
+    def resolve_area(self, source: str, name: str, limit: int = 5) -> dict:
+        """Ищет город или регион сайта по названию"""
+
+        return self.request("resolve_area", source=source, name=name, limit=limit)
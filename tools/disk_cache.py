@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from sources.constants import PATH_DIR_CACHE
+
+# абсолютный путь к корневой папке проекта
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+
+class DiskCache:
+    """
+    Кеш JSON-значений на диске.
+    Значение хранится в файле, имя которого - хеш ключа, поэтому изменившиеся данные
+    (например, с новой датой обновления в ключе) попадают в новый файл, а не перезаписывают старый.
+    Файлы распределены по подпапкам по первым символам хеша
+    """
+
+    def __init__(self, path_dir: tuple = PATH_DIR_CACHE, ttl: float | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_dir: кортеж строк для построения пути к папке кеша
+        :param ttl: время жизни значения в секундах, по умолчанию без ограничения
+        """
+
+        self.path_dir = os.path.join(ROOT_DIR, *path_dir)
+        self.ttl = ttl
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_dir!r}, ttl={self.ttl})"
+
+    def get_path(self, key: str) -> str:
+        """Возвращает путь к файлу значения по ключу"""
+
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+        return os.path.join(self.path_dir, digest[:2], f"{digest[2:]}.json")
+
+    def get(self, key: str) -> dict | list | None:
+        """Возвращает значение по ключу, либо None, если его нет в кеше или истек срок его жизни"""
+
+        path = self.get_path(key)
+
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+
+        except (OSError, json.decoder.JSONDecodeError):
+            return None
+
+    def set(self, key: str, value: dict | list) -> None:
+        """Записывает значение по ключу"""
+
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # запись во временный файл и переименование, чтобы не оставить в кеше недописанный файл
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(value, file, ensure_ascii=False)
+
+        os.replace(temporary_path, path)
@@ -0,0 +1,305 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from saver.catalog import get_raw_salary, get_vacancy_key
+from vacancy.vacancy_factory import get_source
+
+# ширина счетчика одного бита отпечатка, суммарный вес признаков вакансии должен быть меньше 2 ** 15
+_LANE = 16
+
+# каждый бит байта, расширенный до отдельного счетчика
+_BYTE_LANES = [int("".join("0" * (_LANE - 1) + bit for bit in format(value, "08b")), 2) for value in range(256)]
+
+
+@lru_cache(maxsize=1 << 16)
+def _get_feature_lanes(feature: str) -> int:
+    """
+    Возвращает 64-битный хеш признака, каждый бит которого
+    расширен до отдельного 16-битного счетчика большого целого числа.
+    Сумма таких чисел одновременно считает единицы во всех 64 битах
+    """
+
+    lanes = 0
+    for byte in hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest():
+        lanes = (lanes << (8 * _LANE)) | _BYTE_LANES[byte]
+
+    return lanes
+
+
+class DuplicateDetector:
+    """
+    Поиск почти одинаковых вакансий, в том числе опубликованных на разных сайтах.
+    Вакансия с тем же сайтом и id, что и добавленная, - её обновленная версия и заменяет её.
+    Для каждой вакансии строится 64-битный отпечаток SimHash по названию, работодателю,
+    городу и тексту вакансии. Похожие вакансии имеют отпечатки, отличающиеся в нескольких битах.
+    Отпечаток делится на полосы: у отпечатков, отличающихся не более чем в max_distance битах,
+    хотя бы одна полоса совпадает, поэтому сравниваются только вакансии из общих корзин.
+    Похожие вакансии разных сайтов считаются дубликатами по одному отпечатку, а вакансии одного сайта
+    с разными id - только если у них к тому же совпадают зарплата и текст
+    """
+
+    _BITS = 64
+    # число с единицей в младшем бите каждого счетчика
+    _LANES_ONES = int(("0" * (_LANE - 1) + "1") * 64, 2)
+
+    # вес признаков каждого поля вакансии в отпечатке
+    _WEIGHTS = {"title": 4, "employer": 3, "town": 2, "text": 1}
+
+    # максимальное количество слов текста, участвующих в отпечатке
+    _MAX_TEXT_WORDS = 60
+
+    # всё, что не является буквой или цифрой
+    _NOT_WORD = re.compile(r"[^\w]+")
+    # html-теги и артефакты подсветки в тексте вакансии
+    _TAGS = re.compile(r"<[^>]*>")
+
+    def __init__(self, max_distance: int = 3) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param max_distance: максимальное количество различающихся битов отпечатков,
+        при котором вакансии считаются дубликатами
+        """
+
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._band_width = self._BITS // self._bands
+        self._band_mask = (1 << self._band_width) - 1
+
+        self._fingerprints = []  # отпечатки добавленных вакансий, None - отпечаток не построен
+        self._details = []  # сайт, зарплата и текст добавленных вакансий
+        self._keys = {}  # сайт и id -> номер добавленной вакансии
+        self._buckets = {}  # (номер полосы, значение полосы) -> номера вакансий
+
+    def __len__(self) -> int:
+        """Количество добавленных вакансий"""
+
+        return len(self._fingerprints)
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(max_distance={self.max_distance}, vacancies={len(self)})"
+
+    @staticmethod
+    def get_fields(vacancy_dict: dict) -> dict:
+        """
+        Возвращает поля вакансии, по которым строится отпечаток.
+        Поддерживаются словари вакансий HeadHunter, SuperJob и краткая информация о вакансии
+        """
+
+        if "profession" in vacancy_dict or "firm_name" in vacancy_dict:
+            town = vacancy_dict.get("town")
+            return {"title": vacancy_dict.get("profession"),
+                    "employer": vacancy_dict.get("firm_name"),
+                    "town": town.get("title") if town else None,
+                    "text": vacancy_dict.get("candidat")}
+
+        if "Название" in vacancy_dict:
+            text = " ".join(str(vacancy_dict.get(key) or "") for key in ("Требования", "Обязанности", "Описание"))
+            return {"title": vacancy_dict.get("Название"),
+                    "employer": None,
+                    "town": vacancy_dict.get("Город"),
+                    "text": text}
+
+        employer = vacancy_dict.get("employer")
+        area = vacancy_dict.get("area")
+        snippet = vacancy_dict.get("snippet") or {}
+        return {"title": vacancy_dict.get("name"),
+                "employer": employer.get("name") if employer else None,
+                "town": area.get("name") if area else None,
+                "text": f"{snippet.get('requirement') or ''} {snippet.get('responsibility') or ''}"}
+
+    @classmethod
+    def get_features(cls, vacancy_dict: dict) -> dict[str, int]:
+        """Возвращает признаки вакансии и их суммарный вес"""
+
+        features = {}
+
+        for field, value in cls.get_fields(vacancy_dict).items():
+            if not value:
+                continue
+
+            value = cls._TAGS.sub(" ", str(value)).lower().replace("ё", "е")
+            words = cls._NOT_WORD.sub(" ", value).split()
+
+            if field == "text":
+                words = words[:cls._MAX_TEXT_WORDS]
+                # пары соседних слов учитывают порядок слов в тексте
+                field_features = [f"{field}:{first} {second}" for first, second in zip(words, words[1:])]
+            else:
+                field_features = [f"{field}:{word}" for word in words]
+
+            weight = cls._WEIGHTS[field]
+            for feature in field_features:
+                features[feature] = features.get(feature, 0) + weight
+
+        return features
+
+    @classmethod
+    def fingerprint(cls, vacancy_dict: dict) -> int | None:
+        """
+        Вычисляет 64-битный отпечаток SimHash вакансии.
+        Возвращает None, если у вакансии нет полей для построения отпечатка
+        """
+
+        features = cls.get_features(vacancy_dict)
+        if not features:
+            return None
+
+        # суммарный вес признаков, у которых установлен каждый из битов
+        counters = sum(weight * _get_feature_lanes(feature) for feature, weight in features.items())
+
+        # бит отпечатка равен 1, если суммарный вес признаков с этим битом больше половины общего веса:
+        # прибавляем к каждому счетчику смещение так, чтобы в этом случае установился его старший бит
+        total_weight = sum(features.values())
+        offset = (1 << (_LANE - 1)) - total_weight // 2 - 1
+        counters += offset * cls._LANES_ONES
+
+        return int(format(counters, f"0{cls._BITS * _LANE}b")[::_LANE], 2)
+
+    def _get_band_keys(self, fingerprint: int) -> list[tuple[int, int]]:
+        """Возвращает ключи корзин, в которые попадает отпечаток"""
+
+        return [(band, (fingerprint >> (band * self._band_width)) & self._band_mask) for band in range(self._bands)]
+
+    @classmethod
+    def get_details(cls, vacancy_dict: dict) -> tuple:
+        """
+        Возвращает сайт, зарплату в валюте вакансии и хеш нормализованного текста вакансии:
+        по ним различаются похожие вакансии одного сайта
+        """
+
+        text = cls._TAGS.sub(" ", str(cls.get_fields(vacancy_dict)["text"] or "")).lower().replace("ё", "е")
+
+        return get_source(vacancy_dict), get_raw_salary(vacancy_dict), hash(" ".join(cls._NOT_WORD.sub(" ", text).split()))
+
+    @staticmethod
+    def is_duplicate(details: tuple, other_details: tuple) -> bool:
+        """Считаются ли дубликатами вакансии с близкими отпечатками"""
+
+        source, salary, text = details
+        other_source, other_salary, other_text = other_details
+
+        if source is not None and other_source is not None and source != other_source:
+            return True
+
+        return salary == other_salary and text == other_text
+
+    def find_duplicate(self, vacancy_dict: dict, fingerprint: int | None = None,
+                       details: tuple | None = None) -> int | None:
+        """
+        Ищет среди добавленных вакансий дубликат переданной (вакансия с тем же сайтом и id дубликатом не считается)
+
+        :return: порядковый номер найденного дубликата среди добавленных вакансий, либо None
+        """
+
+        if fingerprint is None:
+            fingerprint = self.fingerprint(vacancy_dict)
+            if fingerprint is None:
+                return None
+
+        details = details or self.get_details(vacancy_dict)
+        key = get_vacancy_key(vacancy_dict)
+
+        for band_key in self._get_band_keys(fingerprint):
+            for position in self._buckets.get(band_key, ()):
+                if (self._fingerprints[position] ^ fingerprint).bit_count() <= self.max_distance \
+                        and self.is_duplicate(details, self._details[position]) \
+                        and (key is None or self._keys.get(key) != position):
+                    return position
+
+        return None
+
+    def add(self, vacancy_dict: dict) -> int:
+        """
+        Добавляет вакансию без проверки на дубликаты, например уже сохраненную в файле
+
+        :return: порядковый номер вакансии среди добавленных
+        """
+
+        position = len(self._fingerprints)
+        self._fingerprints.append(None)
+        self._details.append(None)
+        self._set(position, vacancy_dict)
+
+        key = get_vacancy_key(vacancy_dict)
+        if key is not None:
+            self._keys.setdefault(key, position)
+
+        return position
+
+    def _set(self, position: int, vacancy_dict: dict, fingerprint: int | None = None) -> None:
+        """Записывает отпечаток и сведения о вакансии под номером position и раскладывает его по корзинам"""
+
+        old_fingerprint = self._fingerprints[position]
+        if old_fingerprint is not None:
+            for band_key in self._get_band_keys(old_fingerprint):
+                self._buckets[band_key].remove(position)
+
+        fingerprint = fingerprint if fingerprint is not None else self.fingerprint(vacancy_dict)
+        self._fingerprints[position] = fingerprint
+        self._details[position] = self.get_details(vacancy_dict)
+
+        if fingerprint is not None:
+            for band_key in self._get_band_keys(fingerprint):
+                self._buckets.setdefault(band_key, []).append(position)
+
+    def place(self, vacancy_dict: dict) -> int | None:
+        """
+        Определяет место новой вакансии среди добавленных и добавляет её.
+        Обновленная версия добавленной вакансии (тот же сайт и id) занимает её место
+
+        :return: номер вакансии среди добавленных: номер заменяемой вакансии, len(self) до вызова
+        для новой вакансии, либо None, если вакансия - дубликат и добавлять её не нужно
+        """
+
+        key = get_vacancy_key(vacancy_dict)
+        if key is not None and key in self._keys:
+            position = self._keys[key]
+            self._set(position, vacancy_dict)
+            return position
+
+        fingerprint = self.fingerprint(vacancy_dict)
+        if fingerprint is not None and self.find_duplicate(vacancy_dict, fingerprint) is not None:
+            return None
+
+        return self.add(vacancy_dict)
+
+    def merge(self, vacancies: list[dict], new_vacancies: Iterable[dict]) -> int:
+        """
+        Дополняет список вакансий новыми вакансиями без дубликатов, обновленные вакансии заменяются.
+        Вакансии списка, еще не добавленные в детектор, добавляются перед слиянием,
+        поэтому номера вакансий в детекторе совпадают с номерами в списке
+
+        :param vacancies: список вакансий, изменяется на месте
+        :param new_vacancies: новые вакансии
+        :return: номер первой измененной вакансии списка (длина списка, если вакансии только добавлены)
+        """
+
+        for vacancy_dict in vacancies[len(self):]:
+            self.add(vacancy_dict)
+
+        first_changed = len(vacancies)
+
+        for vacancy_dict in new_vacancies:
+            position = self.place(vacancy_dict)
+            if position is None:
+                continue
+            if position == len(vacancies):
+                vacancies.append(vacancy_dict)
+            else:
+                vacancies[position] = vacancy_dict
+                first_changed = min(first_changed, position)
+
+        return first_changed
+
+    def clear(self) -> None:
+        """Удаляет все добавленные вакансии"""
+
+        self._fingerprints.clear()
+        self._details.clear()
+        self._keys.clear()
+        self._buckets.clear()
@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from request_api import transport
+from sources.headhunter import urls_hh
+from sources.superjob import urls_sj
+from tools.disk_cache import DiskCache
+from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_factory import get_source
+
+
+class EmployerService:
+    """
+    Информация о работодателях (размер или тип, отрасли, количество открытых вакансий) для найденных вакансий.
+    Из вакансий собираются id работодателей (HeadHunter - employer.id, SuperJob - id_client),
+    каждый работодатель запрашивается с сайта один раз, одновременно не более чем workers запросов.
+    От ответа сайта остаются только поля, нужные для сравнения работодателей (_FIELDS): полный ответ
+    содержит описание компании, логотипы и т.п. и занимал бы в каждой вакансии больше места, чем она сама.
+    Сокращенная информация кешируется на диске на время ttl и добавляется в полную информацию о вакансии
+    """
+
+    # ключ полной информации о вакансии, под которым сохраняется информация о работодателе
+    KEY = "employer_info"
+
+    # сохраняемые поля информации о работодателе: название поля -> ключ в ответе сайта.
+    # Справочные значения (регион, отрасли) сохраняются только названиями
+    _FIELDS = {
+        "hh": {"id": "id", "name": "name", "type": "type", "industries": "industries", "trusted": "trusted",
+               "open_vacancies": "open_vacancies", "area": "area", "url": "alternate_url", "site_url": "site_url"},
+        "sj": {"id": "id", "name": "title", "size": "staff_count", "industries": "industry",
+               "open_vacancies": "vacancy_count", "area": "town", "url": "link"},
+    }
+
+    # время жизни информации о работодателе в кеше по умолчанию, секунды
+    _DEFAULT_TTL = 7 * 24 * 60 * 60
+
+    def __init__(self, workers: int = 8, cache: DiskCache | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param workers: максимальное количество одновременных запросов
+        :param cache: кеш ответов на диске
+        """
+
+        self.workers = max(workers, 1)
+        self.cache = cache or DiskCache(ttl=self._DEFAULT_TTL)
+
+        self.employers = {}  # (сайт, id работодателя) -> информация о работодателе
+        self.fetched = 0  # количество загруженных с сайта работодателей
+        self.failed = 0  # количество работодателей, которых не удалось загрузить
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(employers={len(self.employers)}, fetched={self.fetched}, " \
+               f"failed={self.failed})"
+
+    @staticmethod
+    def get_employer_key(vacancy_dict: dict) -> tuple[str, str] | None:
+        """Возвращает пару (сайт, id работодателя), либо None, если работодатель не указан"""
+
+        source = get_source(vacancy_dict)
+
+        if source == "hh":
+            employer_id = (vacancy_dict.get("employer") or {}).get("id")
+        elif source == "sj":
+            employer_id = vacancy_dict.get("id_client")
+        else:
+            return None
+
+        # у анонимных работодателей id нет, у SuperJob вместо него бывает 0
+        return (source, str(employer_id)) if employer_id else None
+
+    @classmethod
+    def get_summary(cls, source: str, employer: dict) -> dict:
+        """Возвращает сокращенную информацию о работодателе из ответа сайта"""
+
+        return {field: _get_title(employer.get(key)) for field, key in cls._FIELDS[source].items()}
+
+    @staticmethod
+    def get_cache_key(key: tuple[str, str]) -> str:
+        """Ключ кеша: сайт и id работодателя"""
+
+        return f"{key[0]}:employer_summary:{key[1]}"
+
+    def fetch_employer(self, key: tuple[str, str]) -> dict | None:
+        """Загружает информацию о работодателе с сайта и записывает сокращенную информацию в кеш"""
+
+        source, employer_id = key
+
+        if source == "hh":
+            url, headers = urls_hh.EMPLOYER.format(employer_id), None
+        else:
+            # заголовки авторизации SuperJob не зависят от фильтра запроса
+            from request_api.request_api_sj import SuperJobAPI
+            url, headers = urls_sj.CLIENT.format(employer_id), SuperJobAPI(None).get_headers()
+
+        try:
+            employer = transport.get_json(url, headers=headers,
+                                          error_message="Ошибка при получении информации о работодателе")
+        except Exception as error:
+            print(f"Не удалось загрузить работодателя {employer_id}: {error}")
+            return None
+
+        employer = self.get_summary(source, employer)
+        self.cache.set(self.get_cache_key(key), employer)
+
+        return employer
+
+    def load(self, keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], dict]:
+        """
+        Загружает информацию о работодателях, которых ещё нет в памяти:
+        сначала из кеша на диске, остальных - с сайта
+
+        :param keys: пары (сайт, id работодателя)
+        :return: информация о работодателях, загруженная за время работы сервиса
+        """
+
+        missing = []
+
+        for key in set(keys) - self.employers.keys():
+            employer = self.cache.get(self.get_cache_key(key))
+            if employer is None:
+                missing.append(key)
+            else:
+                self.employers[key] = employer
+
+        if missing:
+            with ThreadPoolExecutor(min(self.workers, len(missing))) as executor:
+                for key, employer in zip(missing, executor.map(self.fetch_employer, missing)):
+                    if employer is None:
+                        self.failed += 1
+                    else:
+                        self.fetched += 1
+                        self.employers[key] = employer
+
+        return self.employers
+
+    def join(self, vacancies: Iterable[dict | Vacancy]) -> list[dict | Vacancy]:
+        """
+        Добавляет информацию о работодателе в полную информацию о каждой вакансии
+
+        :param vacancies: словари или объекты вакансий
+        :return: те же вакансии списком
+        """
+
+        vacancies = list(vacancies)
+        vacancy_dicts = [vacancy.full_info if isinstance(vacancy, Vacancy) else vacancy for vacancy in vacancies]
+        keys = [self.get_employer_key(vacancy_dict) for vacancy_dict in vacancy_dicts]
+
+        employers = self.load(key for key in keys if key is not None)
+
+        for vacancy_dict, key in zip(vacancy_dicts, keys):
+            if key in employers:
+                vacancy_dict[self.KEY] = employers[key]
+
+        return vacancies
+
+
+def _get_title(value):
+    """Возвращает название справочного значения сайта (словаря с полем name или title), для списка - список названий"""
+
+    if isinstance(value, dict):
+        return value.get("name") or value.get("title")
+    if isinstance(value, list):
+        return [_get_title(item) for item in value]
+
+    return value
@@ -0,0 +1,116 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+from request_api import transport
+from sources.headhunter import urls_hh
+from tools.disk_cache import DiskCache
+from vacancy.vacancy_factory import get_source
+
+
+class DetailEnricher:
+    """
+    Дополнение вакансий HeadHunter полной информацией о вакансии (описание, ключевые навыки и т.д.).
+    В ответе на поиск есть только фрагменты требований и обязанностей, поэтому полная информация
+    запрашивается отдельно для каждой вакансии, одновременно не более чем workers запросов
+    и не чаще requests_per_second запросов в секунду на все потоки загрузки.
+    Ответы кешируются на диске по id и дате обновления вакансии: повторное дополнение
+    тех же вакансий не требует запросов к сайту. Исходные словари вакансий не изменяются:
+    возвращаются их дополненные копии
+    """
+
+    def __init__(self, workers: int = 8, cache: DiskCache | None = None, requests_per_second: float = 5) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param workers: максимальное количество одновременных запросов
+        :param cache: кеш ответов на диске
+        :param requests_per_second: допустимое количество запросов к сайту в секунду
+        """
+
+        self.workers = max(workers, 1)
+        self.cache = cache or DiskCache()
+        self.rate_limiter = transport.RateLimiter(requests_per_second)
+
+        self.fetched = 0  # количество загруженных с сайта вакансий
+        self.cached = 0  # количество вакансий, взятых из кеша
+        self.failed = 0  # количество вакансий, которые не удалось загрузить
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(workers={self.workers}, fetched={self.fetched}, " \
+               f"cached={self.cached}, failed={self.failed})"
+
+    @staticmethod
+    def get_cache_key(vacancy_dict: dict) -> str:
+        """Ключ кеша: id вакансии и дата её обновления (или публикации)"""
+
+        updated = vacancy_dict.get("updated_at") or vacancy_dict.get("published_at") or ""
+
+        return f"hh:vacancy:{vacancy_dict.get('id')}:{updated}"
+
+    def fetch_details(self, vacancy_dict: dict) -> dict:
+        """Загружает полную информацию о вакансии с сайта и записывает её в кеш"""
+
+        self.rate_limiter.wait()
+        details = transport.get_json(urls_hh.VACANCY.format(vacancy_dict["id"]),
+                                     error_message="Ошибка при получении полной информации о вакансии")
+        self.cache.set(self.get_cache_key(vacancy_dict), details)
+
+        return details
+
+    def _submit(self, executor: ThreadPoolExecutor, vacancy_dict: dict) -> dict | Future | None:
+        """Возвращает полную информацию о вакансии из кеша, либо ставит её загрузку в очередь"""
+
+        if get_source(vacancy_dict) != "hh" or vacancy_dict.get("id") is None or "description" in vacancy_dict:
+            return None
+
+        details = self.cache.get(self.get_cache_key(vacancy_dict))
+        if details is not None:
+            self.cached += 1
+            return details
+
+        return executor.submit(self.fetch_details, vacancy_dict)
+
+    @staticmethod
+    def _is_ready(details: dict | Future | None) -> bool:
+        """Проверяет, получена ли уже полная информация о вакансии"""
+
+        return not isinstance(details, Future) or details.done()
+
+    def _merge(self, vacancy_dict: dict, details: dict | Future | None) -> dict:
+        """Возвращает копию словаря вакансии, дополненную полной информацией, либо исходный словарь"""
+
+        if isinstance(details, Future):
+            try:
+                details = details.result()
+            except Exception as error:
+                self.failed += 1
+                print(f"Не удалось загрузить вакансию {vacancy_dict.get('id')}: {error}")
+                return vacancy_dict
+            self.fetched += 1
+
+        return {**vacancy_dict, **details} if details else vacancy_dict
+
+    def enrich(self, vacancies: Iterable[dict]) -> Iterator[dict]:
+        """
+        Возвращает поток словарей вакансий, дополненных полной информацией, в исходном порядке.
+        Вакансии других сайтов и уже дополненные вакансии передаются без изменений, остальные - копиями
+
+        :param vacancies: коллекция или итератор словарей вакансий
+        """
+
+        # вакансии, ожидающие загрузки; не больше нескольких на каждый поток загрузки
+        window = self.workers * 4
+        pending = deque()
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            for vacancy_dict in vacancies:
+                pending.append((vacancy_dict, self._submit(executor, vacancy_dict)))
+
+                while pending and (len(pending) > window or self._is_ready(pending[0][1])):
+                    yield self._merge(*pending.popleft())
+
+            while pending:
+                yield self._merge(*pending.popleft())
@@ -0,0 +1,189 @@
+import argparse
+import heapq
+import json
+import sys
+import tempfile
+from typing import Callable, Iterable, Iterator
+
+from saver.json_saver import JSONSaver
+from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_factory import create_vacancy
+
+
+def get_salary_key(vacancy_dict: dict) -> int | float:
+    """Ключ сортировки: минимальная зарплата вакансии в рублях, 0 для вакансий неизвестного сайта"""
+
+    vacancy = create_vacancy(vacancy_dict)
+
+    return vacancy.get_min_salary() if vacancy is not None else 0
+
+
+class ExternalSorter:
+    """
+    Сортировка вакансий с ограниченным расходом памяти.
+    Вакансии набираются в памяти, пока их объем не превысит бюджет; набранная часть
+    сортируется и сбрасывается во временный файл. Затем отсортированные части
+    сливаются в один поток. Если все вакансии уместились в бюджет, временные файлы не создаются
+    """
+
+    # примерный расход памяти на одну вакансию в сортируемой части сверх её текста
+    _ENTRY_OVERHEAD = 72
+
+    # максимальное количество одновременно сливаемых файлов
+    _MAX_MERGE_FILES = 64
+
+    def __init__(self, key: Callable[[dict], int | float] = get_salary_key, reverse: bool = False,
+                 memory_budget: int = 64 * 1024 * 1024, temp_dir: str | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param key: функция, возвращающая числовой ключ сортировки словаря вакансии
+        :param reverse: сортировка по убыванию
+        :param memory_budget: бюджет памяти на сортируемую часть в байтах
+        :param temp_dir: папка для временных файлов, по умолчанию системная
+        """
+
+        self.key = key
+        self.reverse = reverse
+        self.memory_budget = memory_budget
+        self.temp_dir = temp_dir
+
+        # количество отсортированных частей при последней сортировке, включая последнюю часть,
+        # которая не сбрасывается в файл, если поместилась в память целиком; 1 - внешняя сортировка не понадобилась
+        self.runs_count = 0
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(reverse={self.reverse}, memory_budget={self.memory_budget})"
+
+    def _sort_run(self, run: list[tuple[int | float, str]]) -> list[tuple[int | float, str]]:
+        """Сортирует часть по ключу, сохраняя исходный порядок вакансий с одинаковым ключом"""
+
+        return sorted(run, key=lambda entry: entry[0], reverse=self.reverse)
+
+    def _spill(self, run: Iterable[tuple[int | float, str]]):
+        """Записывает отсортированную часть во временный файл, по одной вакансии в строке"""
+
+        file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=self.temp_dir)
+        for key, line in run:
+            file.write(f"{key!r}\t{line}\n")
+        file.seek(0)
+
+        return file
+
+    @staticmethod
+    def _read_run(file) -> Iterator[tuple[int | float, str]]:
+        """Читает отсортированную часть из временного файла"""
+
+        for row in file:
+            key, line = row.rstrip("\n").split("\t", 1)
+            yield (float(key) if "." in key or "e" in key else int(key)), line
+
+    def _merge(self, runs: list[Iterable[tuple[int | float, str]]]) -> Iterator[tuple[int | float, str]]:
+        """Сливает отсортированные части в один отсортированный поток"""
+
+        return heapq.merge(*runs, key=lambda entry: entry[0], reverse=self.reverse)
+
+    def sort(self, vacancies: Iterable[dict]) -> Iterator[dict]:
+        """
+        Возвращает поток словарей вакансий, отсортированных по ключу.
+        Вакансии с одинаковым ключом идут в исходном порядке
+
+        :param vacancies: коллекция или итератор словарей вакансий
+        """
+
+        files = []
+        run = []
+        size = 0
+
+        try:
+            for vacancy in vacancies:
+                line = json.dumps(vacancy, ensure_ascii=False)
+                run.append((self.key(vacancy), line))
+                size += sys.getsizeof(line) + self._ENTRY_OVERHEAD
+
+                if size >= self.memory_budget:
+                    files.append(self._spill(self._sort_run(run)))
+                    run = []
+                    size = 0
+
+            if not files:
+                self.runs_count = 1 if run else 0
+                for _, line in self._sort_run(run):
+                    yield json.loads(line)
+                return
+
+            if run:
+                files.append(self._spill(self._sort_run(run)))
+                run = []
+
+            self.runs_count = len(files)
+
+            # если частей слишком много, сливаем их в несколько проходов
+            # соседние части сливаются по порядку, чтобы сохранить исходный порядок одинаковых ключей
+            while len(files) > self._MAX_MERGE_FILES:
+                merged = []
+                for start in range(0, len(files), self._MAX_MERGE_FILES):
+                    group = files[start:start + self._MAX_MERGE_FILES]
+                    merged.append(self._spill(self._merge([self._read_run(file) for file in group])))
+                    for file in group:
+                        file.close()
+                files = merged
+
+            for _, line in self._merge([self._read_run(file) for file in files]):
+                yield json.loads(line)
+
+        finally:
+            for file in files:
+                file.close()
+
+
+def iter_sorted_vacancies(path_file: tuple, reverse: bool = False,
+                          memory_budget: int = 64 * 1024 * 1024) -> Iterator[Vacancy]:
+    """
+    Возвращает поток объектов вакансий из файла, отсортированных по минимальной зарплате в рублях.
+    Подходит для постраничного вывода: объекты создаются по мере чтения
+    """
+
+    sorter = ExternalSorter(reverse=reverse, memory_budget=memory_budget)
+
+    for vacancy_dict in sorter.sort(JSONSaver(path_file).iter_vacancies()):
+        vacancy = create_vacancy(vacancy_dict)
+        if vacancy is not None:
+            yield vacancy
+
+
+def sort_archive(path_source: tuple, path_result: tuple, reverse: bool = False,
+                 memory_budget: int = 64 * 1024 * 1024) -> int:
+    """
+    Сортирует вакансии из файла по минимальной зарплате в рублях и записывает в другой файл,
+    не загружая файлы в память целиком
+
+    :param path_source: путь к исходному файлу
+    :param path_result: путь к файлу с результатом, должен отличаться от исходного
+    :return: количество записанных вакансий
+    """
+
+    sorter = ExternalSorter(reverse=reverse, memory_budget=memory_budget)
+
+    return JSONSaver(path_result).write_stream(sorter.sort(JSONSaver(path_source).iter_vacancies()))
+
+
+def main() -> None:
+    """Сортирует файл с вакансиями по минимальной зарплате"""
+
+    parser = argparse.ArgumentParser(description="Сортировка большого файла с вакансиями по зарплате")
+    parser.add_argument("source", help="исходный файл с вакансиями")
+    parser.add_argument("result", help="файл для записи отсортированных вакансий")
+    parser.add_argument("--reverse", action="store_true", help="сортировка по убыванию")
+    parser.add_argument("--budget-mb", type=float, default=64, help="бюджет памяти на сортировку, мегабайты")
+    arguments = parser.parse_args()
+
+    count = sort_archive((arguments.source,), (arguments.result,), arguments.reverse,
+                         int(arguments.budget_mb * 1024 * 1024))
+    print(f"Отсортировано вакансий: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import atexit
+import gc
+import os
+import sys
+import time
+from contextlib import nullcontext
+from typing import Iterable
+
+from sources.constants import PATH_DIR_MEMORY
+from vacancy.vacancy_factory import VACANCY_CLASSES, get_source
+
+# Профилирование памяти по этапам работы программы (поиск, создание вакансий, фильтрация, сортировка, запись).
+# Включается переменной окружения JOB_PARSER_MEMORY: значение - путь к файлу отчета,
+# либо '1' для файла в папке PATH_DIR_MEMORY. Для каждого этапа отчет содержит пиковый расход памяти,
+# прирост памяти и места в коде, выделившие больше всего памяти, а также размер одного объекта вакансии
+# каждого класса. Отчет записывается при завершении программы.
+# Модуль tracemalloc загружается только при включении профилирования
+
+# переменная окружения, включающая профилирование
+MEMORY_ENV = "JOB_PARSER_MEMORY"
+
+# абсолютный путь к корневой папке проекта
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# пустой этап, когда профилирование выключено
+_NULL_STAGE = nullcontext()
+
+# файлы, выделения памяти в которых не попадают в отчет
+_IGNORED_FILES = ("*/tracemalloc.py", "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+class _Stage:
+    """
+    Этап работы программы: при входе и выходе делаются снимки tracemalloc.
+    Пиковый расход памяти этапа учитывает вложенные этапы
+    """
+
+    def __init__(self, profiler: "MemoryProfiler", name: str, items: int | None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param profiler: профилировщик, в отчет которого записывается этап
+        :param name: название этапа
+        :param items: количество обрабатываемых на этапе вакансий
+        """
+
+        self.profiler = profiler
+        self.name = name
+        self.items = items
+        self.peak = 0
+        self.start = 0
+        self.snapshot = None
+
+    def __enter__(self) -> "_Stage":
+        """Запоминает расход памяти перед этапом и сбрасывает пиковое значение"""
+
+        import tracemalloc
+
+        stack = self.profiler.stack
+        if stack:
+            # пик родительского этапа до начала вложенного
+            stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+        stack.append(self)
+
+        self.snapshot = self.profiler.take_snapshot()
+        self.start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Записывает показатели этапа в отчет"""
+
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+
+        stack = self.profiler.stack
+        stack.pop()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, self.peak)
+
+        self.profiler.add_stage(self, current, self.profiler.take_snapshot())
+        tracemalloc.reset_peak()
+
+
+class MemoryProfiler:
+    """Отчет о расходе памяти по этапам работы программы"""
+
+    def __init__(self, path_file: str, top: int = 10) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: путь к файлу отчета
+        :param top: количество мест в коде с наибольшим выделением памяти для каждого этапа
+        """
+
+        self.path_file = path_file
+        self.top = top
+        self.stack = []
+        self.stages = []
+        self.vacancy_sizes = {}  # класс вакансии -> размер одного объекта
+
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_file!r}, stages={len(self.stages)})"
+
+    @staticmethod
+    def take_snapshot() -> "tracemalloc.Snapshot":
+        """Делает снимок выделенной памяти без учета служебных выделений"""
+
+        import tracemalloc
+
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, file_name) for file_name in _IGNORED_FILES])
+
+    def add_stage(self, stage: _Stage, current: int, snapshot: "tracemalloc.Snapshot") -> None:
+        """Записывает показатели завершенного этапа"""
+
+        allocations = [{"place": f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}",
+                        "size_diff": statistic.size_diff, "count_diff": statistic.count_diff}
+                       for statistic in snapshot.compare_to(stage.snapshot, "lineno")[:self.top]
+                       if statistic.size_diff > 0]
+
+        result = {"name": stage.name, "peak": stage.peak, "peak_diff": stage.peak - stage.start,
+                  "size_diff": current - stage.start, "top_allocations": allocations}
+        if stage.items:
+            result["items"] = stage.items
+            result["peak_per_item"] = round((stage.peak - stage.start) / stage.items)
+
+        self.stages.append(result)
+
+    def measure_vacancies(self, vacancies: Iterable[dict], sample: int = 1000) -> dict:
+        """
+        Измеряет размер одного объекта вакансии каждого класса: сразу после создания
+        и после формирования краткой информации. Словарь вакансии (full_info) не учитывается,
+        так как объект только ссылается на него
+
+        :param vacancies: словари вакансий
+        :param sample: максимальное количество объектов каждого класса для измерения
+        """
+
+        import tracemalloc
+
+        # класс вакансии определяется по сайту без создания объекта; перебор заканчивается,
+        # как только для каждого класса набрано sample словарей
+        groups = {}
+        full = 0
+        for vacancy_dict in vacancies:
+            vacancy_class = VACANCY_CLASSES.get(get_source(vacancy_dict))
+            if vacancy_class is None:
+                continue
+
+            group = groups.setdefault(vacancy_class, [])
+            if len(group) < sample:
+                group.append(vacancy_dict)
+                if len(group) == sample:
+                    full += 1
+                    if full == len(VACANCY_CLASSES):
+                        break
+
+        for vacancy_class, vacancy_dicts in groups.items():
+            gc.collect()
+            start = tracemalloc.get_traced_memory()[0]
+
+            objects = [vacancy_class(vacancy_dict) for vacancy_dict in vacancy_dicts]
+            created = tracemalloc.get_traced_memory()[0]
+
+            for vacancy in objects:
+                vacancy.get_short_info()
+            with_short_info = tracemalloc.get_traced_memory()[0]
+
+            # сам список объектов в размер вакансий не входит
+            overhead = sys.getsizeof(objects)
+            self.vacancy_sizes[vacancy_class.__name__] = {
+                "count": len(objects),
+                "bytes_per_object": round((created - start - overhead) / len(objects)),
+                "bytes_with_short_info": round((with_short_info - start - overhead) / len(objects))}
+            del objects
+
+        return self.vacancy_sizes
+
+    def get_report(self) -> dict:
+        """Возвращает отчет о расходе памяти"""
+
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        # пиковое значение сбрасывается после каждого этапа, пики этапов учитываются отдельно
+        peak = max([peak] + [result["peak"] for result in self.stages])
+
+        return {"current": current, "peak": peak, "stages": self.stages, "vacancy_sizes": self.vacancy_sizes}
+
+    def save(self) -> str:
+        """Записывает отчет в файл и возвращает путь к нему"""
+
+        import json
+
+        os.makedirs(os.path.dirname(self.path_file) or ".", exist_ok=True)
+        with open(self.path_file, "w", encoding="utf-8") as file:
+            json.dump(self.get_report(), file, ensure_ascii=False, indent=4)
+
+        return self.path_file
+
+
+# профилировщик, None - профилирование выключено
+_profiler = None
+
+
+def get_default_path() -> str:
+    """Возвращает путь к новому файлу отчета в папке PATH_DIR_MEMORY"""
+
+    name = f"memory-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+
+    return os.path.join(ROOT_DIR, *PATH_DIR_MEMORY, name)
+
+
+def enable(path_file: str | None = None) -> MemoryProfiler:
+    """
+    Включает профилирование памяти, отчет записывается при завершении программы
+
+    :param path_file: путь к файлу отчета, по умолчанию новый файл в папке PATH_DIR_MEMORY
+    """
+
+    global _profiler
+
+    if _profiler is None:
+        _profiler = MemoryProfiler(path_file or get_default_path())
+        atexit.register(save)
+
+    return _profiler
+
+
+def is_enabled() -> bool:
+    """Включено ли профилирование памяти"""
+
+    return _profiler is not None
+
+
+def save() -> str | None:
+    """Записывает отчет в файл, возвращает путь к нему"""
+
+    if _profiler is None or not _profiler.stages:
+        return None
+
+    try:
+        path_file = _profiler.save()
+    except OSError as error:
+        print(f"Не удалось записать отчет о расходе памяти: {error}")
+        return None
+
+    print(f"\nОтчет о расходе памяти записан в файл {path_file}")
+
+    return path_file
+
+
+def stage(name: str, items: int | None = None):
+    """
+    Контекстный менеджер этапа работы программы
+
+    :param name: название этапа
+    :param items: количество обрабатываемых на этапе вакансий, для расчета памяти на одну вакансию
+    """
+
+    if _profiler is None:
+        return _NULL_STAGE
+
+    return _Stage(_profiler, name, items)
+
+
+def measure_vacancies(vacancies: Iterable[dict]) -> None:
+    """Измеряет размер объектов вакансий, если профилирование включено"""
+
+    if _profiler is not None:
+        _profiler.measure_vacancies(vacancies)
+
+
+if os.environ.get(MEMORY_ENV):
+    enable(None if os.environ[MEMORY_ENV] == "1" else os.environ[MEMORY_ENV])
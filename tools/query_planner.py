@@ -0,0 +1,360 @@
+import argparse
+import math
+
+from filter.filter_abc import Filter
+from filter.filter_hh import FilterHH
+from filter.filter_sj import FilterSJ
+from request_api.request_api_hh import HeadHunterAPI
+from request_api.request_api_sj import SuperJobAPI
+from tools import tracing
+from tools.utils import i_input
+from vacancy.vacancy_factory import create_vacancy
+
+# Планировщик запросов по единому фильтру поиска для обоих сайтов.
+# Параметр фильтра передается сайту, только если сайт отбирает по нему вакансии не строже
+# локальной проверки: тогда подходящие вакансии не теряются, а лишние не загружаются.
+# Город, опыт работы и занятость сайты проверяют точно, и локально они не проверяются.
+# Зарплату сайты понимают иначе (HeadHunter ищет вилку, в которую входит сумма), поэтому
+# сайту передается только отбор вакансий с указанной зарплатой, а минимальная зарплата
+# в рублях проверяется локально. Количество страниц оценивается по количеству найденных
+# сайтом вакансий и доле подходящих среди уже загруженных
+
+# параметры единого фильтра: название -> описание
+SPEC_PARAMETERS = {
+    "text": "ключевые слова",
+    "area": "город или регион (название)",
+    "experience": "опыт работы: none, 1-3, 3-6, 6+",
+    "employment": "занятость: full, part, project, probation",
+    "salary": "минимальная зарплата в рублях",
+}
+
+# значения опыта работы единого фильтра -> значения на сайтах
+EXPERIENCE = {
+    "none": {"hh": "noExperience", "sj": 1},
+    "1-3": {"hh": "between1And3", "sj": 2},
+    "3-6": {"hh": "between3And6", "sj": 3},
+    "6+": {"hh": "moreThan6", "sj": 4},
+}
+
+# значения занятости единого фильтра -> значения на сайтах.
+# Проектной работы и стажировки на SuperJob нет, такие вакансии там не ищутся
+EMPLOYMENT = {
+    "full": {"hh": "full", "sj": 6},
+    "part": {"hh": "part", "sj": 10},
+    "project": {"hh": "project"},
+    "probation": {"hh": "probation"},
+}
+
+# настройки сайтов: классы фильтра и запроса, названия параметров запроса,
+# параметр отбора вакансий с указанной зарплатой, поле количества найденных вакансий
+# и максимальное количество вакансий, которое сайт отдает по одному поиску
+SOURCES = {
+    "hh": {"filter": FilterHH, "api": HeadHunterAPI, "text": "text", "area": "area", "experience": "experience",
+           "employment": "employment", "page_size": "per_page", "with_salary": {"only_with_salary": True},
+           "total": "found", "max_depth": 2000},
+    "sj": {"filter": FilterSJ, "api": SuperJobAPI, "text": "keyword", "area": "town", "experience": "experience",
+           "employment": "type_of_work", "page_size": "count", "with_salary": {"no_agreement": 1},
+           "total": "total", "max_depth": 500},
+}
+
+# максимальный размер страницы на обоих сайтах
+MAX_PAGE_SIZE = 100
+
+
+def get_page_size(quantity: int) -> int:
+    """
+    Возвращает размер страницы, при котором quantity вакансий загружаются
+    за наименьшее количество запросов и с наименьшим количеством лишних вакансий
+    """
+
+    pages = max(math.ceil(quantity / MAX_PAGE_SIZE), 1)
+
+    return max(min(math.ceil(quantity / pages), MAX_PAGE_SIZE), 1)
+
+
+def estimate_pages(quantity: int, page_size: int, total: int, pass_rate: float, max_depth: int) -> int:
+    """
+    Оценивает, сколько всего страниц нужно загрузить, чтобы получить quantity подходящих вакансий
+
+    :param quantity: желаемое количество подходящих вакансий
+    :param page_size: размер страницы
+    :param total: количество вакансий, найденных сайтом
+    :param pass_rate: ожидаемая доля вакансий, проходящих локальную проверку
+    :param max_depth: максимальное количество вакансий, которое сайт отдает по одному поиску
+    """
+
+    available = min(total, max_depth)
+    needed = quantity / pass_rate if pass_rate > 0 else available
+
+    return math.ceil(min(needed, available) / page_size)
+
+
+class QueryPlan:
+    """
+    План запроса к одному сайту: фильтр с параметрами для сайта,
+    параметры для локальной проверки и размер страницы
+    """
+
+    def __init__(self, source: str, request_filter: Filter, pushed: list[str], local: dict,
+                 page_size: int, reason: str | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param source: сайт, 'hh' или 'sj'
+        :param request_filter: фильтр запроса с параметрами, переданными сайту
+        :param pushed: параметры единого фильтра, которые проверяет сайт
+        :param local: параметры единого фильтра, которые проверяются после загрузки
+        :param page_size: размер страницы
+        :param reason: почему на сайте не может быть подходящих вакансий, None - запрос имеет смысл
+        """
+
+        self.source = source
+        self.request_filter = request_filter
+        self.pushed = pushed
+        self.local = local
+        self.page_size = page_size
+        self.reason = reason
+
+        # статистика выполнения
+        self.requests = 0
+        self.bytes = 0
+        self.fetched = 0
+        self.useful = 0
+        self.total = None
+        self.estimated_pages = None
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.source!r}, pushed={self.pushed!r}, local={self.local!r})"
+
+    def explain(self) -> str:
+        """Возвращает описание плана для пользователя"""
+
+        if self.reason is not None:
+            return f"{self.source}: запрос не отправляется - {self.reason}"
+
+        pushed = ", ".join(self.pushed) or "нет"
+        local = ", ".join(self.local) or "нет"
+
+        return f"{self.source}: проверяет сайт - {pushed}; проверяется после загрузки - {local}; " \
+               f"размер страницы - {self.page_size}"
+
+    def compare(self, vacancy_dict: dict) -> bool:
+        """Проверяет загруженную вакансию по параметрам, которые сайт не проверил"""
+
+        salary = self.local.get("salary")
+        if salary is None:
+            return True
+
+        vacancy = create_vacancy(vacancy_dict)
+
+        return vacancy is not None and vacancy.get_min_salary() >= salary
+
+    def get_pass_rate(self) -> float:
+        """Ожидаемая доля загруженных вакансий, проходящих локальную проверку"""
+
+        if not self.local:
+            return 1.0
+
+        # сглаживание: пока ничего не загружено, считается, что подходят все вакансии
+        return (self.useful + 1) / (self.fetched + 1)
+
+
+class QueryPlanner:
+    """
+    Планировщик запросов по единому фильтру поиска.
+    Для каждого сайта составляет план: что проверяет сайт, что проверяется локально
+    и сколько страниц загрузить, и выполняет его
+    """
+
+    def __init__(self, spec: dict) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param spec: единый фильтр поиска, ключи - из SPEC_PARAMETERS, None - параметр не задан
+        """
+
+        unknown = set(spec) - set(SPEC_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры фильтра: {', '.join(sorted(unknown))}")
+
+        self.spec = {key: value for key, value in spec.items() if value is not None and value != ""}
+
+        if self.spec.get("experience", "none") not in EXPERIENCE:
+            raise ValueError(f"Неизвестный опыт работы: {self.spec['experience']}")
+        if self.spec.get("employment", "full") not in EMPLOYMENT:
+            raise ValueError(f"Неизвестная занятость: {self.spec['employment']}")
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.spec!r})"
+
+    def plan(self, source: str, quantity: int, request_filter: Filter | None = None) -> QueryPlan:
+        """
+        Составляет план запроса к сайту
+
+        :param source: сайт, 'hh' или 'sj'
+        :param quantity: желаемое количество подходящих вакансий
+        :param request_filter: фильтр сайта, например с уже загруженным справочником регионов
+        """
+
+        settings = SOURCES[source]
+        request_filter = request_filter or settings["filter"]()
+        parameters = request_filter.parameters
+        pushed, local, reason = [], {}, None
+
+        for key, value in self.spec.items():
+            if key == "text":
+                parameters[settings["text"]] = value
+
+            elif key == "area":
+                area_id = request_filter.resolve_area(value)
+                if area_id is None:
+                    reason = f"не удалось однозначно распознать город '{value}'"
+                parameters[settings["area"]] = area_id
+
+            elif key == "experience":
+                parameters[settings["experience"]] = EXPERIENCE[value][source]
+
+            elif key == "employment":
+                if source not in EMPLOYMENT[value]:
+                    reason = f"на сайте нет занятости '{value}'"
+                parameters[settings["employment"]] = EMPLOYMENT[value].get(source)
+
+            elif key == "salary":
+                # вакансии без зарплаты не пройдут проверку минимальной зарплаты, их можно не загружать
+                parameters.update(settings["with_salary"])
+                local[key] = value
+                continue
+
+            pushed.append(key)
+
+        page_size = MAX_PAGE_SIZE if local else get_page_size(quantity)
+        parameters[settings["page_size"]] = page_size
+        parameters["page"] = 0
+
+        return QueryPlan(source, request_filter, pushed, local, page_size, reason)
+
+    @staticmethod
+    def execute(plan: QueryPlan, quantity: int) -> list[dict]:
+        """
+        Загружает страницы по плану, пока не наберется quantity подходящих вакансий
+        или не закончатся найденные сайтом вакансии
+
+        :return: подходящие вакансии
+        """
+
+        if plan.reason is not None:
+            return []
+
+        settings = SOURCES[plan.source]
+        api = settings["api"](plan.request_filter, quantity)
+        vacancies = []
+        page = 0
+
+        while len(vacancies) < quantity and (plan.estimated_pages is None or page < plan.estimated_pages):
+            plan.request_filter.parameters["page"] = page
+
+            with tracing.span("planner.page", source=plan.source, page=page):
+                with api.get_response() as response:
+                    plan.requests += 1
+                    if response.status_code != 200:
+                        print(f"Ошибка при запросе вакансий {plan.source}: статус {response.status_code}")
+                        break
+                    plan.bytes += len(response.content)
+                    info = response.json()
+
+            items = api.get_items(info)
+            plan.fetched += len(items)
+            plan.total = info.get(settings["total"], 0)
+
+            for vacancy in items:
+                if plan.compare(vacancy):
+                    vacancies.append(vacancy)
+            plan.useful = len(vacancies)
+
+            if not items:
+                break
+
+            # оценка уточняется после каждой страницы по доле подходящих вакансий
+            pages_left = estimate_pages(quantity - plan.useful, plan.page_size,
+                                        plan.total - plan.fetched, plan.get_pass_rate(),
+                                        settings["max_depth"] - plan.fetched)
+            page += 1
+            plan.estimated_pages = page + pages_left
+
+        return vacancies[:quantity]
+
+    def search(self, quantity: int, sources: tuple = ("hh", "sj")) -> list[dict]:
+        """
+        Ищет вакансии на сайтах по единому фильтру и сообщает, сколько загружено
+
+        :param quantity: желаемое количество подходящих вакансий с каждого сайта
+        :param sources: сайты для поиска
+        """
+
+        results = []
+
+        for source in sources:
+            plan = self.plan(source, quantity)
+            print(f"\n{plan.explain()}")
+            if plan.reason is not None:
+                continue
+
+            vacancies = self.execute(plan, quantity)
+            results.extend(vacancies)
+
+            print(f"Найдено {len(vacancies)} вакансий, всего на сайте {plan.total or 0}. "
+                  f"Запросов: {plan.requests}, загружено вакансий: {plan.fetched}, {plan.bytes // 1024} КБ.")
+
+        return results
+
+
+def ask_spec() -> dict:
+    """Запрашивает у пользователя параметры единого фильтра поиска и возвращает их"""
+
+    spec = {"text": i_input("\nВведите слово или фразу для ключевого запроса:\n"),
+            "area": i_input("\nВведите город или регион, либо нажмите Enter для пропуска:\n")}
+
+    for key, values in (("experience", EXPERIENCE), ("employment", EMPLOYMENT)):
+        answer = i_input(f"\nВведите {SPEC_PARAMETERS[key]}, либо нажмите Enter для пропуска:\n")
+        while answer != "" and answer not in values:
+            answer = i_input(f"Допустимые значения: {', '.join(values)}. Попробуйте еще раз:\n")
+        spec[key] = answer
+
+    salary = i_input("\nВведите минимальную зарплату в рублях (целое положительное число),\n"
+                     "либо нажмите Enter для пропуска:\n")
+    while salary != "" and not salary.isdigit():
+        salary = i_input("Введите целое положительное число без каких-либо знаков.\n"
+                         "Попробуйте еще раз:\n")
+    spec["salary"] = int(salary) if salary else None
+
+    return spec
+
+
+def main() -> None:
+    """Выводит план запросов по единому фильтру и, если нужно, выполняет его"""
+
+    parser = argparse.ArgumentParser(description="Планировщик запросов по единому фильтру поиска вакансий")
+    for key, description in SPEC_PARAMETERS.items():
+        parser.add_argument(f"--{key}", type=int if key == "salary" else str, help=description)
+    parser.add_argument("--quantity", type=int, default=10, help="желаемое количество вакансий с каждого сайта")
+    parser.add_argument("--sources", nargs="+", default=["hh", "sj"], choices=list(SOURCES), help="сайты")
+    parser.add_argument("--explain", action="store_true", help="только вывести план, не отправляя запросы")
+    arguments = parser.parse_args()
+
+    planner = QueryPlanner({key: getattr(arguments, key) for key in SPEC_PARAMETERS})
+
+    if arguments.explain:
+        for source in arguments.sources:
+            print(planner.plan(source, arguments.quantity).explain())
+        return
+
+    vacancies = planner.search(arguments.quantity, tuple(arguments.sources))
+    print(f"\nВсего найдено {len(vacancies)} вакансий.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import io
+import sys
+from typing import Iterable, TextIO
+
+from tools.utils import i_input
+from vacancy.vacancy_abc import Vacancy
+
+
+class PagedRenderer:
+    """
+    Постраничный вывод вакансий на экран.
+    Вакансии берутся из переданной коллекции по мере необходимости,
+    форматируется только отображаемая страница, которая выводится одной записью
+    """
+
+    # команды для перехода между страницами
+    _NEXT = ("", "n")
+    _PREVIOUS = ("p",)
+    _QUIT = ("q",)
+
+    def __init__(self, vacancies: Iterable[Vacancy], page_size: int = 10, stream: TextIO | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param vacancies: коллекция или итератор объектов вакансий
+        :param page_size: количество вакансий на одной странице
+        :param stream: поток для вывода, по умолчанию стандартный вывод
+        """
+
+        self._source = iter(vacancies)
+        self._seen = []  # уже полученные из коллекции вакансии
+        self._exhausted = False
+
+        self.page_size = max(page_size, 1)
+        self.stream = stream or sys.stdout
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(page_size={self.page_size}, seen={len(self._seen)})"
+
+    def _fetch_until(self, count: int) -> None:
+        """Получает из коллекции вакансии, пока их не станет count или коллекция не закончится"""
+
+        while not self._exhausted and len(self._seen) < count:
+            try:
+                self._seen.append(next(self._source))
+            except StopIteration:
+                self._exhausted = True
+
+    def get_pages_count(self) -> int | None:
+        """Возвращает количество страниц, если коллекция уже прочитана до конца, иначе None"""
+
+        if not self._exhausted:
+            return None
+
+        return max((len(self._seen) + self.page_size - 1) // self.page_size, 1)
+
+    def get_page(self, number: int) -> list[Vacancy]:
+        """Возвращает вакансии страницы с переданным номером (нумерация с 1)"""
+
+        start = (number - 1) * self.page_size
+        # на одну вакансию больше, чтобы знать, есть ли следующая страница
+        self._fetch_until(start + self.page_size + 1)
+
+        return self._seen[start:start + self.page_size]
+
+    def has_page(self, number: int) -> bool:
+        """Проверяет, существует ли страница с переданным номером"""
+
+        return number == 1 or (number > 1 and bool(self.get_page(number)))
+
+    @staticmethod
+    def format_vacancy(vacancy: Vacancy) -> str:
+        """Возвращает краткую информацию о вакансии в читаемом виде"""
+
+        return "\n".join([f"{key}: {value}" for key, value in vacancy.get_short_info().items()])
+
+    def format_page(self, number: int) -> str:
+        """Форматирует страницу с переданным номером"""
+
+        buffer = io.StringIO()
+
+        for vacancy in self.get_page(number):
+            buffer.write("\n")
+            buffer.write(self.format_vacancy(vacancy))
+            buffer.write("\n")
+
+        pages_count = self.get_pages_count()
+        buffer.write(f"\nСтраница {number}" + (f" из {pages_count}" if pages_count else "") + "\n")
+
+        return buffer.getvalue()
+
+    def render(self, number: int) -> None:
+        """Выводит страницу с переданным номером одной записью в поток"""
+
+        self.stream.write(self.format_page(number))
+        self.stream.flush()
+
+    def interact(self) -> None:
+        """Выводит вакансии постранично, переключая страницы по командам пользователя"""
+
+        number = 1
+        self.render(number)
+
+        while self.has_page(number + 1) or number > 1:
+            command = i_input("Enter или 'n' - следующая страница, 'p' - предыдущая, "
+                              "номер - перейти к странице, 'q' - закончить просмотр:\n").strip().lower()
+
+            if command in self._QUIT:
+                break
+            elif command in self._NEXT:
+                if not self.has_page(number + 1):
+                    break
+                number += 1
+            elif command in self._PREVIOUS:
+                number = max(number - 1, 1)
+            elif command.isdigit() and int(command) >= 1:
+                number = int(command)
+                if not self.has_page(number):
+                    number = self.get_pages_count()
+            else:
+                continue
+
+            self.render(number)
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import time
+from typing import Iterable, NamedTuple
+
+from filter.filter_abc import Filter
+from sources.constants import PATH_DIR_SNAPSHOTS
+
+# абсолютный путь к корневой папке проекта
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# параметры фильтра, которые меняются во время поиска и не определяют сам поиск
+_VOLATILE_PARAMETERS = ("page",)
+
+
+def get_content_hash(vacancy_dict: dict) -> str:
+    """Возвращает хеш содержимого вакансии для определения изменений"""
+
+    content = json.dumps(vacancy_dict, sort_keys=True, ensure_ascii=False)
+
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
+
+def get_search_fingerprint(request_filter: Filter, quantity: int | None = None) -> str:
+    """Возвращает отпечаток поиска: класс фильтра, параметры запроса и количество вакансий"""
+
+    parameters = {key: value for key, value in request_filter.get_all_parameters().items()
+                  if key not in _VOLATILE_PARAMETERS}
+    content = json.dumps([request_filter.__class__.__name__, parameters, quantity],
+                         sort_keys=True, ensure_ascii=False, default=str)
+
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class SnapshotDiff(NamedTuple):
+    """Разница между двумя снимками результатов поиска: id добавленных, удаленных и изменившихся вакансий"""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    def __bool__(self) -> bool:
+        """Есть ли изменения"""
+
+        return bool(self.added or self.removed or self.changed)
+
+    def __str__(self) -> str:
+        """Краткое описание изменений"""
+
+        return f"новых: {len(self.added)}, исчезло: {len(self.removed)}, изменилось: {len(self.changed)}"
+
+
+def get_entries(vacancies: Iterable[dict]) -> list[tuple[str, str]]:
+    """Возвращает отсортированные по id пары (id вакансии, хеш содержимого)"""
+
+    entries = {str(vacancy_dict.get("id")): get_content_hash(vacancy_dict) for vacancy_dict in vacancies}
+
+    return sorted(entries.items())
+
+
+def diff_entries(old: list[tuple[str, str]], new: list[tuple[str, str]]) -> SnapshotDiff:
+    """
+    Сравнивает два отсортированных по id списка пар (id, хеш) за один совместный проход
+
+    :param old: предыдущий снимок
+    :param new: текущий снимок
+    """
+
+    added, removed, changed = [], [], []
+    i = j = 0
+
+    while i < len(old) and j < len(new):
+        old_id, old_hash = old[i]
+        new_id, new_hash = new[j]
+
+        if old_id == new_id:
+            if old_hash != new_hash:
+                changed.append(new_id)
+            i += 1
+            j += 1
+        elif old_id < new_id:
+            removed.append(old_id)
+            i += 1
+        else:
+            added.append(new_id)
+            j += 1
+
+    removed.extend(vacancy_id for vacancy_id, _ in old[i:])
+    added.extend(vacancy_id for vacancy_id, _ in new[j:])
+
+    return SnapshotDiff(added, removed, changed)
+
+
+class SnapshotStore:
+    """
+    Снимки результатов поисков: для каждого поиска (отпечатка параметров фильтра)
+    хранятся отсортированные id найденных вакансий и хеши их содержимого.
+    При следующем поиске с теми же параметрами вычисляется только разница
+    """
+
+    def __init__(self, path_dir: tuple = PATH_DIR_SNAPSHOTS) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_dir: кортеж строк для построения пути к папке со снимками
+        """
+
+        self.path_dir = os.path.join(ROOT_DIR, *path_dir)
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_dir!r})"
+
+    def get_path(self, fingerprint: str) -> str:
+        """Возвращает путь к файлу снимка поиска"""
+
+        return os.path.join(self.path_dir, f"{fingerprint}.json")
+
+    def load(self, fingerprint: str) -> list[tuple[str, str]] | None:
+        """Загружает снимок поиска, None если поиск выполняется впервые"""
+
+        try:
+            with open(self.get_path(fingerprint), "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            return None
+
+        return list(zip(snapshot["ids"], snapshot["hashes"]))
+
+    def save(self, fingerprint: str, entries: list[tuple[str, str]], description: dict | None = None) -> None:
+        """
+        Записывает снимок поиска
+
+        :param fingerprint: отпечаток поиска
+        :param entries: отсортированные пары (id вакансии, хеш содержимого)
+        :param description: параметры поиска, записываются для наглядности
+        """
+
+        os.makedirs(self.path_dir, exist_ok=True)
+        snapshot = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "search": description,
+                    "ids": [vacancy_id for vacancy_id, _ in entries],
+                    "hashes": [content_hash for _, content_hash in entries]}
+
+        temporary_path = self.get_path(fingerprint) + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, ensure_ascii=False, default=str)
+
+        os.replace(temporary_path, self.get_path(fingerprint))
+
+    def update(self, request_filter: Filter, vacancies: Iterable[dict],
+               quantity: int | None = None) -> SnapshotDiff | None:
+        """
+        Сравнивает результаты поиска с предыдущим снимком и сохраняет новый снимок
+
+        :param request_filter: фильтр, с которым выполнен поиск
+        :param vacancies: найденные вакансии
+        :param quantity: запрошенное количество вакансий
+        :return: разница с предыдущим снимком, None если поиск выполняется впервые
+        """
+
+        fingerprint = get_search_fingerprint(request_filter, quantity)
+        previous = self.load(fingerprint)
+        entries = get_entries(vacancies)
+
+        self.save(fingerprint, entries, {"filter": request_filter.__class__.__name__,
+                                         "parameters": request_filter.get_request_parameters(),
+                                         "quantity": quantity})
+
+        return diff_entries(previous, entries) if previous is not None else None
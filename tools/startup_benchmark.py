@@ -0,0 +1,65 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# модули, которые не должны загружаться до первого вопроса пользователю
+HEAVY_MODULES = ("requests", "urllib3", "jsonpath_ng", "ply", "concurrent.futures.process")
+
+# код, выполняемый в отдельном процессе: время импорта главного модуля и список загруженных тяжелых модулей
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def measure_startup(runs: int = 10) -> tuple[list[float], list[str]]:
+    """
+    Измеряет время импорта main.py (время до первого вопроса пользователю)
+    в отдельных процессах интерпретатора
+
+    :param runs: количество запусков
+    :return: список времен в секундах и список загруженных тяжелых модулей
+    """
+
+    root_dir = os.path.dirname(os.path.dirname(__file__))
+    code = _PROBE.format(heavy=HEAVY_MODULES)
+
+    times = []
+    heavy = []
+
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], cwd=root_dir,
+                                capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+        heavy = output[1].split(",") if len(output) > 1 else []
+
+    return times, heavy
+
+
+def main() -> None:
+    """Выводит результаты измерения и завершает работу с ошибкой при превышении порога"""
+
+    parser = argparse.ArgumentParser(description="Измерение времени запуска программы")
+    parser.add_argument("--runs", type=int, default=10, help="количество запусков")
+    parser.add_argument("--max-ms", type=float, default=None, help="допустимое медианное время импорта, мс")
+    arguments = parser.parse_args()
+
+    times, heavy = measure_startup(arguments.runs)
+    median_ms = statistics.median(times) * 1000
+
+    print(f"Импорт main: медиана {median_ms:.1f} мс, минимум {min(times) * 1000:.1f} мс "
+          f"({arguments.runs} запусков)")
+    print(f"Загруженные тяжелые модули: {', '.join(heavy) if heavy else 'нет'}")
+
+    if heavy or (arguments.max_ms is not None and median_ms > arguments.max_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
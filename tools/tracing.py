@@ -0,0 +1,230 @@
+import atexit
+import functools
+import itertools
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable
+
+from sources.constants import PATH_DIR_TRACES
+
+# Трассировка этапов поиска во время одной сессии программы.
+# Включается переменной окружения JOB_PARSER_TRACE: значение - путь к файлу трассировки,
+# либо '1' для файла в папке PATH_DIR_TRACES. Трассировка записывается при завершении программы
+# в формате Chrome Trace Event, файл открывается в chrome://tracing или https://ui.perfetto.dev.
+# Когда трассировка выключена, span возвращает пустой контекстный менеджер и почти ничего не стоит
+
+# переменная окружения, включающая трассировку
+TRACE_ENV = "JOB_PARSER_TRACE"
+
+# абсолютный путь к корневой папке проекта
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# пустой участок, когда трассировка выключена
+_NULL_SPAN = nullcontext()
+
+# идентификаторы участков
+_span_ids = itertools.count(1)
+
+# стек открытых участков каждого потока, вершина стека - родитель следующего участка
+_local = threading.local()
+
+
+class Tracer:
+    """Накопитель событий трассировки: завершенные участки и названия потоков"""
+
+    def __init__(self, path_file: str) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: путь к файлу трассировки
+        """
+
+        self.path_file = path_file
+        self.events = []
+        self.threads = {}  # id потока -> название потока
+        self.start = time.perf_counter()
+        self.pid = os.getpid()
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.path_file!r}, events={len(self.events)})"
+
+    def get_timestamp(self) -> float:
+        """Время от начала трассировки в микросекундах"""
+
+        return (time.perf_counter() - self.start) * 1_000_000
+
+    def add_span(self, name: str, start: float, end: float, args: dict) -> None:
+        """Добавляет завершенный участок, начало и конец - в микросекундах от начала трассировки"""
+
+        thread = threading.current_thread()
+        # добавление в список потокобезопасно, отдельная блокировка не нужна
+        self.threads[thread.ident] = thread.name
+        self.events.append({"name": name, "cat": name.split(".")[0], "ph": "X", "ts": round(start, 1),
+                            "dur": round(end - start, 1), "pid": self.pid, "tid": thread.ident, "args": args})
+
+    def save(self) -> str:
+        """Записывает трассировку в файл и возвращает путь к нему"""
+
+        import json
+
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": ident, "args": {"name": name}}
+                    for ident, name in list(self.threads.items())]
+
+        os.makedirs(os.path.dirname(self.path_file) or ".", exist_ok=True)
+        with open(self.path_file, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"},
+                      file, ensure_ascii=False, default=str)
+
+        return self.path_file
+
+
+class _Span:
+    """Участок трассировки: записывается при выходе из контекстного менеджера"""
+
+    __slots__ = ("tracer", "name", "args", "id", "start")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param tracer: накопитель событий
+        :param name: название участка, часть до точки - категория
+        :param args: дополнительные сведения об участке
+        """
+
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.id = next(_span_ids)
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        """Начинает участок и делает его родителем вложенных участков"""
+
+        stack = _get_stack()
+        self.args["id"] = self.id
+        if stack:
+            self.args["parent"] = stack[-1]
+        stack.append(self.id)
+
+        self.start = self.tracer.get_timestamp()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Завершает участок и записывает его"""
+
+        end = self.tracer.get_timestamp()
+        _get_stack().pop()
+
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+
+        self.tracer.add_span(self.name, self.start, end, self.args)
+
+
+# накопитель событий, None - трассировка выключена
+_tracer = None
+
+
+def _get_stack() -> list[int]:
+    """Возвращает стек открытых участков текущего потока"""
+
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+
+    return stack
+
+
+def get_default_path() -> str:
+    """Возвращает путь к новому файлу трассировки в папке PATH_DIR_TRACES"""
+
+    name = f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+
+    return os.path.join(ROOT_DIR, *PATH_DIR_TRACES, name)
+
+
+def enable(path_file: str | None = None) -> Tracer:
+    """
+    Включает трассировку, файл записывается при завершении программы
+
+    :param path_file: путь к файлу трассировки, по умолчанию новый файл в папке PATH_DIR_TRACES
+    """
+
+    global _tracer
+
+    if _tracer is None:
+        _tracer = Tracer(path_file or get_default_path())
+        atexit.register(save)
+
+    return _tracer
+
+
+def disable() -> None:
+    """Выключает трассировку без записи файла"""
+
+    global _tracer
+
+    _tracer = None
+
+
+def is_enabled() -> bool:
+    """Включена ли трассировка"""
+
+    return _tracer is not None
+
+
+def save() -> str | None:
+    """Записывает накопленную трассировку в файл, возвращает путь к нему"""
+
+    if _tracer is None or not _tracer.events:
+        return None
+
+    try:
+        path_file = _tracer.save()
+    except OSError as error:
+        print(f"Не удалось записать трассировку: {error}")
+        return None
+
+    print(f"\nТрассировка записана в файл {path_file}")
+
+    return path_file
+
+
+def span(name: str, **args):
+    """
+    Контекстный менеджер участка трассировки
+
+    :param name: название участка, например 'api.get_info', часть до точки - категория
+    :param args: дополнительные сведения об участке, например номер страницы
+    """
+
+    if _tracer is None:
+        return _NULL_SPAN
+
+    return _Span(_tracer, name, args)
+
+
+def traced(name: str) -> Callable:
+    """Декоратор: вызов функции записывается участком трассировки с указанным названием"""
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with _Span(_tracer, name, {}):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+if os.environ.get(TRACE_ENV):
+    enable(None if os.environ[TRACE_ENV] == "1" else os.environ[TRACE_ENV])
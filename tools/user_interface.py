@@ -3,16 +3,28 @@ import os
 from request_api.request_api_hh import HeadHunterAPI
 from request_api.request_api_sj import SuperJobAPI
 from saver.json_saver import JSONSaver
-from tools.utils import i_input, get_binary_answer
+from saver.dual_saver import DualSaver
+from saver.background_writer import BackgroundWriter
+from tools import memory_profile, tracing
+from tools.utils import i_input, get_binary_answer, check_file_name
+from tools.renderer import PagedRenderer
+from tools.duplicates import DuplicateDetector
+from tools.daemon_client import DaemonClient
+from tools.snapshots import SnapshotStore
 from sources.constants import PATH_FILE_FULL_INFO_VACANCIES, PATH_FILE_SHORT_INFO_VACANCIES, PATH_DIR_JSON
+from sources.constants import PATH_DIR_EXPORT
 from sources.constants import MAX_LENGTH_NAME
 from vacancy.vacancy_hh import VacancyHeadHunter
 from vacancy.vacancy_sj import VacancySuperJob
 from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_factory import get_source
 from filter.filter_hh import FilterHH
 from filter.filter_sj import FilterSJ
 from filter.filter_abc import Filter
 
+# фоновая запись вакансий в файлы, чтобы пользователь не ждал окончания записи
+background_writer = BackgroundWriter()
+
 
 def user_interaction() -> None:
     """Основная, главная функция для взаимодействия с пользователем"""
@@ -22,12 +34,18 @@ def user_interaction() -> None:
     print("В любой момент ввода текста с клавиатуры вы можете завершить программу.\n"
           "Для этого наберите слово 'stop' в точности как указано.")
 
-    vacancies = find_vacancies()
+    with memory_profile.stage("search"):
+        vacancies = find_vacancies()
+    with memory_profile.stage("enrichment", len(vacancies)):
+        vacancies = enrich_vacancies(vacancies)
+    memory_profile.measure_vacancies(vacancies)
 
     is_exit = None
 
     while is_exit != "1":
 
+        background_writer.report()
+
         text = "В каком виде вывести информацию?\n" \
                "0 - Вывести все вакансии\n" \
                "1 - Настроить фильтр для вывода вакансий"
@@ -36,16 +54,25 @@ def user_interaction() -> None:
         list_vacancies = None
 
         if is_set_filter == "0":
-            list_vacancies = create_all_vacancies(vacancies)
+            with memory_profile.stage("construction", len(vacancies)):
+                list_vacancies = create_all_vacancies(vacancies)
 
         elif is_set_filter == "1":
-            list_vacancies = create_definite_vacancies(vacancies)
+            with memory_profile.stage("filtering", len(vacancies)):
+                list_vacancies = create_definite_vacancies(vacancies)
 
-        results = sort_vacancies(list_vacancies)
+        with memory_profile.stage("sorting", len(list_vacancies)):
+            results = sort_vacancies(list_vacancies)
 
         show_vacancies(results)
 
-        select_recording_method(results)
+        with memory_profile.stage("saving", len(results)):
+            select_recording_method(results)
+            if memory_profile.is_enabled():
+                # запись выполняется в фоне, для учета её памяти этап дожидается окончания записи
+                background_writer.flush()
+
+        background_writer.report()
 
         text = "Выберите следующий шаг:\n" \
                "0 - Настроить другие фильтры и записать информацию\n" \
@@ -53,6 +80,9 @@ def user_interaction() -> None:
 
         is_exit = get_binary_answer(text)
 
+    background_writer.flush()
+    background_writer.report()
+
     print("\nСпасибо и всего доброго!")
 
 
@@ -61,15 +91,19 @@ def find_vacancies() -> list[dict]:
     Функция для поиска вакансий по запросу.
     Пока пользователь не прервет работу функции,
     будет запрашивать настройку фильтров
-    и собирать информацию о вакансиях с сайта, расширяя список
+    и собирать информацию о вакансиях с сайта, расширяя список.
+    Почти одинаковые вакансии, в том числе с разных сайтов, попадают в список один раз,
+    вакансия, найденная повторно, заменяется своей новой версией
     """
 
     results = []
+    detector = DuplicateDetector()
 
     while True:
 
         request_filter = None
         request_api = None
+        source = None
 
         website = choice_website()
 
@@ -77,19 +111,22 @@ def find_vacancies() -> list[dict]:
             request_filter = FilterHH()
             request_filter.parameters["text"] = request_filter.ask_text()
             request_api = HeadHunterAPI
+            source = "hh"
 
         elif website == "1":
             request_filter = FilterSJ()
             request_filter.parameters["keyword"] = request_filter.ask_keyword()
             request_api = SuperJobAPI
+            source = "sj"
 
-        request = request_api(*set_request_filter(request_filter))
-
-        vacancies = request.get_vacancies()
+        if request_filter is None:
+            vacancies = request_planned_vacancies()
+        else:
+            request_filter, quantity = set_request_filter(request_filter)
+            vacancies = request_vacancies(source, request_api, request_filter, quantity)
+            report_changes(request_filter, quantity, vacancies)
 
-        for vacancy in vacancies:
-            if vacancy not in results:
-                results.append(vacancy)
+        detector.merge(results, vacancies)
 
         operations = {
             0: "Добавить больше вакансий в список",
@@ -103,6 +140,7 @@ def find_vacancies() -> list[dict]:
             continue
         elif operation == 1:
             results.clear()
+            detector.clear()
             continue
         elif operation == 2:
             break
@@ -110,10 +148,102 @@ def find_vacancies() -> list[dict]:
     return results
 
 
+def report_changes(request_filter: Filter, quantity: int, vacancies: list[dict]) -> None:
+    """Сообщает, чем результаты поиска отличаются от результатов такого же поиска в прошлый раз"""
+
+    difference = SnapshotStore().update(request_filter, vacancies, quantity)
+
+    if difference is not None:
+        print(f"\nПо сравнению с прошлым таким же поиском - {difference}.")
+
+
+def enrich_vacancies(vacancies: list[dict]) -> list[dict]:
+    """
+    По желанию пользователя дополняет вакансии HeadHunter полной информацией
+    (в результатах поиска есть только фрагменты требований и обязанностей)
+    и добавляет к вакансиям информацию о работодателях
+    """
+
+    if not vacancies:
+        return vacancies
+
+    # пул потоков нужен только здесь, поэтому модули загружаются при первом использовании
+    if any(get_source(vacancy) == "hh" for vacancy in vacancies):
+        text = "Загрузить полные описания вакансий HeadHunter?\n" \
+               "0 - Нет\n" \
+               "1 - Да"
+
+        if int(get_binary_answer(text)):
+            from tools.enrichment import DetailEnricher
+
+            print("\nПодождите, загружаю полные описания вакансий...")
+
+            enricher = DetailEnricher()
+            vacancies = list(enricher.enrich(vacancies))
+
+            print(f"\nЗагружено с сайта: {enricher.fetched}, взято из кеша: {enricher.cached}.")
+
+    text = "Загрузить информацию о работодателях?\n" \
+           "0 - Нет\n" \
+           "1 - Да"
+
+    if int(get_binary_answer(text)):
+        from tools.employers import EmployerService
+
+        print("\nПодождите, загружаю информацию о работодателях...")
+
+        employer_service = EmployerService()
+        vacancies = employer_service.join(vacancies)
+
+        print(f"\nРаботодателей: {len(employer_service.employers)}, загружено с сайта: {employer_service.fetched}.")
+
+    return vacancies
+
+
+@tracing.traced("search.request")
+def request_vacancies(source: str, request_api: type, request_filter: Filter, quantity: int) -> list[dict]:
+    """
+    Получает вакансии через фоновый сервис, если он запущен,
+    иначе отправляет запрос на сайт напрямую
+    """
+
+    client = DaemonClient.connect_if_running()
+
+    if client is None:
+        return request_api(request_filter, quantity).get_vacancies()
+
+    print("\nПодождите, ищу запрошенные вакансии через фоновый сервис...")
+
+    with client:
+        vacancies = client.search(source, request_filter.get_all_parameters(), quantity)
+
+    print(f"\nНайдено {len(vacancies)} вакансий.")
+
+    return vacancies
+
+
+def request_planned_vacancies() -> list[dict]:
+    """
+    Ищет вакансии на обоих сайтах по единому фильтру: планировщик сам решает,
+    какие параметры проверит сайт, а какие проверяются после загрузки
+    """
+
+    # планировщик нужен только здесь, поэтому модуль загружается при первом использовании
+    from tools.query_planner import QueryPlanner, ask_spec
+
+    spec = ask_spec()
+    quantity = get_number()
+
+    # в трассировку попадает только поиск, без ожидания ответов пользователя
+    with tracing.span("search.planned"):
+        return QueryPlanner(spec).search(quantity)
+
+
 def choice_website() -> str:
     """Вспомогательная функция для выбора вебсайта из предложенного списка"""
 
-    websites = get_websites()
+    # последний вариант - поиск на всех сайтах по единому фильтру
+    websites = get_websites() + ["Все сайты с единым фильтром"]
 
     websites_print = "\n".join([f"{i}: {site}" for i, site in enumerate(websites)])
     answer = i_input(f"\nНа каком сайте искать вакансии? "
@@ -164,6 +294,9 @@ def set_request_filter(request_filter: Filter) -> tuple:
     answer = get_binary_answer(text)
 
     if answer == "1":
+        # в трассировку попадает только загрузка словарей сайта, без ожидания ответов пользователя
+        with tracing.span("filter.request"):
+            request_filter.load_references()
         request_filter.set_request_parameters()
 
     number = get_number()
@@ -235,28 +368,30 @@ def create_definite_vacancies(vacancies: list[dict]) -> list[Vacancy]:
     filter_obj_hh = None
     filter_obj_sj = None
 
-    if operation == 0:
-        filter_obj_hh = FilterHH()
-        filter_obj_hh.set_filtering_parameters()
+    # в трассировку попадают только создание фильтров и загрузка словарей сайтов, без ожидания ответов пользователя
+    with tracing.span("filter.filtering", operation=operation):
+        if operation in (0, 2):
+            filter_obj_hh = FilterHH()
+            filter_obj_hh.load_references()
 
-    elif operation == 1:
-        filter_obj_sj = FilterSJ()
-        filter_obj_sj.set_filtering_parameters()
+        if operation in (1, 2):
+            filter_obj_sj = FilterSJ()
+            filter_obj_sj.load_references()
 
-    elif operation == 2:
-        filter_obj_hh, filter_obj_sj = (FilterHH(), FilterSJ())
-        filter_obj_hh.set_filtering_parameters()
-        filter_obj_sj.set_filtering_parameters()
+    for filter_obj in (filter_obj_hh, filter_obj_sj):
+        if filter_obj is not None:
+            filter_obj.set_filtering_parameters()
 
-    for vacancy in vacancies:
-        if "hh.ru" in vacancy.get("url", ""):
-            if filter_obj_hh and filter_obj_hh.compare_parameters(vacancy):
-                vacancy = VacancyHeadHunter(vacancy)
-                list_vacancies.append(vacancy)
-        elif "superjob.ru" in vacancy.get("link", ""):
-            if filter_obj_sj and filter_obj_sj.compare_parameters(vacancy):
-                vacancy = VacancySuperJob(vacancy)
-                list_vacancies.append(vacancy)
+    with tracing.span("filter.compare", vacancies=len(vacancies)):
+        for vacancy in vacancies:
+            if "hh.ru" in vacancy.get("url", ""):
+                if filter_obj_hh and filter_obj_hh.compare_parameters(vacancy):
+                    vacancy = VacancyHeadHunter(vacancy)
+                    list_vacancies.append(vacancy)
+            elif "superjob.ru" in vacancy.get("link", ""):
+                if filter_obj_sj and filter_obj_sj.compare_parameters(vacancy):
+                    vacancy = VacancySuperJob(vacancy)
+                    list_vacancies.append(vacancy)
 
     return list_vacancies
 
@@ -301,13 +436,12 @@ def sort_vacancies(list_objects: list[Vacancy]) -> list[Vacancy]:
 
 
 def show_vacancies(list_objects: list[Vacancy]) -> None:
-    """Выводит вакансии на экран в читаемом виде"""
-
-    short_info = [object.get_short_info() for object in list_objects]
+    """
+    Выводит вакансии на экран в читаемом виде, постранично.
+    Форматируются только вакансии отображаемой страницы
+    """
 
-    for info in short_info:
-        print()
-        print("\n".join([f"{key}: {value}" for key, value in info.items()]))
+    PagedRenderer(list_objects).interact()
 
 
 def select_recording_method(list_objects: list[Vacancy]) -> None:
@@ -318,7 +452,8 @@ def select_recording_method(list_objects: list[Vacancy]) -> None:
         1: "Перезаписать информацию в файл 'vacancies', удалив из него предыдущие записи",
         2: "Полностью очистить файл 'vacancies' и ничего не записывать",
         3: "Записать отсортированные вакансии в новый файл",
-        4: "Не записывать информацию"
+        4: "Выгрузить отсортированные вакансии в таблицу CSV или XLSX",
+        5: "Не записывать информацию"
     }
 
     operation = choice_operation(operations)
@@ -336,6 +471,9 @@ def select_recording_method(list_objects: list[Vacancy]) -> None:
         create_new_vacancies_file(list_objects)
 
     elif operation == 4:
+        export_vacancies_to_table(list_objects)
+
+    elif operation == 5:
         print("\nИнформация не была записана в файл")
 
 
@@ -345,14 +483,8 @@ def add_vacancies_to_file(list_objects: list[Vacancy]) -> None:
     в непустой файл по умолчанию
     """
 
-    json_saver_full = JSONSaver(PATH_FILE_FULL_INFO_VACANCIES)
-    json_saver_short = JSONSaver(PATH_FILE_SHORT_INFO_VACANCIES)
-    full_info = [object.full_info for object in list_objects]
-    short_info = [object.get_short_info() for object in list_objects]
-    print(type(short_info))
-
-    json_saver_full.add_vacancies(full_info)
-    json_saver_short.add_vacancies(short_info)
+    dual_saver = DualSaver(JSONSaver(PATH_FILE_FULL_INFO_VACANCIES), JSONSaver(PATH_FILE_SHORT_INFO_VACANCIES))
+    background_writer.submit(dual_saver.add_vacancies, list(list_objects))
 
 
 def write_vacancies_to_file(list_objects: list[Vacancy]) -> None:
@@ -361,23 +493,15 @@ def write_vacancies_to_file(list_objects: list[Vacancy]) -> None:
     в пустой файл по умолчанию
     """
 
-    json_saver_full = JSONSaver(PATH_FILE_FULL_INFO_VACANCIES)
-    json_saver_short = JSONSaver(PATH_FILE_SHORT_INFO_VACANCIES)
-    full_info = [object.full_info for object in list_objects]
-    short_info = [object.get_short_info() for object in list_objects]
-
-    json_saver_full.write_vacancies(full_info)
-    json_saver_short.write_vacancies(short_info)
+    dual_saver = DualSaver(JSONSaver(PATH_FILE_FULL_INFO_VACANCIES), JSONSaver(PATH_FILE_SHORT_INFO_VACANCIES))
+    background_writer.submit(dual_saver.write_vacancies, list(list_objects))
 
 
 def clean_vacancies_file() -> None:
     """Удаляет всю информацию о вакансиях из файла по умолчанию"""
 
-    json_saver_full = JSONSaver(PATH_FILE_FULL_INFO_VACANCIES)
-    json_saver_short = JSONSaver(PATH_FILE_SHORT_INFO_VACANCIES)
-
-    json_saver_full.clean_file()
-    json_saver_short.clean_file()
+    dual_saver = DualSaver(JSONSaver(PATH_FILE_FULL_INFO_VACANCIES), JSONSaver(PATH_FILE_SHORT_INFO_VACANCIES))
+    background_writer.submit(dual_saver.clean_file)
 
 
 def create_new_vacancies_file(list_objects: list[Vacancy]) -> None:
@@ -401,28 +525,44 @@ def create_new_vacancies_file(list_objects: list[Vacancy]) -> None:
     file_name_short = new_file + "(short_info).json"
     path_new_file_short = (*PATH_DIR_JSON, file_name_short)
 
-    json_saver_full = JSONSaver(path_new_file_full)
-    json_saver_short = JSONSaver(path_new_file_short)
-    full_info = [object.full_info for object in list_objects]
-    short_info = [object.get_short_info() for object in list_objects]
-
-    json_saver_full.write_vacancies(full_info)
-    json_saver_short.write_vacancies(short_info)
+    dual_saver = DualSaver(JSONSaver(path_new_file_full), JSONSaver(path_new_file_short))
+    background_writer.submit(dual_saver.write_vacancies, list(list_objects))
 
 
-def check_file_name(name: str) -> bool:
+def export_vacancies_to_table(list_objects: list[Vacancy]) -> None:
     """
-    Проверяет введенное пользователем имя для файла
-    на соответствие условиям:
-    имя может состоять только из букв, цифр, знака '_'
-    Максимальная длина имени файла не больше 20 символов
+    Выгружает полную информацию о вакансиях в таблицу CSV или XLSX
+    в папке PATH_DIR_EXPORT, имя файла задаёт пользователь
     """
 
-    if len(name) > MAX_LENGTH_NAME:
-        return False
+    # выгрузка в таблицу нужна только здесь, поэтому модуль загружается при первом использовании
+    from saver.table_exporter import XLSXExporter, get_exporter
+
+    new_file = i_input("\nПожалуйста, введите название файла таблицы.\n"
+                       "Допустимы только буквы, цифры и знак '_'\n"
+                       f"Максимальная длина имени файла - {MAX_LENGTH_NAME}\n")
+
+    while not check_file_name(new_file):
+        new_file = i_input("\nПожалуйста, введите название файла таблицы.\n"
+                           "Допустимы только буквы, цифры и знак '_'\n"
+                           f"Максимальная длина имени файла - {MAX_LENGTH_NAME}\n")
+
+    # XLSX предлагается, только если установлена библиотека xlsxwriter
+    if XLSXExporter.is_available():
+        text = "В каком формате выгрузить таблицу?\n" \
+               "0 - CSV\n" \
+               "1 - XLSX"
+        extension = ".xlsx" if int(get_binary_answer(text)) else ".csv"
+    else:
+        print(f"\n{XLSXExporter.MISSING_LIBRARY}, таблица будет выгружена в CSV")
+        extension = ".csv"
+
+    exporter = get_exporter((*PATH_DIR_EXPORT, new_file + extension))
+
+    def export() -> str:
+        """Выгружает вакансии и возвращает сообщение о том, сколько выгружено"""
 
-    for sign in name:
-        if not sign.isalnum() and sign != "_":
-            return False
+        count = exporter.export(vacancy.full_info for vacancy in list_objects)
+        return f"Выгружено вакансий: {count}, файл {exporter.path_file}"
 
-    return True
+    background_writer.submit(export)
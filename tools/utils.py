@@ -1,3 +1,6 @@
+from sources.constants import MAX_LENGTH_NAME
+
+
 def i_input(*args, **kwargs) -> str:
     """
     Функция для замещения стандартного input,
@@ -12,6 +15,24 @@ def i_input(*args, **kwargs) -> str:
     return result
 
 
+def check_file_name(name: str) -> bool:
+    """
+    Проверяет введенное пользователем имя для файла
+    на соответствие условиям:
+    имя может состоять только из букв, цифр, знака '_'
+    Максимальная длина имени файла не больше 20 символов
+    """
+
+    if len(name) > MAX_LENGTH_NAME:
+        return False
+
+    for sign in name:
+        if not sign.isalnum() and sign != "_":
+            return False
+
+    return True
+
+
 def get_binary_answer(text: str) -> str:
     """
     Вспомогательная функция для получения и валидации бинарных ответов
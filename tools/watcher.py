@@ -0,0 +1,336 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import zlib
+from datetime import datetime
+
+from filter.filter_hh import FilterHH
+from filter.filter_sj import FilterSJ
+from request_api.request_api_abc import API
+from request_api.request_api_hh import HeadHunterAPI
+from request_api.request_api_sj import SuperJobAPI
+from request_api.transport import RateLimiter
+from sources.constants import PATH_DIR_WATCHER
+from tools.snapshots import get_content_hash
+
+# абсолютный путь к корневой папке проекта
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# настройки инкрементального запроса для каждого сайта:
+# параметр "опубликовано не раньше", поле даты публикации в вакансии и сортировка по дате
+INCREMENTAL = {
+    "hh": {"filter": FilterHH, "api": HeadHunterAPI, "since": "date_from", "date": "published_at",
+           "order": {"order_by": "publication_time"}},
+    "sj": {"filter": FilterSJ, "api": SuperJobAPI, "since": "date_published_from", "date": "date_published",
+           "order": {"order_field": "date", "order_direction": "desc"}},
+}
+
+
+class SavedSearch:
+    """Сохраненный поиск: сайт и параметры фильтра запроса"""
+
+    def __init__(self, name: str, source: str, parameters: dict) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param name: название поиска
+        :param source: сайт, 'hh' или 'sj'
+        :param parameters: параметры фильтра запроса
+        """
+
+        if source not in INCREMENTAL:
+            raise ValueError(f"Неизвестный сайт: {source}")
+
+        self.name = name
+        self.source = source
+        self.parameters = parameters
+
+    def __repr__(self) -> str:
+        """Строковое представление поиска в режиме отладки"""
+
+        return f"{self.__class__.__name__}({self.name!r}, {self.source!r}, {self.parameters!r})"
+
+    @property
+    def key(self) -> str:
+        """Ключ поиска, по которому хранится его состояние"""
+
+        parameters = json.dumps(self.parameters, sort_keys=True, ensure_ascii=False)
+        return f"{self.name}:{self.source}:{hashlib.sha1(parameters.encode('utf-8')).hexdigest()[:12]}"
+
+    def create_api(self) -> API:
+        """Создает объект запроса к сайту с фильтром по параметрам поиска"""
+
+        settings = INCREMENTAL[self.source]
+        request_filter = settings["filter"].from_parameters(self.parameters)
+        request_filter.parameters.update(settings["order"])
+
+        return settings["api"](request_filter)
+
+
+class JSONLinesSink:
+    """Запись изменений сохраненных поисков в файл, по одному JSON-объекту в строке"""
+
+    def __init__(self, path_file: tuple) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param path_file: кортеж, содержащий строки с названием папок и файлов для построения пути к файлу
+        """
+
+        self.path_file = os.path.join(ROOT_DIR, *path_file)
+
+    def emit(self, search: SavedSearch, changes: list[tuple[str, dict]]) -> None:
+        """
+        Дописывает изменения поиска в конец файла
+
+        :param search: сохраненный поиск
+        :param changes: список пар (вид изменения 'new' или 'changed', словарь вакансии)
+        """
+
+        if not changes:
+            return
+
+        os.makedirs(os.path.dirname(self.path_file), exist_ok=True)
+        timestamp = datetime.now().isoformat(timespec="seconds")
+
+        with open(self.path_file, "a", encoding="utf-8") as file:
+            for change, vacancy in changes:
+                record = {"time": timestamp, "search": search.name, "change": change, "vacancy": vacancy}
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class Watcher:
+    """
+    Наблюдатель за сохраненными поисками.
+    Периодически опрашивает сайты и передает приемнику только новые и изменившиеся вакансии.
+    Обычно запрашиваются только вакансии, опубликованные после последнего опроса, с сортировкой по дате;
+    если сайт сообщает, что ответ не изменился (304), страница повторно не загружается.
+    Такой запрос находит только новые вакансии: отредактированная вакансия не меняет дату публикации
+    и в него не попадает. Поэтому каждый rescan_every-й опрос поиска заново просматривает окно
+    последних вакансий (max_pages страниц без ограничения по дате) и находит среди них изменившиеся.
+    Опросы разных поисков равномерно распределены по интервалу
+    """
+
+    # максимальное количество известных вакансий, хранимое для одного поиска
+    _MAX_KNOWN = 5000
+
+    def __init__(self, searches: list[SavedSearch], sink: JSONLinesSink, interval: float = 600,
+                 requests_per_second: float = 2, max_pages: int = 5, rescan_every: int = 6,
+                 path_state: tuple = (*PATH_DIR_WATCHER, "state.json")) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param searches: сохраненные поиски
+        :param sink: приемник изменений
+        :param interval: интервал опроса каждого поиска в секундах
+        :param requests_per_second: допустимое количество запросов к сайтам в секунду
+        :param max_pages: максимальное количество страниц, загружаемых за один опрос поиска
+        :param rescan_every: каждый какой опрос поиска заново просматривает последние вакансии
+        :param path_state: путь к файлу с состоянием поисков
+        """
+
+        self.searches = searches
+        self.sink = sink
+        if rescan_every < 1:
+            raise ValueError(f"Параметр rescan_every должен быть не меньше 1, получено: {rescan_every}")
+
+        self.interval = interval
+        self.max_pages = max_pages
+        self.rescan_every = rescan_every
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        self.path_state = os.path.join(ROOT_DIR, *path_state)
+        self.state = self.load_state()
+
+    def __repr__(self) -> str:
+        """Строковое представление объекта в режиме отладки"""
+
+        return f"{self.__class__.__name__}(searches={len(self.searches)}, interval={self.interval})"
+
+    def load_state(self) -> dict:
+        """Загружает состояние поисков из файла"""
+
+        if not os.path.exists(self.path_state):
+            return {}
+
+        with open(self.path_state, "r", encoding="utf-8") as file:
+            try:
+                return json.load(file)
+            except json.decoder.JSONDecodeError:
+                return {}
+
+    def save_state(self) -> None:
+        """Записывает состояние поисков в файл"""
+
+        os.makedirs(os.path.dirname(self.path_state), exist_ok=True)
+        temporary_path = self.path_state + ".tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file, ensure_ascii=False)
+
+        os.replace(temporary_path, self.path_state)
+
+    def get_offset(self, search: SavedSearch) -> float:
+        """Возвращает сдвиг опроса поиска внутри интервала, постоянный для каждого поиска"""
+
+        return zlib.crc32(search.key.encode("utf-8")) % 1000 / 1000 * self.interval
+
+    def poll(self, search: SavedSearch) -> list[tuple[str, dict]]:
+        """
+        Опрашивает сайт по сохраненному поиску
+
+        :return: список пар (вид изменения 'new' или 'changed', словарь вакансии)
+        """
+
+        settings = INCREMENTAL[search.source]
+        state = self.state.setdefault(search.key, {"etag": None, "since": None, "known": {}})
+        known = state["known"]
+
+        # повторный просмотр последних вакансий: без даты публикации и без условного запроса
+        polls = state.get("polls", 0)
+        state["polls"] = polls + 1
+        rescan = polls % self.rescan_every == self.rescan_every - 1
+
+        api = search.create_api()
+        if state["since"] is not None and not rescan:
+            api.request_filter.parameters[settings["since"]] = state["since"]
+
+        changes = []
+        newest = state["since"]
+
+        for page in range(self.max_pages):
+            api.request_filter.parameters["page"] = page
+
+            # условный запрос имеет смысл только для первой страницы
+            headers = {"If-None-Match": state["etag"]} if page == 0 and state["etag"] and not rescan else None
+
+            self.rate_limiter.wait()
+            with api.get_response(headers) as response:
+                if response.status_code == 304:
+                    break
+                if response.status_code != 200:
+                    print(f"Ошибка при опросе поиска {search.name}: статус {response.status_code}")
+                    break
+                if page == 0 and not rescan:
+                    state["etag"] = response.headers.get("ETag")
+                info = response.json()
+
+            page_changes = 0
+            for vacancy in api.get_items(info):
+                vacancy_id = str(vacancy.get("id"))
+                content_hash = get_content_hash(vacancy)
+
+                if known.get(vacancy_id) != content_hash:
+                    changes.append(("new" if vacancy_id not in known else "changed", vacancy))
+                    known[vacancy_id] = content_hash
+                    page_changes += 1
+
+                published = vacancy.get(settings["date"])
+                if published is not None and (newest is None or self._is_later(published, newest)):
+                    newest = published
+
+            # вакансии отсортированы по дате: если на странице нет нового, дальше тоже ничего нет.
+            # При повторном просмотре изменившиеся вакансии могут быть на любой странице окна
+            has_more = info.get("more") if "more" in info else page + 1 < info.get("pages", 0)
+            if not has_more or not page_changes and not rescan:
+                break
+
+        state["since"] = newest
+        if len(known) > self._MAX_KNOWN:
+            state["known"] = dict(list(known.items())[-self._MAX_KNOWN:])
+
+        return changes
+
+    @staticmethod
+    def _is_later(first: str | int, second: str | int) -> bool:
+        """Сравнивает даты публикации: строки ISO 8601 (HeadHunter) или unix-время (SuperJob)"""
+
+        if isinstance(first, str) and isinstance(second, str):
+            return datetime.strptime(first, "%Y-%m-%dT%H:%M:%S%z") > datetime.strptime(second, "%Y-%m-%dT%H:%M:%S%z")
+
+        return first > second
+
+    def run_cycle(self) -> int:
+        """Один раз опрашивает все поиски подряд и возвращает количество изменений"""
+
+        total = 0
+
+        for search in self.searches:
+            changes = self.poll(search)
+            self.sink.emit(search, changes)
+            total += len(changes)
+
+        self.save_state()
+
+        return total
+
+    def run(self, cycles: int | None = None) -> None:
+        """
+        Опрашивает поиски по расписанию: каждый поиск раз в интервал,
+        со своим постоянным сдвигом, чтобы запросы не шли одновременно
+
+        :param cycles: количество интервалов работы, по умолчанию без ограничения
+        """
+
+        start = time.monotonic()
+        schedule = sorted((start + self.get_offset(search), number) for number, search in enumerate(self.searches))
+        finish = start + cycles * self.interval if cycles is not None else None
+
+        while schedule:
+            due, number = schedule.pop(0)
+            if finish is not None and due >= finish:
+                break
+
+            time.sleep(max(due - time.monotonic(), 0))
+
+            search = self.searches[number]
+            try:
+                changes = self.poll(search)
+            except Exception as error:
+                print(f"Ошибка при опросе поиска {search.name}: {error}")
+            else:
+                self.sink.emit(search, changes)
+                self.save_state()
+
+            schedule.append((due + self.interval, number))
+            schedule.sort()
+
+
+def load_searches(path_file: tuple = (*PATH_DIR_WATCHER, "searches.json")) -> list[SavedSearch]:
+    """
+    Загружает сохраненные поиски из файла.
+    Файл содержит список объектов с полями name, source ('hh' или 'sj') и parameters
+    """
+
+    with open(os.path.join(ROOT_DIR, *path_file), "r", encoding="utf-8") as file:
+        return [SavedSearch(search["name"], search["source"], search.get("parameters", {}))
+                for search in json.load(file)]
+
+
+def main() -> None:
+    """Запускает наблюдение за сохраненными поисками"""
+
+    parser = argparse.ArgumentParser(description="Наблюдение за сохраненными поисками вакансий")
+    parser.add_argument("--interval", type=float, default=600, help="интервал опроса каждого поиска, секунды")
+    parser.add_argument("--rps", type=float, default=2, help="допустимое количество запросов в секунду")
+    parser.add_argument("--rescan-every", type=int, default=6,
+                        help="каждый какой опрос поиска заново просматривает последние вакансии")
+    parser.add_argument("--once", action="store_true", help="опросить все поиски один раз и завершить работу")
+    arguments = parser.parse_args()
+
+    if arguments.rescan_every < 1:
+        parser.error("--rescan-every должен быть не меньше 1")
+
+    watcher = Watcher(load_searches(), JSONLinesSink((*PATH_DIR_WATCHER, "changes.jsonl")),
+                      arguments.interval, arguments.rps, rescan_every=arguments.rescan_every)
+
+    if arguments.once:
+        print(f"Найдено изменений: {watcher.run_cycle()}")
+    else:
+        watcher.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -48,6 +48,11 @@ class Vacancy(ABC):
         if isinstance(other, Vacancy):
             return self.get_min_salary() >= other.get_min_salary()
 
+    def get_employer_info(self) -> dict | None:
+        """Возвращает информацию о работодателе, если она была добавлена к вакансии (tools.employers)"""
+
+        return self.full_info.get("employer_info")
+
     @abstractmethod
     def get_min_salary(self) -> int:
         """Находит минимальное из присущих вакансии значений заработной платы"""
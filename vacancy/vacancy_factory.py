@@ -0,0 +1,29 @@
+from vacancy.vacancy_abc import Vacancy
+from vacancy.vacancy_hh import VacancyHeadHunter
+from vacancy.vacancy_sj import VacancySuperJob
+
+# классы вакансий по сайту, с которого получена вакансия
+VACANCY_CLASSES = {"hh": VacancyHeadHunter, "sj": VacancySuperJob}
+
+
+def get_source(vacancy_dict: dict) -> str | None:
+    """
+    Определяет, с какого сайта получена вакансия
+
+    :return: 'hh' для HeadHunter, 'sj' для SuperJob, None если сайт определить не удалось
+    """
+
+    if "hh.ru" in vacancy_dict.get("url", ""):
+        return "hh"
+    elif "superjob.ru" in vacancy_dict.get("link", ""):
+        return "sj"
+
+    return None
+
+
+def create_vacancy(vacancy_dict: dict) -> Vacancy | None:
+    """Создает объект вакансии подходящего класса, либо возвращает None, если сайт неизвестен"""
+
+    vacancy_class = VACANCY_CLASSES.get(get_source(vacancy_dict))
+
+    return vacancy_class(vacancy_dict) if vacancy_class is not None else None
@@ -1,12 +1,23 @@
-import requests
+import re
+from functools import cached_property
 
-from sources.constants import CBR_RATE_URL
+from request_api import transport
+from tools import tracing
 from vacancy.vacancy_abc import Vacancy
 
 
 class VacancyHeadHunter(Vacancy):
     """Класс для описания вакансии, полученной с сайта HeadHunter"""
 
+    # текстовые артефакты подсветки в полях требования и обязанности
+    _HIGHLIGHT_ARTEFACTS = re.compile(r"</?highlighttext>")
+
+    # html-теги полного описания вакансии: теги абзацев и списков заменяются переносом строки
+    _BLOCK_TAGS = re.compile(r"</?(?:p|br|li|ul|ol|div|h\d)\b[^>]*>")
+    _TAGS = re.compile(r"<[^>]*>")
+    # переносы строк вместе с окружающими пробелами
+    _LINE_BREAKS = re.compile(r"\s*\n\s*")
+
     def __init__(self, vacancy_dict: dict) -> None:
         """
         Инициализатор объектов класса, устанавливает некоторые
@@ -19,8 +30,6 @@ class VacancyHeadHunter(Vacancy):
         self.name = vacancy_dict.get("name")
         self.area = vacancy_dict.get("area")
         self.alternate_url = vacancy_dict.get("alternate_url")
-        self.requirement = vacancy_dict.get("snippet")
-        self.responsibility = vacancy_dict.get("snippet")
         self.professional_roles = vacancy_dict.get("professional_roles")
         self.experience = vacancy_dict.get("experience")
         self.employment = vacancy_dict.get("employment")
@@ -30,9 +39,6 @@ class VacancyHeadHunter(Vacancy):
         self.salary_to = salary.get("to") if salary else None
         self.currency = salary.get("currency") if salary else None
 
-        self.salary_from_rub = self.salary_from
-        self.salary_to_rub = self.salary_to
-
         self.full_info = vacancy_dict
 
     def __str__(self) -> str:
@@ -49,41 +55,78 @@ class VacancyHeadHunter(Vacancy):
                f"{full_info}\n" \
                f")"
 
-    def __setattr__(self, key, value) -> None:
+    def _get_snippet_field(self, key: str) -> str | None:
+        """Возвращает поле сниппета вакансии, очищенное от текстовых артефактов"""
+
+        snippet = self.full_info.get("snippet")
+        value = snippet.get(key) if snippet else None
+
+        return self._HIGHLIGHT_ARTEFACTS.sub("", value) if value else value
+
+    @cached_property
+    def requirement(self) -> str | None:
+        """Требования к кандидату, вычисляются при первом обращении"""
+
+        return self._get_snippet_field("requirement")
+
+    @cached_property
+    def responsibility(self) -> str | None:
+        """Обязанности кандидата, вычисляются при первом обращении"""
+
+        return self._get_snippet_field("responsibility")
+
+    @cached_property
+    def description(self) -> str | None:
         """
-        При установке свойств объектов класса убирает текстовые артефакты
-        из полей требования и обязанности;
-        Устанавливает правила конвертации суммы зарплаты в рубли
+        Полное описание вакансии без html-тегов, вычисляется при первом обращении.
+        Есть только у вакансий, дополненных полной информацией (tools.enrichment)
         """
 
-        if key in ("requirement", "responsibility"):
-            value = value.get(key) if value else None
-            artefacts = ("<highlighttext>", "</highlighttext>")
-            for string in artefacts:
-                if value and string in value:
-                    value = value.replace(string, "")
+        description = self.full_info.get("description")
+        if not description:
+            return None
+
+        # таблица html-сущностей большая, модуль нужен только для дополненных вакансий
+        import html
+
+        text = html.unescape(self._TAGS.sub("", self._BLOCK_TAGS.sub("\n", description))).strip()
 
-        elif key in ("salary_from_rub", "salary_to_rub") and self.currency != "RUR":
-            value = self.convert_currency(value, self.currency)
+        return "\n\t" + self._LINE_BREAKS.sub("\n\t", text) if text else None
 
-        super().__setattr__(key, value)
+    def _convert_to_rub(self, number: int | None) -> int | float | None:
+        """Конвертирует сумму зарплаты в рубли, если она указана в другой валюте"""
+
+        if self.currency == "RUR" or not number:
+            return number
+
+        return self.convert_currency(number, self.currency)
+
+    @cached_property
+    def salary_from_rub(self) -> int | float | None:
+        """Нижняя граница зарплаты в рублях, вычисляется при первом обращении"""
+
+        return self._convert_to_rub(self.salary_from)
+
+    @cached_property
+    def salary_to_rub(self) -> int | float | None:
+        """Верхняя граница зарплаты в рублях, вычисляется при первом обращении"""
+
+        return self._convert_to_rub(self.salary_to)
 
     @staticmethod
     def convert_currency(number: int | None, currency: str | None) -> int:
         """
         Конвертирует сумму в иностранной валюте в эквивалентную сумму в рублях,
-        основываясь на данных ЦБР, получаемых с сайта
+        основываясь на данных ЦБР, получаемых с сайта один раз за время работы программы
         """
 
-        response = requests.get(CBR_RATE_URL)
-        if response.status_code != 200:
-            raise requests.RequestException("Ошибка при загрузке словаря с текущим курсом валют")
-        currency_dictionary = response.json().get("Valute")
+        with tracing.span("currency.convert", currency=currency):
+            currency_dictionary = transport.get_currency_rates()
 
-        number_rub = 0
+            number_rub = 0
 
-        if currency in currency_dictionary and number:
-            number_rub = currency_dictionary[currency]["Value"] * number
+            if currency in currency_dictionary and number:
+                number_rub = currency_dictionary[currency]["Value"] * number
 
         return number_rub
 
@@ -102,7 +145,17 @@ class VacancyHeadHunter(Vacancy):
         return min_salary
 
     def get_short_info(self) -> dict:
-        """Возвращает краткую информацию о вакансии"""
+        """
+        Возвращает краткую информацию о вакансии.
+        Строки для вывода формируются один раз, при первом вызове; возвращается копия словаря,
+        поэтому ее изменение не затрагивает краткую информацию, сохраненную в объекте
+        """
+
+        return self.short_info.copy()
+
+    @cached_property
+    def short_info(self) -> dict:
+        """Краткая информация о вакансии, вычисляется при первом обращении"""
 
         name = self.name
         area = self.area.get('name', "Не указано") if self.area else "Не указано"
@@ -127,12 +180,17 @@ class VacancyHeadHunter(Vacancy):
             professional_roles = [role.get("name", "Не указано") for role in self.professional_roles]
             str_professional_roles = ", ".join(professional_roles)
 
-        return {"Название": name,
-                "Город": area,
-                "Зарплата": str_salary,
-                "Ссылка": alternate_url,
-                "Требования": requirement,
-                "Обязанности": responsibility,
-                "Профессиональные роли": str_professional_roles,
-                "Опыт": experience,
-                "Занятость": employment}
+        short_info = {"Название": name,
+                      "Город": area,
+                      "Зарплата": str_salary,
+                      "Ссылка": alternate_url,
+                      "Требования": requirement,
+                      "Обязанности": responsibility,
+                      "Профессиональные роли": str_professional_roles,
+                      "Опыт": experience,
+                      "Занятость": employment}
+
+        if self.description:
+            short_info["Описание"] = self.description
+
+        return short_info
@@ -1,9 +1,15 @@
+import re
+from functools import cached_property
+
 from vacancy.vacancy_abc import Vacancy
 
 
 class VacancySuperJob(Vacancy):
     """Класс для описания вакансии, полученной с сайта SuperJob"""
 
+    # переносы строк в описании вакансии, заменяются одним переносом с отступом
+    _LINE_BREAKS = re.compile(r"\n+")
+
     def __init__(self, vacancy_dict: dict) -> None:
         """
         Инициализатор объектов класса, устанавливает некоторые
@@ -19,7 +25,6 @@ class VacancySuperJob(Vacancy):
         self.payment_to = vacancy_dict.get("payment_to")
         self.currency = vacancy_dict.get("currency")
         self.link = vacancy_dict.get("link")
-        self.description = vacancy_dict.get("candidat")
         self.experience = vacancy_dict.get("experience")
         self.type_of_work = vacancy_dict.get("type_of_work")
 
@@ -39,15 +44,16 @@ class VacancySuperJob(Vacancy):
                f"{full_info}\n" \
                f")"
 
-    def __setattr__(self, key, value) -> None:
+    @cached_property
+    def description(self) -> str | None:
         """
-        При установке свойств объектов класса расставляет отступы
-        в значении поля description для более читаемого вывода
+        Описание вакансии с расставленными отступами для более читаемого вывода,
+        вычисляется при первом обращении
         """
 
-        if key == "description":
-            value = "\n\t" + value.replace("\n\n", "\n").replace("\n", "\n\t")
-        super().__setattr__(key, value)
+        description = self.full_info.get("candidat")
+
+        return "\n\t" + self._LINE_BREAKS.sub("\n\t", description) if description else description
 
     def get_min_salary(self) -> int:
         """
@@ -66,7 +72,17 @@ class VacancySuperJob(Vacancy):
         return min_salary
 
     def get_short_info(self) -> dict:
-        """Возвращает краткую информацию о вакансии"""
+        """
+        Возвращает краткую информацию о вакансии.
+        Строки для вывода формируются один раз, при первом вызове; возвращается копия словаря,
+        поэтому ее изменение не затрагивает краткую информацию, сохраненную в объекте
+        """
+
+        return self.short_info.copy()
+
+    @cached_property
+    def short_info(self) -> dict:
+        """Краткая информация о вакансии, вычисляется при первом обращении"""
 
         profession = self.profession
         town = self.town.get("title", "Не указано") if self.town else "Не указано"